@@ -1,5 +1,5 @@
-CREATE DATABASE IF NOT EXISTS College_database;
-USE College_database;
+CREATE DATABASE IF NOT EXISTS student_database;
+USE student_database;
 CREATE TABLE College (
     Clg_ID INT PRIMARY KEY,
     Clg_Name VARCHAR(255) NOT NULL UNIQUE,
@@ -26,7 +26,7 @@ CREATE TABLE Professor (
         ON UPDATE CASCADE
 );
 
--- Create the Student table with a foreign key to College
+-- Create the Student table with foreign keys to College and Department
 CREATE TABLE Student (
     Stu_ID INT PRIMARY KEY,
     Name VARCHAR(255) NOT NULL,
@@ -35,7 +35,11 @@ CREATE TABLE Student (
     DOB DATE,
     Gender VARCHAR(10),
     Clg_ID INT,
+    Dept_ID INT,
     FOREIGN KEY (Clg_ID) REFERENCES College(Clg_ID)
+        ON DELETE SET NULL
+        ON UPDATE CASCADE,
+    CONSTRAINT fk_student_dept FOREIGN KEY (Dept_ID) REFERENCES Department(Dept_ID)
         ON DELETE SET NULL
         ON UPDATE CASCADE
 );
@@ -65,6 +69,13 @@ CREATE TABLE Enrollment (
         ON DELETE CASCADE
         ON UPDATE CASCADE
 );
+-- Indexes used by the GUI search bar (name prefix and full-text searches)
+CREATE INDEX idx_student_name ON Student (Name(32));
+CREATE INDEX idx_professor_name ON Professor (Name(32));
+CREATE INDEX idx_course_name ON Course (Course_Name(32));
+CREATE FULLTEXT INDEX ft_student_name ON Student (Name);
+CREATE FULLTEXT INDEX ft_professor_name ON Professor (Name);
+
 -- DML: Insert data into the tables
 
 -- 1. Insert data into independent tables
@@ -83,13 +94,13 @@ INSERT INTO Department (Dept_ID, Dept_Name, HOD) VALUES
 (5, 'Humanities', 'Dr. Rubeus Hagrid');
 
 -- 2. Insert data into tables that depend on the above (Student, Professor, Course)
-INSERT INTO Student (Stu_ID, Name, Phone_No, Email, DOB, Gender, Clg_ID) VALUES
-(1, 'John Smith', '9876543210', 'john.smith@email.com', '2005-03-15', 'Male', 101),
-(2, 'Jane Doe', '9988776655', 'jane.doe@email.com', '2004-10-22', 'Female', 102),
-(3, 'Peter Jones', '9123456789', 'peter.jones@email.com', '2006-01-30', 'Male', 101),
-(4, 'Emily White', '9567891234', 'emily.white@email.com', '2005-07-05', 'Female', 103),
-(5, 'Chris Green', '9678901234', 'chris.green@email.com', '2004-11-18', 'Male', 104),
-(6, 'Samantha Brown', '9789012345', 'samantha.brown@email.com', '2006-04-25', 'Female', 102);
+INSERT INTO Student (Stu_ID, Name, Phone_No, Email, DOB, Gender, Clg_ID, Dept_ID) VALUES
+(1, 'John Smith', '9876543210', 'john.smith@email.com', '2005-03-15', 'Male', 101, 1),
+(2, 'Jane Doe', '9988776655', 'jane.doe@email.com', '2004-10-22', 'Female', 102, 2),
+(3, 'Peter Jones', '9123456789', 'peter.jones@email.com', '2006-01-30', 'Male', 101, 1),
+(4, 'Emily White', '9567891234', 'emily.white@email.com', '2005-07-05', 'Female', 103, 3),
+(5, 'Chris Green', '9678901234', 'chris.green@email.com', '2004-11-18', 'Male', 104, 4),
+(6, 'Samantha Brown', '9789012345', 'samantha.brown@email.com', '2006-04-25', 'Female', 102, 5);
 
 INSERT INTO Professor (Prof_ID, Name, Phone_No, Email, Address, Dept_ID) VALUES
 (1, 'Dr. Smith', '1234567890', 'smith@nu.edu', '123 Main St', 1),
@@ -127,9 +138,10 @@ CREATE TRIGGER trg_Before_Student_Insert_Validate_DOB
 BEFORE INSERT ON Student  
 FOR EACH ROW  
 BEGIN  
-    IF NEW.DOB > CURDATE() OR NEW.DOB > DATE_SUB(CURDATE(), INTERVAL 18 YEAR) THEN  
+    IF NEW.DOB > DATE_SUB(CURDATE(), INTERVAL 18 YEAR) THEN  
         SIGNAL SQLSTATE '45000'   
-        SET MESSAGE_TEXT = 'Invalid Date of Birth. Student must be at least 18 years old.';      END IF;  
+        SET MESSAGE_TEXT = 'Invalid DOB: Student must be at least 18 years old.';  
+    END IF;  
 END$$  
 
 DELIMITER $$  
@@ -140,12 +152,13 @@ CREATE PROCEDURE sp_AddNewStudent(
     IN p_Email VARCHAR(255),  
     IN p_DOB DATE,  
     IN p_Gender VARCHAR(10),   
-    IN p_Clg_ID INT  
+    IN p_Clg_ID INT,  
+    IN p_Dept_ID INT  
 )  
 BEGIN  
     INSERT INTO Student (Stu_ID, Name, Phone_No, Email, DOB, Gender,  
-Clg_ID)  
-    VALUES (p_Stu_ID, p_Name, p_Phone, p_Email, p_DOB, p_Gender, p_Clg_ID);   
+Clg_ID, Dept_ID)  
+    VALUES (p_Stu_ID, p_Name, p_Phone, p_Email, p_DOB, p_Gender, p_Clg_ID, p_Dept_ID);   
 END$$  
 
 DELIMITER $$  
@@ -154,12 +167,10 @@ CREATE PROCEDURE sp_GetStudentsByDepartment(
 )  
 BEGIN  
       
-    SELECT DISTINCT         s.Name,  
+    SELECT s.Name,  
         s.Email  
     FROM Student s  
-    JOIN Enrollment e ON s.Stu_ID = e.Stu_ID  
-    JOIN Course c ON e.Course_ID = c.Course_ID  
-    JOIN Department d ON c.Dept_ID = d.Dept_ID  
+    JOIN Department d ON s.Dept_ID = d.Dept_ID  
     WHERE d.Dept_Name = p_Dept_Name;  
 END$$  
 
@@ -0,0 +1,372 @@
+# college_analytics.py — grade reports over Enrollment joined with Course
+#
+# Enrollment ⋈ Course is read once in chunks into parallel columns and every
+# report is a group-by over those columns: numpy.bincount when numpy is
+# installed, a plain single pass otherwise. Reports cover the current term
+# unless asked to include the archived ones in Enrollment_History.
+import importlib.util
+import college_queries as q
+
+# numpy is imported on first use so importing this module stays cheap
+NUMPY_AVAILABLE = importlib.util.find_spec("numpy") is not None
+np = None
+
+def _load_numpy():
+    global np
+    if np is None:
+        import numpy
+        np = numpy
+
+# ----------------------- GRADING -----------------------
+GRADES = ["A", "A-", "B+", "B", "B-", "C+", "C", "C-", "D", "F"]
+GRADE_POINTS = [4.0, 3.7, 3.3, 3.0, 2.7, 2.3, 2.0, 1.7, 1.0, 0.0]
+PASS_POINTS = 1.0          # D or better passes
+ANALYTICS_FETCH_SIZE = 20000
+
+# Index len(GRADES) collects grades that are NULL or not in GRADES; they are
+# counted as enrolled but left out of GPA and pass rates.
+_OTHER = len(GRADES)
+_CODE = {g: i for i, g in enumerate(GRADES)}
+_POINTS = GRADE_POINTS + [0.0]
+_GRADED = [1.0] * len(GRADES) + [0.0]
+_PASSED = [1.0 if p >= PASS_POINTS else 0.0 for p in GRADE_POINTS] + [0.0]
+
+_ENROLLMENT_SQL = """
+    SELECT e.Stu_ID, e.Course_ID, c.Dept_ID, c.Credits, e.Grade
+    FROM {source} e JOIN Course c ON c.Course_ID = e.Course_ID
+"""
+# Enrollment plus the closed terms archived by college_terms.rollover()
+_WITH_HISTORY = """(
+    SELECT Stu_ID, Course_ID, Grade FROM Enrollment
+    UNION ALL
+    SELECT Stu_ID, Course_ID, Grade FROM Enrollment_History
+)"""
+
+# ----------------------- LOADING -----------------------
+class Enrollments:
+    """Enrollment ⋈ Course as parallel columns (numpy arrays when available)."""
+
+    __slots__ = ("stu", "course", "dept", "credits", "grade")
+
+    def __init__(self, stu, course, dept, credits, grade):
+        if NUMPY_AVAILABLE:
+            _load_numpy()
+            stu, course, dept = (np.asarray(c, dtype=np.int64) for c in (stu, course, dept))
+            credits, grade = np.asarray(credits, dtype=np.float64), np.asarray(grade, dtype=np.int64)
+        self.stu, self.course, self.dept, self.credits, self.grade = stu, course, dept, credits, grade
+
+    def __len__(self):
+        return len(self.stu)
+
+def load_enrollments(conn, students=None, progress=None, cancel=None, include_history=False, courses=None):
+    """Read Enrollment ⋈ Course with fetchmany(); `students` / `courses` limit it
+    to some Stu_IDs / Course_IDs.
+
+    Only the current term (fn_CurrentTerm()) is read unless `include_history`,
+    which reads every term, archived ones included. Rows whose course no
+    longer exists drop out of the join. A NULL Course.Dept_ID is read as 0.
+    """
+    conds, params = [], []
+    if include_history:
+        sql = _ENROLLMENT_SQL.format(source=_WITH_HISTORY)
+    else:
+        sql = _ENROLLMENT_SQL.format(source="Enrollment")
+        # Looked up once so the condition is a constant for idx_enrollment_term
+        cur = conn.cursor(buffered=True)
+        try:
+            conds.append("e.Term = %s")
+            params.append(q.current_term(cur))
+        finally:
+            cur.close()
+    if students is not None:
+        students = list(students)
+        if not students:
+            return Enrollments([], [], [], [], [])
+        conds.append(f"e.Stu_ID IN ({', '.join(['%s'] * len(students))})")
+        params += students
+    if courses is not None:
+        courses = list(courses)
+        if not courses:
+            return Enrollments([], [], [], [], [])
+        conds.append(f"e.Course_ID IN ({', '.join(['%s'] * len(courses))})")
+        params += courses
+    if conds:
+        sql += " WHERE " + " AND ".join(conds)
+    stu, course, dept, credits, grade = [], [], [], [], []
+    cur = conn.cursor()   # unbuffered: one chunk in memory at a time
+    try:
+        cur.execute(sql, tuple(params))
+        while True:
+            rows = cur.fetchmany(ANALYTICS_FETCH_SIZE)
+            if not rows:
+                break
+            for s, c, d, cr, g in rows:
+                stu.append(s); course.append(c); dept.append(d or 0)
+                credits.append(cr or 0); grade.append(_CODE.get(g, _OTHER))
+            if progress:
+                progress(len(stu))
+            if cancel and cancel():
+                conn.consume_results()
+                break
+    finally:
+        cur.close()
+    return Enrollments(stu, course, dept, credits, grade)
+
+# ----------------------- GROUP-BY PRIMITIVES -----------------------
+def _factorize(values):
+    """(sorted distinct values, index of each value in them)."""
+    if NUMPY_AVAILABLE:
+        keys, inverse = np.unique(values, return_inverse=True)
+        return keys.tolist(), inverse
+    keys = sorted(set(values))
+    pos = {k: i for i, k in enumerate(keys)}
+    return keys, [pos[v] for v in values]
+
+def _take(table, codes):
+    """table[code] for every code."""
+    if NUMPY_AVAILABLE:
+        return np.asarray(table)[codes]
+    return [table[c] for c in codes]
+
+def _mul(a, b):
+    if NUMPY_AVAILABLE:
+        return a * b
+    return [x * y for x, y in zip(a, b)]
+
+def _sum_by(index, n, weights=None):
+    """Per-group totals: sum of `weights` (or 1) for each group index 0..n-1."""
+    if NUMPY_AVAILABLE:
+        return np.bincount(index, weights=weights, minlength=n).tolist()
+    out = [0] * n
+    if weights is None:
+        for i in index:
+            out[i] += 1
+    else:
+        for i, w in zip(index, weights):
+            out[i] += w
+    return out
+
+def _grade_matrix(index, n, grade):
+    """n rows of per-grade counts (GRADES order, then the 'other' slot)."""
+    width = len(GRADES) + 1
+    if NUMPY_AVAILABLE:
+        flat = np.bincount(index * width + grade, minlength=n * width)
+        return flat.reshape(n, width).tolist()
+    counts = [[0] * width for _ in range(n)]
+    for i, g in zip(index, grade):
+        counts[i][g] += 1
+    return counts
+
+def _ratio(num, den, digits=3):
+    return round(num / den, digits) if den else None
+
+# ----------------------- REPORTS -----------------------
+# Each report returns (columns, rows) ready for a Treeview or a CSV file.
+def student_gpa(data):
+    """Credit-weighted GPA, credits attempted/earned and course count per student."""
+    keys, idx = _factorize(data.stu)
+    n = len(keys)
+    graded_credits = _mul(data.credits, _take(_GRADED, data.grade))
+    quality = _mul(data.credits, _take(_POINTS, data.grade))
+    earned = _mul(data.credits, _take(_PASSED, data.grade))
+    courses = _sum_by(idx, n)
+    attempted = _sum_by(idx, n, graded_credits)
+    points = _sum_by(idx, n, quality)
+    passed = _sum_by(idx, n, earned)
+    rows = [(k, int(courses[i]), attempted[i], passed[i], _ratio(points[i], attempted[i], 2))
+            for i, k in enumerate(keys)]
+    return ["Stu_ID", "Courses", "Credits_Attempted", "Credits_Earned", "GPA"], rows
+
+def _distribution(keys, idx, data, label):
+    n = len(keys)
+    matrix = _grade_matrix(idx, n, data.grade)
+    quality = _sum_by(idx, n, _take(_POINTS, data.grade))
+    rows = []
+    for i, k in enumerate(keys):
+        counts = matrix[i]
+        graded = sum(counts[:_OTHER])
+        passed = sum(c for c, p in zip(counts, _PASSED) if p)
+        rows.append((k, sum(counts), *counts[:_OTHER], counts[_OTHER],
+                     _ratio(passed, graded), _ratio(quality[i], graded, 2)))
+    return [label, "Enrolled", *GRADES, "Other", "Pass_Rate", "Avg_Points"], rows
+
+def course_grades(data):
+    """Grade distribution, pass rate and average grade points per course."""
+    keys, idx = _factorize(data.course)
+    return _distribution(keys, idx, data, "Course_ID")
+
+def department_grades(data):
+    """Grade distribution, pass rate and average grade points per course department (0 = none)."""
+    keys, idx = _factorize(data.dept)
+    return _distribution(keys, idx, data, "Dept_ID")
+
+def department_load(data, cur):
+    """Teaching load per department: courses, credits offered, enrolments and
+    credit-hours, also per professor in the department."""
+    cur.execute("SELECT COALESCE(Dept_ID, 0), COUNT(*), COALESCE(SUM(Credits), 0) FROM Course GROUP BY 1")
+    courses = {d: (n, cr) for d, n, cr in cur.fetchall()}
+    cur.execute("SELECT COALESCE(Dept_ID, 0), COUNT(*) FROM Professor GROUP BY 1")
+    professors = dict(cur.fetchall())
+    keys, idx = _factorize(data.dept)
+    n = len(keys)
+    enrolled = dict(zip(keys, _sum_by(idx, n)))
+    credit_hours = dict(zip(keys, _sum_by(idx, n, data.credits)))
+    rows = []
+    for d in sorted(set(courses) | set(professors) | set(keys)):
+        n_courses, credits = courses.get(d, (0, 0))
+        profs = professors.get(d, 0)
+        hours = credit_hours.get(d, 0)
+        rows.append((d, profs, n_courses, int(credits), int(enrolled.get(d, 0)), hours,
+                     _ratio(n_courses, profs, 2), _ratio(hours, profs, 1)))
+    return ["Dept_ID", "Professors", "Courses", "Credits_Offered", "Enrollments",
+            "Credit_Hours", "Courses_per_Prof", "Credit_Hours_per_Prof"], rows
+
+REPORTS = {
+    "Student GPA": student_gpa,
+    "Course grades": course_grades,
+    "Department grades": department_grades,
+    "Department load": department_load,
+}
+
+def run_report(conn, name, progress=None, cancel=None, include_history=False):
+    """Load the enrollments (current term, or every term with `include_history`)
+    and build report `name` → (columns, rows)."""
+    data = load_enrollments(conn, progress=progress, cancel=cancel, include_history=include_history)
+    report = REPORTS[name]
+    if report is department_load:
+        cur = conn.cursor(buffered=True)
+        try:
+            return report(data, cur)
+        finally:
+            cur.close()
+    return report(data)
+
+# ----------------------- SUMMARY TABLES -----------------------
+# stat_student_gpa and stat_course_grades (created by college_migrations)
+# hold the last computed values. refresh_summaries() recomputes only the
+# students and courses change_log lists as changed since the change id kept
+# in stat_refresh (the watermark), and writes only the rows whose values
+# changed. Enrollment changes are logged with Stu_ID as row_key and
+# Course_ID as ref_key.
+_SUMMARIES = {
+    "stat_student_gpa": ("Stu_ID", ["Courses", "Credits_Attempted", "Credits_Earned", "GPA"]),
+    "stat_course_grades": ("Course_ID", ["Enrolled", "Pass_Rate", "Avg_Points"]),
+}
+SUMMARY_WATERMARK = "summaries"   # stat_refresh.name of the summary tables' watermark
+INCREMENTAL_MAX_KEYS = 5000       # more changed students and courses than this: recompute everything
+
+def _summary_rows(data):
+    _, gpa = student_gpa(data)
+    _, grades = course_grades(data)
+    return {
+        "stat_student_gpa": {r[0]: tuple(r[1:]) for r in gpa},
+        "stat_course_grades": {r[0]: (r[1], r[-2], r[-1]) for r in grades},
+    }
+
+def _same(a, b):
+    return all((x is None and y is None) or (x is not None and y is not None and abs(float(x) - float(y)) < 1e-6)
+               for x, y in zip(a, b))
+
+def _in(values):
+    return ", ".join(["%s"] * len(values))
+
+def _select_in(cur, sql, column, keys):
+    """Rows of `sql` with `column` in `keys`; every row when `keys` is None."""
+    if keys is None:
+        cur.execute(sql)
+        return cur.fetchall()
+    if not keys:
+        return []
+    keys = list(keys)
+    cur.execute(f"{sql} WHERE {column} IN ({_in(keys)})", keys)
+    return cur.fetchall()
+
+def _watermark(cur):
+    cur.execute("SELECT change_id FROM stat_refresh WHERE name = %s", (SUMMARY_WATERMARK,))
+    row = cur.fetchone()
+    return row[0] if row else 0
+
+def changed_keys(cur, since):
+    """(Stu_IDs, Course_IDs) whose summaries may differ from those computed at
+    change id `since`, or None when only a full recompute is safe: first run,
+    change_log pruned past `since`, a restore, or a Student/Course delete
+    (the Enrollment rows it cascades to are not logged)."""
+    if not since:
+        return None
+    cur.execute("SELECT COUNT(*) FROM change_log WHERE id = %s", (since,))
+    if not cur.fetchone()[0]:
+        return None
+    cur.execute("SELECT table_name, row_key, ref_key, op FROM change_log "
+                "WHERE id > %s AND table_name IN ('Enrollment', 'Course', 'Student')", (since,))
+    students, courses, credits = set(), set(), set()
+    for table, key, ref, op in cur.fetchall():
+        if op == "R" or (op == "D" and table != "Enrollment"):
+            return None
+        if table == "Enrollment":
+            students.add(key)
+            courses.add(ref)
+        elif table == "Course":
+            credits.add(key)   # its Credits weigh the GPA of everyone who took it
+    if credits:
+        students.update(r[0] for r in _select_in(cur, f"SELECT DISTINCT Stu_ID FROM {_WITH_HISTORY} e",
+                                                  "e.Course_ID", credits))
+        courses |= credits
+    if len(students) + len(courses) > INCREMENTAL_MAX_KEYS:
+        return None
+    return students, courses
+
+def refresh_summaries(conn, full=False):
+    """Bring the summary tables up to date; returns {table: rows written or deleted}.
+
+    Recomputes the students and courses changed since the last refresh (see
+    changed_keys()), or everything on the first run, with `full` or when the
+    change_log cannot tell; only rows whose values differ from the stored
+    ones are written. Both tables cover every term, archived ones included:
+    a GPA is cumulative. Enrollment_History outlives deleted students, whose
+    grades still count for their courses but who get no stat_student_gpa row
+    (its Stu_ID references Student).
+    """
+    cur = conn.cursor(buffered=True)
+    changed = {}
+    try:
+        head = q.change_log_head(cur)   # before reading, so later changes are picked up next time
+        scope = None if full else changed_keys(cur, _watermark(cur))
+        students = courses = None
+        if scope is None:
+            fresh = _summary_rows(load_enrollments(conn, include_history=True))
+        else:
+            students, courses = scope
+            fresh = {
+                "stat_student_gpa": _summary_rows(load_enrollments(
+                    conn, students=students, include_history=True))["stat_student_gpa"],
+                "stat_course_grades": _summary_rows(load_enrollments(
+                    conn, courses=courses, include_history=True))["stat_course_grades"],
+            }
+        existing = {r[0] for r in _select_in(cur, "SELECT Stu_ID FROM Student", "Stu_ID", students)}
+        fresh["stat_student_gpa"] = {k: v for k, v in fresh["stat_student_gpa"].items() if k in existing}
+        for table, (key, cols) in _SUMMARIES.items():
+            rows = _select_in(cur, f"SELECT {key}, {', '.join(cols)} FROM {table}", key,
+                              students if key == "Stu_ID" else courses)
+            stored = {r[0]: tuple(r[1:]) for r in rows}
+            new = fresh[table]
+            upserts = [(k, *v) for k, v in new.items() if k not in stored or not _same(stored[k], v)]
+            gone = [(k,) for k in stored if k not in new]
+            if upserts:
+                updates = ", ".join(f"{c} = VALUES({c})" for c in cols)
+                cur.executemany(f"INSERT INTO {table} ({key}, {', '.join(cols)}) "
+                                f"VALUES ({', '.join(['%s'] * (len(cols) + 1))}) "
+                                f"ON DUPLICATE KEY UPDATE {updates}, refreshed_at = CURRENT_TIMESTAMP",
+                                upserts)
+            if gone:
+                cur.executemany(f"DELETE FROM {table} WHERE {key} = %s", gone)
+            changed[table] = len(upserts) + len(gone)
+        cur.execute("INSERT INTO stat_refresh (name, change_id) VALUES (%s, %s) "
+                    "ON DUPLICATE KEY UPDATE change_id = VALUES(change_id), refreshed_at = CURRENT_TIMESTAMP",
+                    (SUMMARY_WATERMARK, head))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+    return changed
@@ -0,0 +1,455 @@
+# college_backup.py — parallel per-table dump and restore
+#
+# A dump is a directory with one or more gzipped CSV chunk files per table
+# and a manifest.json listing, per table, its columns, CREATE TABLE
+# statement, row count and every chunk's row count and SHA-256, plus the
+# CREATE statements of the database's procedures, functions, triggers and
+# views. Tables are read in parallel, each worker inside a consistent-snapshot
+# transaction; the snapshots are all opened while the tables are read-locked,
+# so the dump is one point in time. Restore checks the checksums, creates
+# missing tables, drops the non-unique secondary indexes, loads the tables in
+# parallel with foreign-key checks off, commits only once every table has
+# loaded, then builds the indexes again and creates missing schema objects.
+#
+#   python college_backup.py dump backups/today
+#   python college_backup.py restore backups/today --tables Student
+import argparse, csv, gzip, hashlib, json, os, queue, re, shutil, sys, threading, time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from college_db import DB_CONFIG, ConnectionPool
+from college_integrity import KEYS
+
+DUMP_WORKERS = 3
+DUMP_CHUNK_ROWS = 100000   # rows per chunk file
+DUMP_FETCH_SIZE = 5000
+RESTORE_WORKERS = 3
+RESTORE_BATCH = 1000       # rows per executemany while restoring
+MANIFEST = "manifest.json"
+FORMAT = 2                 # manifest version; 2 escapes text that starts with a backslash
+NULL = r"\N"               # NULL marker in chunk files (an empty field is an empty string)
+
+def _sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def _text(v):
+    """Chunk-file field for `v`. Text starting with a backslash gets one more,
+    so a literal '\\N' never reads back as NULL."""
+    if v is None:
+        return NULL
+    if isinstance(v, (bytes, bytearray)):
+        v = v.decode("utf-8")
+    if isinstance(v, str) and v.startswith("\\"):
+        return "\\" + v
+    return v
+
+def _value(field, escaped=True):
+    """Inverse of _text(); `escaped` is False for dumps written before FORMAT 2."""
+    if field == NULL:
+        return None
+    if escaped and field.startswith("\\"):
+        return field[1:]
+    return field
+
+# ----------------------- SCHEMA OBJECTS -----------------------
+# (kind, statement listing them, column of the name, column of SHOW CREATE's statement)
+_OBJECT_KINDS = [
+    ("FUNCTION", "SHOW FUNCTION STATUS WHERE Db = DATABASE()", 1, 2),
+    ("PROCEDURE", "SHOW PROCEDURE STATUS WHERE Db = DATABASE()", 1, 2),
+    ("VIEW", "SHOW FULL TABLES WHERE Table_type = 'VIEW'", 0, 1),
+    ("TRIGGER", "SHOW TRIGGERS", 0, 2),
+]
+_DEFINER = re.compile(r"\s*DEFINER\s*=\s*(`[^`]*`|\w+)@(`[^`]*`|[\w.%]+)")
+
+def base_tables(cur):
+    """Every base table of the current database."""
+    cur.execute("SHOW FULL TABLES WHERE Table_type = 'BASE TABLE'")
+    return [r[0] for r in cur.fetchall()]
+
+def object_names(cur):
+    """[(kind, name)] of the procedures, functions, views and triggers of the current database."""
+    names = []
+    for kind, sql, col, _ in _OBJECT_KINDS:
+        cur.execute(sql)
+        names += [(kind, r[col]) for r in cur.fetchall()]
+    return names
+
+def _dump_objects(cur):
+    """[{kind, name, create}] in the order they can be created again; the
+    DEFINER is dropped so the restoring user becomes the definer."""
+    out = []
+    for kind, name in object_names(cur):
+        create_col = next(c for k, _, _, c in _OBJECT_KINDS if k == kind)
+        cur.execute(f"SHOW CREATE {kind} `{name}`")
+        out.append({"kind": kind, "name": name, "create": _DEFINER.sub("", cur.fetchone()[create_col], 1)})
+    return out
+
+# ----------------------- DUMP -----------------------
+def _dump_table(conn, table, out_dir, log):
+    """Write `table` to chunk files from the snapshot open on `conn`."""
+    entry = {"key": KEYS.get(table, []), "rows": 0, "chunks": []}
+    cur = conn.cursor(buffered=True)
+    try:
+        cur.execute(f"SHOW CREATE TABLE {table}")
+        entry["create"] = cur.fetchone()[1]
+    finally:
+        cur.close()
+    order = f" ORDER BY {', '.join(entry['key'])}" if entry["key"] else ""
+    cur = conn.cursor()   # unbuffered: DUMP_FETCH_SIZE rows in memory at a time
+    f = w = None
+
+    def close_chunk():
+        f.close()
+        chunk = entry["chunks"][-1]
+        chunk["sha256"] = _sha256(os.path.join(out_dir, chunk["file"]))
+
+    try:
+        cur.execute(f"SELECT * FROM {table}{order}")
+        entry["columns"] = [d[0] for d in cur.description]
+        while True:
+            rows = cur.fetchmany(DUMP_FETCH_SIZE)
+            if not rows:
+                break
+            for row in rows:
+                if w is None or entry["chunks"][-1]["rows"] >= DUMP_CHUNK_ROWS:
+                    if f:
+                        close_chunk()
+                    name = f"{table}.{len(entry['chunks']):05d}.csv.gz"
+                    f = gzip.open(os.path.join(out_dir, name), "wt", newline="", encoding="utf-8")
+                    w = csv.writer(f)
+                    entry["chunks"].append({"file": name, "rows": 0})
+                w.writerow([_text(v) for v in row])
+                entry["chunks"][-1]["rows"] += 1
+            entry["rows"] += len(rows)
+        if f:
+            close_chunk()
+    finally:
+        cur.close()
+    log(f"{table}: {entry['rows']} rows in {len(entry['chunks'])} chunk(s)")
+    return entry
+
+def dump(out_dir, tables=None, workers=DUMP_WORKERS, config=None, log=print):
+    """Dump `tables` into `out_dir`, replacing it when complete.
+
+    The default is a full backup: every base table (change_log,
+    schema_migrations and the stat_* tables included) and every procedure,
+    function, trigger and view. A dump of named tables has no schema objects.
+    Returns the manifest. The dump is written to `<out_dir>.tmp` first, so an
+    existing dump at `out_dir` is only replaced by a complete one.
+    """
+    tmp = out_dir + ".tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    pool = ConnectionPool(size=max(1, workers) + 1, **(config or DB_CONFIG))
+    conns = []
+    objects = []
+    start = time.perf_counter()
+    try:
+        # Hold read locks while every worker opens its snapshot, so all of
+        # them see the same committed state
+        with pool.connection() as locker:
+            cur = locker.cursor(buffered=True)
+            try:
+                if not tables:
+                    tables = base_tables(cur)
+                    objects = _dump_objects(cur)
+                tables = list(tables)
+                if not tables:
+                    shutil.rmtree(tmp, ignore_errors=True)
+                    raise ValueError(f"No tables to dump in {(config or DB_CONFIG)['database']}")
+                workers = max(1, min(workers, len(tables)))
+                cur.execute("LOCK TABLES " + ", ".join(f"{t} READ" for t in tables))
+                try:
+                    for _ in range(workers):
+                        conn = pool.acquire()
+                        conns.append(conn)
+                        c = conn.cursor()
+                        c.execute("SET SESSION TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+                        c.execute("START TRANSACTION WITH CONSISTENT SNAPSHOT, READ ONLY")
+                        c.close()
+                finally:
+                    cur.execute("UNLOCK TABLES")
+            finally:
+                cur.close()
+
+        todo = queue.Queue()
+        for t in tables:
+            todo.put(t)
+        entries = {}
+
+        def work(conn):
+            while True:
+                try:
+                    table = todo.get_nowait()
+                except queue.Empty:
+                    return
+                entries[table] = _dump_table(conn, table, tmp, log)
+
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            for f in [ex.submit(work, c) for c in conns]:
+                f.result()
+    finally:
+        for conn in conns:
+            try:
+                conn.rollback()
+            finally:
+                pool.release(conn)
+        pool.close_all()
+
+    manifest = {"format": FORMAT,
+                "created": datetime.now().isoformat(timespec="seconds"),
+                "database": (config or DB_CONFIG)["database"],
+                "seconds": round(time.perf_counter() - start, 3),
+                "tables": {t: entries[t] for t in tables},
+                "objects": objects}
+    with open(os.path.join(tmp, MANIFEST), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    old = out_dir + ".old"
+    if os.path.exists(out_dir):
+        shutil.rmtree(old, ignore_errors=True)
+        os.replace(out_dir, old)
+    os.replace(tmp, out_dir)
+    shutil.rmtree(old, ignore_errors=True)
+    return manifest
+
+# ----------------------- RESTORE -----------------------
+_INDEX_LINE = re.compile(r"^\s*((?:FULLTEXT |SPATIAL )?KEY `(\w+)` \(`(\w+)`.*?),?$")
+_FK_LINE = re.compile(r"FOREIGN KEY \(`(\w+)`")
+
+def secondary_indexes(create):
+    """[(name, definition)] of the indexes in a CREATE TABLE statement that can be
+    dropped and re-added: non-unique ones a foreign key does not need. Primary
+    and UNIQUE keys stay, so a restore never leaves a table without them."""
+    fk_columns = set(_FK_LINE.findall(create))
+    out = []
+    for line in create.splitlines():
+        m = _INDEX_LINE.match(line)
+        if m and m.group(3) not in fk_columns:
+            out.append((m.group(2), m.group(1)))
+    return out
+
+def load_manifest(dump_dir):
+    with open(os.path.join(dump_dir, MANIFEST), encoding="utf-8") as f:
+        return json.load(f)
+
+def verify(dump_dir, manifest, tables):
+    """Raise ValueError when a chunk file is missing or its checksum does not match."""
+    for t in tables:
+        for chunk in manifest["tables"][t]["chunks"]:
+            path = os.path.join(dump_dir, chunk["file"])
+            if not os.path.exists(path):
+                raise ValueError(f"{chunk['file']} is missing from {dump_dir}")
+            if _sha256(path) != chunk["sha256"]:
+                raise ValueError(f"{chunk['file']} does not match its checksum; the dump is damaged")
+
+_REFERENCES = re.compile(r"REFERENCES `(\w+)`")
+
+def create_order(manifest, tables):
+    """`tables` ordered so each comes after the tables its foreign keys reference."""
+    out, done = [], set()
+
+    def visit(table, path):
+        if table in done or table in path:
+            return
+        for parent in _REFERENCES.findall(manifest["tables"][table].get("create", "")):
+            if parent in manifest["tables"]:
+                visit(parent, path | {table})
+        done.add(table)
+        out.append(table)
+
+    for t in tables:
+        visit(t, set())
+    return [t for t in out if t in tables]
+
+def _load_chunk(cur, sql, path, escaped=True):
+    """Insert the rows of one chunk file; the caller commits."""
+    loaded = 0
+    with gzip.open(path, "rt", newline="", encoding="utf-8") as f:
+        batch = []
+        for raw in csv.reader(f):
+            batch.append(tuple(_value(v, escaped) for v in raw))
+            if len(batch) >= RESTORE_BATCH:
+                cur.executemany(sql, batch)
+                loaded += len(batch)
+                batch = []
+        if batch:
+            cur.executemany(sql, batch)
+            loaded += len(batch)
+    return loaded
+
+def restore(dump_dir, tables=None, workers=RESTORE_WORKERS, config=None, log=print, progress=None):
+    """Replace the rows of `tables` (default: every table in the dump) with the dump's.
+
+    Tables missing from the database are first created from the manifest,
+    parents before children. Each worker deletes and reloads whole tables in
+    one transaction, and the transactions are committed only once every
+    table has loaded, so a failure leaves the old rows in place. The session
+    runs with foreign-key checks off and @college_restore set, which the
+    DOB and change_log triggers skip; one change_log entry with op 'R' per
+    table then tells other clients to reload it. A full restore also creates
+    the dump's procedures, functions, triggers and views that are missing.
+    Restoring a single table can leave rows in other tables pointing at keys
+    it no longer has; college_integrity reports them. Returns {table: rows loaded}.
+    """
+    manifest = load_manifest(dump_dir)
+    full = not tables
+    tables = list(tables or manifest["tables"])
+    missing = [t for t in tables if t not in manifest["tables"]]
+    if missing:
+        raise ValueError(f"Not in this dump: {', '.join(missing)}")
+    verify(dump_dir, manifest, tables)
+    escaped = manifest.get("format", 1) >= 2
+    total = sum(manifest["tables"][t]["rows"] for t in tables) or 1
+    workers = max(1, min(workers, len(tables)))
+    pool = ConnectionPool(size=workers, **(config or DB_CONFIG))
+    loaded = {t: 0 for t in tables}
+    lock = threading.Lock()
+    dropped = {}
+    try:
+        # DDL commits implicitly, so it all happens before the load transactions
+        with pool.connection() as conn:
+            cur = conn.cursor(buffered=True)
+            try:
+                cur.execute("SET SESSION foreign_key_checks = 0")
+                present = set(base_tables(cur))
+                for t in create_order(manifest, tables):
+                    if t not in present:
+                        cur.execute(manifest["tables"][t]["create"])
+                        log(f"{t}: created")
+                        continue
+                    cur.execute(f"SHOW CREATE TABLE {t}")
+                    indexes = secondary_indexes(cur.fetchone()[1])
+                    if indexes:
+                        cur.execute(f"ALTER TABLE {t} " + ", ".join(f"DROP INDEX `{n}`" for n, _ in indexes))
+                        dropped[t] = indexes
+                        log(f"{t}: {len(indexes)} index(es) dropped")
+            finally:
+                cur.execute("SET SESSION foreign_key_checks = 1")
+                cur.close()
+
+        todo = queue.Queue()
+        for t in tables:
+            todo.put(t)
+        stop = threading.Event()
+
+        def work(conn):
+            cur = conn.cursor()
+            try:
+                cur.execute("SET SESSION foreign_key_checks = 0")
+                cur.execute("SET @college_restore = 1")
+                while not stop.is_set():
+                    try:
+                        table = todo.get_nowait()
+                    except queue.Empty:
+                        return
+                    entry = manifest["tables"][table]
+                    columns = entry["columns"]
+                    sql = (f"INSERT INTO {table} ({', '.join(columns)}) "
+                           f"VALUES ({', '.join(['%s'] * len(columns))})")
+                    cur.execute(f"DELETE FROM {table}")
+                    for chunk in entry["chunks"]:
+                        if stop.is_set():
+                            return
+                        n = _load_chunk(cur, sql, os.path.join(dump_dir, chunk["file"]), escaped)
+                        with lock:
+                            loaded[table] += n
+                            if progress:
+                                progress(sum(loaded.values()) / total)
+            except Exception:
+                stop.set()   # the others stop too; nothing is committed
+                raise
+            finally:
+                cur.close()
+
+        conns = []
+        committed = False
+        try:
+            for _ in range(workers):
+                conns.append(pool.acquire())
+            with ThreadPoolExecutor(max_workers=workers) as ex:
+                for f in [ex.submit(work, c) for c in conns]:
+                    f.result()
+            for t in tables:
+                expected = manifest["tables"][t]["rows"]
+                if loaded[t] != expected:
+                    raise ValueError(f"{t}: loaded {loaded[t]} rows, the manifest lists {expected}")
+            for conn in conns:
+                conn.commit()
+            committed = True
+        finally:
+            for conn in conns:
+                try:
+                    if not committed:
+                        conn.rollback()
+                    cur = conn.cursor()
+                    cur.execute("SET SESSION foreign_key_checks = 1")
+                    cur.execute("SET @college_restore = NULL")
+                    cur.close()
+                finally:
+                    pool.release(conn)
+        log(f"{len(tables)} table(s) loaded")
+
+        with pool.connection() as conn:
+            cur = conn.cursor(buffered=True)
+            try:
+                if "change_log" in base_tables(cur):
+                    cur.executemany("INSERT INTO change_log (table_name, row_key, op, client) "
+                                    "VALUES (%s, 0, 'R', @college_client)",
+                                    [(t,) for t in tables if t != "change_log"])
+                    conn.commit()
+                if full:
+                    existing = set(object_names(cur))
+                    for obj in manifest.get("objects", []):
+                        if (obj["kind"], obj["name"]) not in existing:
+                            cur.execute(obj["create"])
+                            log(f"Created {obj['kind'].lower()} {obj['name']}")
+            finally:
+                cur.close()
+    finally:
+        # Indexes come back even when loading failed part way
+        def rebuild(item):
+            table, indexes = item
+            with pool.connection() as conn:
+                cur = conn.cursor()
+                try:
+                    # InnoDB builds one FULLTEXT index per ALTER; the rest go together
+                    plain = [d for _, d in indexes if not d.startswith("FULLTEXT")]
+                    if plain:
+                        cur.execute(f"ALTER TABLE {table} " + ", ".join(f"ADD {d}" for d in plain))
+                    for _, d in indexes:
+                        if d.startswith("FULLTEXT"):
+                            cur.execute(f"ALTER TABLE {table} ADD {d}")
+                finally:
+                    cur.close()
+            log(f"{table}: {len(indexes)} index(es) rebuilt")
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            list(ex.map(rebuild, dropped.items()))
+        pool.close_all()
+    return loaded
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Parallel dump and restore of the college database.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("dump", help="write every table, routine, trigger and view (or only --tables) to DIR")
+    p.add_argument("dir")
+    p.add_argument("--tables", nargs="+")
+    p.add_argument("--workers", type=int, default=DUMP_WORKERS)
+    p = sub.add_parser("restore", help="load the tables of the dump in DIR")
+    p.add_argument("dir")
+    p.add_argument("--tables", nargs="+")
+    p.add_argument("--workers", type=int, default=RESTORE_WORKERS)
+    args = parser.parse_args(argv)
+    start = time.perf_counter()
+    if args.command == "dump":
+        manifest = dump(args.dir, args.tables, args.workers)
+        rows = sum(t["rows"] for t in manifest["tables"].values())
+    else:
+        rows = sum(restore(args.dir, args.tables, args.workers).values())
+    print(f"{rows} rows in {time.perf_counter() - start:.1f} s")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,8 @@
+"""Synthetic data generator and benchmark suite for the college schema.
+
+    python -m college_bench generate --students 100000 --enrollments 1000000
+    python -m college_bench run --out results.json --compare baseline.json
+
+Both commands target a separate MySQL database (BENCH_DATABASE) by default,
+or an embedded SQLite file with --sqlite PATH when no server is available.
+"""
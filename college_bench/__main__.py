@@ -0,0 +1,60 @@
+# college_bench/__main__.py — command line: generate data, run benchmarks
+import argparse, sys
+from .backends import BENCH_DATABASE, get_backend
+from .generator import DEFAULT_VOLUMES, GENERATE_BATCH, generate
+from .suite import compare, load, run_suite, save
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m college_bench",
+                                     description="Synthetic data and benchmarks for the college schema.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def target(p):
+        p.add_argument("--sqlite", metavar="PATH", help="use an SQLite file instead of MySQL")
+        p.add_argument("--database", default=BENCH_DATABASE, help="MySQL database (default: %(default)s)")
+
+    gen = sub.add_parser("generate", help="create the schema and fill it with synthetic rows")
+    target(gen)
+    for name, default in DEFAULT_VOLUMES.items():
+        gen.add_argument(f"--{name}", type=int, default=default, help=f"default: {default}")
+    gen.add_argument("--seed", type=int, default=42)
+    gen.add_argument("--batch", type=int, default=GENERATE_BATCH, help="rows per insert batch")
+    gen.add_argument("--no-reset", action="store_true", help="keep existing tables (IDs will clash)")
+
+    run = sub.add_parser("run", help="time the app's query paths")
+    target(run)
+    run.add_argument("--repeat", type=int, default=20, help="calls per benchmark")
+    run.add_argument("--only", nargs="+", metavar="BENCH", help="e.g. bench_dashboard bench_export")
+    run.add_argument("--out", metavar="FILE", help="write results as JSON")
+    run.add_argument("--compare", metavar="BASELINE", help="JSON from an earlier run")
+    run.add_argument("--tolerance", type=float, default=0.2,
+                     help="allowed p50 slow-down before failing (default: %(default)s)")
+
+    args = parser.parse_args(argv)
+    backend = get_backend(args.sqlite, args.database)
+
+    if args.command == "generate":
+        volumes = {name: getattr(args, name) for name in DEFAULT_VOLUMES}
+        generate(backend, volumes, seed=args.seed, batch=args.batch, reset=not args.no_reset)
+        return 0
+
+    result = run_suite(backend, repeat=args.repeat, only=args.only)
+    print(f"\n{'benchmark':<34}{'p50 ms':>10}{'p95 ms':>10}{'mean ms':>10}{'rows/s':>12}")
+    for name, st in result["results"].items():
+        print(f"{name:<34}{st['p50_ms']:>10.2f}{st['p95_ms']:>10.2f}{st['mean_ms']:>10.2f}"
+              f"{st.get('rows_per_s', ''):>12}")
+    if args.out:
+        save(result, args.out)
+        print(f"\nResults written to {args.out}")
+    if args.compare:
+        regressions = compare(result, load(args.compare), args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.tolerance:.0%}:")
+            for name, old, new in regressions:
+                print(f"  {name}: p50 {old:.2f} ms → {new:.2f} ms")
+            return 1
+        print("\nNo regressions against", args.compare)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
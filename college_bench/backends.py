@@ -0,0 +1,234 @@
+# college_bench/backends.py — MySQL and embedded SQLite targets for the generator and benchmarks
+import os, re, sqlite3
+from contextlib import contextmanager
+import mysql.connector
+from college_db import DB_CONFIG
+from college_migrations import migrate
+import college_queries as q
+
+BENCH_DATABASE = "student_database_bench"   # never the live database by default
+
+# ----------------------- SCHEMA -----------------------
+# The tables come from the project's SQL script, the one source of the base
+# schema; MySQL then gets everything later from college_migrations. The
+# script's CREATE TABLE statements are valid for both MySQL and SQLite.
+SCHEMA_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                             "PES2UG23CS694_PES2UG23CS689.sql")
+_CREATE_TABLE = re.compile(r"^CREATE TABLE (\w+) \((.*?)^\);", re.M | re.S)
+_COMMENT = re.compile(r"--[^\n]*")
+
+def script_tables(path=SCHEMA_SCRIPT):
+    """[(table, CREATE TABLE IF NOT EXISTS statement)] of the SQL script, in creation order."""
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    return [(name, f"CREATE TABLE IF NOT EXISTS {name} ({_COMMENT.sub('', body)})")
+            for name, body in _CREATE_TABLE.findall(text)]
+
+_TABLES = script_tables()
+TABLES = tuple(name for name, _ in _TABLES)
+SCHEMA = [ddl for _, ddl in _TABLES]
+
+# ----------------------- MYSQL -----------------------
+class MySQLBackend:
+    """A local MySQL server, using the GUI's credentials and a separate database.
+
+    Tables are created here; triggers, procedures, functions and indexes come
+    from college_migrations so the benchmarks run what the app runs.
+    """
+
+    name = "mysql"
+
+    def __init__(self, database=BENCH_DATABASE):
+        self.database = database
+        self.config = dict(DB_CONFIG, database=database)
+
+    def connect(self):
+        return mysql.connector.connect(**self.config)
+
+    def create_schema(self, reset=False):
+        server = dict(DB_CONFIG)
+        server.pop("database", None)
+        conn = mysql.connector.connect(**server)
+        try:
+            cur = conn.cursor()
+            cur.execute(f"CREATE DATABASE IF NOT EXISTS {self.database}")
+            cur.execute(f"USE {self.database}")
+            if reset:
+                self._drop_tables(cur)
+            for ddl in SCHEMA:
+                cur.execute(ddl)
+            migrate(cur, log=lambda msg: None)
+            conn.commit()
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _drop_tables(cur):
+        """Drop every table in the benchmark database, including the ones college_migrations
+        created (change_log, stat_*, academic_term, ...), so migrations start from scratch."""
+        cur.execute("SELECT TABLE_NAME FROM information_schema.TABLES "
+                    "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_TYPE = 'BASE TABLE'")
+        tables = [r[0] for r in cur.fetchall()]
+        cur.execute("SET foreign_key_checks = 0")
+        try:
+            for t in tables:
+                cur.execute(f"DROP TABLE IF EXISTS `{t}`")
+        finally:
+            cur.execute("SET foreign_key_checks = 1")
+        return tables
+
+    @contextmanager
+    def bulk_load(self, conn):
+        """Skip FK and unique re-checks while loading data that is valid by construction."""
+        cur = conn.cursor()
+        cur.execute("SET foreign_key_checks = 0, unique_checks = 0")
+        try:
+            yield
+        finally:
+            cur.execute("SET foreign_key_checks = 1, unique_checks = 1")
+            cur.close()
+
+    add_student = staticmethod(q.add_student)
+    students_by_department = staticmethod(q.students_by_department)
+    student_count_by_college = staticmethod(q.student_count_by_college)
+    department_hod = staticmethod(q.department_hod)
+
+# ----------------------- SQLITE STAND-IN -----------------------
+class _SQLiteCursor:
+    """Just enough of the mysql-connector cursor API over sqlite3 (%s → ?)."""
+
+    def __init__(self, conn):
+        self._cur = conn.cursor()
+
+    def execute(self, sql, params=None):
+        self._cur.execute(sql.replace("%s", "?"), tuple(params or ()))
+
+    def executemany(self, sql, seq):
+        self._cur.executemany(sql.replace("%s", "?"), seq)
+
+    def fetchone(self):
+        return self._cur.fetchone()
+
+    def fetchmany(self, size=1):
+        return self._cur.fetchmany(size)
+
+    def fetchall(self):
+        return self._cur.fetchall()
+
+    def nextset(self):
+        return None
+
+    def close(self):
+        self._cur.close()
+
+    @property
+    def description(self):
+        return self._cur.description
+
+    @property
+    def rowcount(self):
+        return self._cur.rowcount
+
+class _SQLiteConnection:
+    def __init__(self, path):
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA foreign_keys = ON")
+
+    def cursor(self, *args, **kwargs):
+        return _SQLiteCursor(self._conn)
+
+    def commit(self):
+        self._conn.commit()
+
+    def rollback(self):
+        self._conn.rollback()
+
+    def consume_results(self):
+        pass
+
+    def close(self):
+        self._conn.close()
+
+# SQLite versions of the server-side objects the app relies on
+_SQLITE_OBJECTS = [
+    """CREATE TRIGGER IF NOT EXISTS trg_student_Insert_Lowercase_Email
+       AFTER INSERT ON Professor FOR EACH ROW
+       BEGIN UPDATE Professor SET Email = LOWER(NEW.Email) WHERE Prof_ID = NEW.Prof_ID; END""",
+    """CREATE TRIGGER IF NOT EXISTS trg_Before_Student_Insert_Validate_DOB
+       BEFORE INSERT ON Student FOR EACH ROW WHEN NEW.DOB > date('now', '-18 years')
+       BEGIN SELECT RAISE(ABORT, 'Invalid DOB: Student must be at least 18 years old.'); END""",
+    "CREATE INDEX IF NOT EXISTS idx_student_name ON Student (Name)",
+    "CREATE INDEX IF NOT EXISTS idx_professor_name ON Professor (Name)",
+    "CREATE INDEX IF NOT EXISTS idx_course_name ON Course (Course_Name)",
+    "CREATE INDEX IF NOT EXISTS idx_student_clg ON Student (Clg_ID)",
+    "CREATE INDEX IF NOT EXISTS idx_student_dept ON Student (Dept_ID)",
+    "CREATE INDEX IF NOT EXISTS idx_professor_dept ON Professor (Dept_ID)",
+    "CREATE INDEX IF NOT EXISTS idx_course_dept ON Course (Dept_ID)",
+    "CREATE INDEX IF NOT EXISTS idx_enrollment_course ON Enrollment (Course_ID)",
+]
+
+class SQLiteBackend:
+    """Embedded SQLite file for when no MySQL server is available.
+
+    Procedures and functions become the equivalent plain SQL, so absolute
+    numbers are not comparable with MySQL runs, only with other SQLite runs.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path):
+        self.database = path
+
+    def connect(self):
+        return _SQLiteConnection(self.database)
+
+    def create_schema(self, reset=False):
+        conn = self.connect()
+        try:
+            cur = conn.cursor()
+            if reset:
+                for t in reversed(TABLES):
+                    cur.execute(f"DROP TABLE IF EXISTS {t}")
+            for stmt in SCHEMA + _SQLITE_OBJECTS:
+                cur.execute(stmt)
+            conn.commit()
+        finally:
+            conn.close()
+
+    @contextmanager
+    def bulk_load(self, conn):
+        cur = conn.cursor()
+        cur.execute("PRAGMA foreign_keys = OFF")
+        try:
+            yield
+        finally:
+            cur.execute("PRAGMA foreign_keys = ON")
+            cur.close()
+
+    @staticmethod
+    def add_student(cur, vals):
+        cur.execute("INSERT INTO Student (Stu_ID, Name, Phone_No, Email, DOB, Gender, Clg_ID, Dept_ID) "
+                    "VALUES (%s, %s, %s, %s, %s, %s, %s, %s)", vals)
+
+    @staticmethod
+    def students_by_department(cur, dept_name):
+        cur.execute("SELECT s.Name, s.Email FROM Student s JOIN Department d ON s.Dept_ID = d.Dept_ID "
+                    "WHERE d.Dept_Name = %s", (dept_name,))
+        return cur.fetchall()
+
+    @staticmethod
+    def student_count_by_college(cur, clg_id):
+        cur.execute("SELECT COUNT(*) FROM Student WHERE Clg_ID = %s", (clg_id,))
+        return cur.fetchone()[0]
+
+    @staticmethod
+    def department_hod(cur, dept_input):
+        cur.execute("SELECT Dept_Name FROM Department WHERE Dept_ID = %s", (dept_input,))
+        row = cur.fetchone()
+        dept_name = row[0] if row else dept_input
+        cur.execute("SELECT HOD FROM Department WHERE Dept_Name = %s", (dept_name,))
+        hod = cur.fetchone()
+        return dept_name, hod[0] if hod else None
+
+def get_backend(sqlite_path=None, database=BENCH_DATABASE):
+    return SQLiteBackend(sqlite_path) if sqlite_path else MySQLBackend(database)
@@ -0,0 +1,83 @@
+# college_bench/generator.py — referentially valid synthetic data at configurable volume
+import random
+from datetime import date, timedelta
+
+DEFAULT_VOLUMES = dict(colleges=20, departments=30, professors=500, courses=300,
+                       students=20000, enrollments=100000)
+GENERATE_BATCH = 5000   # rows per executemany / commit
+
+_FIRST = ["Aarav", "Diya", "Ishaan", "Meera", "Rohan", "Ananya", "Kabir", "Sara", "Vikram", "Neha",
+          "John", "Jane", "Peter", "Emily", "Chris", "Samantha", "Arjun", "Priya", "Rahul", "Kavya"]
+_LAST = ["Sharma", "Rao", "Iyer", "Patel", "Reddy", "Nair", "Gupta", "Smith", "Doe", "Jones",
+         "White", "Green", "Brown", "Kumar", "Singh", "Das", "Menon", "Joshi", "Shetty", "Bhat"]
+_GRADES = ["A", "A-", "B+", "B", "B-", "C+", "C", "D", "F"]
+_SUBJECTS = ["Databases", "Circuits", "Accounting", "Data Structures", "Chemistry", "Management",
+             "Algorithms", "Networks", "Economics", "Physics", "Statistics", "Literature"]
+
+def _name(rng):
+    return f"{rng.choice(_FIRST)} {rng.choice(_LAST)}"
+
+def _rows(volumes, rng):
+    """Yield (table, columns, row generator) in foreign-key order."""
+    v = volumes
+    yield "College", ("Clg_ID", "Clg_Name", "Address"), (
+        (i, f"College {i}", f"{i} Campus Road") for i in range(1, v["colleges"] + 1))
+    yield "Department", ("Dept_ID", "Dept_Name", "HOD"), (
+        (i, f"Department {i}", f"Dr. {_name(rng)}") for i in range(1, v["departments"] + 1))
+    yield "Professor", ("Prof_ID", "Name", "Phone_No", "Email", "Address", "Dept_ID"), (
+        (i, f"Dr. {_name(rng)}", str(7000000000 + i), f"prof{i}@college.edu", f"{i} Faculty Lane",
+         rng.randint(1, v["departments"])) for i in range(1, v["professors"] + 1))
+    yield "Course", ("Course_ID", "Course_Name", "Credits", "Dept_ID"), (
+        (i, f"{rng.choice(_SUBJECTS)} {i}", rng.randint(2, 5), rng.randint(1, v["departments"]))
+        for i in range(1, v["courses"] + 1))
+
+    # Every student is at least 18 so the DOB trigger never fires
+    latest_dob = date.today().replace(month=1, day=1) - timedelta(days=19 * 366)
+
+    def students():
+        for i in range(1, v["students"] + 1):
+            first, last = rng.choice(_FIRST), rng.choice(_LAST)
+            yield (i, f"{first} {last}", str(6000000000 + i), f"{first}.{last}{i}@students.edu".lower(),
+                   latest_dob - timedelta(days=rng.randint(0, 3650)), rng.choice(["Male", "Female"]),
+                   rng.randint(1, v["colleges"]), rng.randint(1, v["departments"]))
+    yield "Student", ("Stu_ID", "Name", "Phone_No", "Email", "DOB", "Gender", "Clg_ID", "Dept_ID"), students()
+
+    def enrollments():
+        # Spread the total evenly; (Stu_ID, Course_ID) pairs are distinct per student
+        per, extra = divmod(v["enrollments"], max(v["students"], 1))
+        for s in range(1, v["students"] + 1):
+            k = min(per + (1 if s <= extra else 0), v["courses"])
+            for c in rng.sample(range(1, v["courses"] + 1), k):
+                yield (s, c, rng.choice(_GRADES))
+    yield "Enrollment", ("Stu_ID", "Course_ID", "Grade"), enrollments()
+
+def generate(backend, volumes=None, seed=42, batch=GENERATE_BATCH, reset=True, log=print):
+    """Create the schema on `backend` and fill it; returns {table: rows inserted}."""
+    volumes = dict(DEFAULT_VOLUMES, **(volumes or {}))
+    rng = random.Random(seed)
+    backend.create_schema(reset=reset)
+    counts = {}
+    conn = backend.connect()
+    try:
+        with backend.bulk_load(conn):
+            cur = conn.cursor()
+            for table, cols, rows in _rows(volumes, rng):
+                sql = f"INSERT INTO {table} ({', '.join(cols)}) VALUES ({', '.join(['%s'] * len(cols))})"
+                n, chunk = 0, []
+                for row in rows:
+                    chunk.append(row)
+                    if len(chunk) >= batch:
+                        cur.executemany(sql, chunk)
+                        conn.commit()
+                        n += len(chunk)
+                        chunk = []
+                if chunk:
+                    cur.executemany(sql, chunk)
+                    conn.commit()
+                    n += len(chunk)
+                counts[table] = n
+                log(f"{table}: {n} rows")
+            cur.close()
+    finally:
+        conn.close()
+    return counts
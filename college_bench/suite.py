@@ -0,0 +1,227 @@
+# college_bench/suite.py — repeatable timings of the app's query paths
+import json, os, platform, statistics, tempfile, time
+from datetime import datetime
+from college_cache import StatsCache, STATS_TABLES
+from college_db import StatementCache
+from college_io import export_query
+import college_queries as q
+
+PAGE_SIZE = 200   # same window as the GUI's TableFrame
+TABLE_KEYS = {"College": "Clg_ID", "Department": "Dept_ID", "Professor": "Prof_ID",
+              "Course": "Course_ID", "Student": "Stu_ID"}
+
+def _stats(samples, rows=None):
+    """Summary of per-call latencies (seconds) in milliseconds."""
+    samples = sorted(samples)
+    total = sum(samples)
+    out = {
+        "runs": len(samples),
+        "mean_ms": round(total / len(samples) * 1000, 3),
+        "p50_ms": round(statistics.median(samples) * 1000, 3),
+        "p95_ms": round(samples[min(len(samples) - 1, int(0.95 * len(samples)))] * 1000, 3),
+        "min_ms": round(samples[0] * 1000, 3),
+        "total_s": round(total, 3),
+    }
+    if rows is not None and total:
+        out["rows"] = rows
+        out["rows_per_s"] = round(rows / total, 1)
+    return out
+
+def _time(func, args_list):
+    samples = []
+    for args in args_list:
+        t = time.perf_counter()
+        func(*args)
+        samples.append(time.perf_counter() - t)
+    return samples
+
+class _Context:
+    """Connection plus a few real keys from the generated data."""
+
+    def __init__(self, backend, repeat):
+        self.backend = backend
+        self.repeat = repeat
+        self.conn = backend.connect()
+        self.cur = self.conn.cursor(buffered=True)   # COUNT/fetchone results need no draining
+        self.cur.execute("SELECT Clg_ID FROM College ORDER BY Clg_ID")
+        self.colleges = [r[0] for r in self.cur.fetchall()]
+        self.cur.execute("SELECT Dept_ID, Dept_Name FROM Department ORDER BY Dept_ID")
+        self.departments = self.cur.fetchall()
+        self.cur.execute("SELECT COALESCE(MAX(Stu_ID), 0) FROM Student")
+        self.max_student = self.cur.fetchone()[0]
+
+    def close(self):
+        self.cur.close()
+        self.conn.close()
+
+# ----------------------- BENCHMARKS -----------------------
+def bench_table_pages(ctx):
+    """TableFrame paths: row count, first page, and a keyset page from the middle."""
+    out = {}
+    for table, key in TABLE_KEYS.items():
+        ctx.cur.execute(f"SELECT MIN({key}), MAX({key}) FROM {table}")
+        lo, hi = ctx.cur.fetchone()
+        mid = ((lo or 0) + (hi or 0)) // 2
+        def count():
+            ctx.cur.execute(*q.count_query(table))
+            ctx.cur.fetchone()
+        out[f"count_{table}"] = _stats(_time(count, [()] * ctx.repeat))
+        out[f"first_page_{table}"] = _stats(_time(
+            lambda: q.fetch_page(ctx.cur, table, key, PAGE_SIZE), [()] * ctx.repeat))
+        out[f"mid_page_{table}"] = _stats(_time(
+            lambda: q.fetch_page(ctx.cur, table, key, PAGE_SIZE, after=mid), [()] * ctx.repeat))
+        ctx.conn.commit()
+    return out
+
+def bench_dashboard(ctx):
+    """Home page counts: the cached single round trip vs one COUNT(*) per table."""
+    cache = StatsCache(ttl=0)   # ttl=0: every call goes to the database
+    def separate():
+        for t in STATS_TABLES:
+            ctx.cur.execute(f"SELECT COUNT(*) FROM {t}")
+            ctx.cur.fetchone()
+    return {
+        "dashboard_single_round_trip": _stats(_time(lambda: cache.get(ctx.cur), [()] * ctx.repeat)),
+        "dashboard_separate_counts": _stats(_time(separate, [()] * ctx.repeat)),
+    }
+
+def bench_add_student(ctx, n=500):
+    """sp_AddNewStudent (or its SQLite equivalent) one row at a time; rows are removed afterwards."""
+    first = ctx.max_student + 1
+    dept = ctx.departments[0][0] if ctx.departments else None
+    clg = ctx.colleges[0] if ctx.colleges else None
+    args = [((first + i, f"Bench Student {i}", f"5{first + i:09d}", f"bench{first + i}@bench.edu",
+              "2000-01-01", "Female", clg, dept),) for i in range(n)]
+    try:
+        samples = _time(lambda vals: ctx.backend.add_student(ctx.cur, vals), args)
+        ctx.conn.commit()
+    finally:
+        ctx.cur.execute("DELETE FROM Student WHERE Stu_ID >= %s", (first,))
+        ctx.conn.commit()
+    return {"sp_add_student": _stats(samples, rows=n)}
+
+def bench_procedures(ctx):
+    """sp_GetStudentsByDepartment and the two stored functions, once per key."""
+    names = [(d[1],) for d in ctx.departments] * max(1, ctx.repeat // max(len(ctx.departments), 1))
+    rows = 0
+    def by_dept(name):
+        nonlocal rows
+        rows += len(ctx.backend.students_by_department(ctx.cur, name))
+    out = {"sp_students_by_department": _stats(_time(by_dept, names), rows=rows)}
+    out["fn_student_count_by_college"] = _stats(_time(
+        lambda c: ctx.backend.student_count_by_college(ctx.cur, c), [(c,) for c in ctx.colleges]))
+    out["fn_department_hod"] = _stats(_time(
+        lambda d: ctx.backend.department_hod(ctx.cur, d), [(d[0],) for d in ctx.departments]))
+    ctx.conn.commit()
+    return out
+
+def bench_statements(ctx, n=300):
+    """TableFrame CRUD over the text protocol vs statements prepared once (StatementCache).
+
+    Per row: insert, update and delete one Course row, committing each as
+    the GUI does. Bulk: n updates in one transaction, executemany() vs one
+    prepared statement re-executed. Rows are removed afterwards.
+    """
+    ctx.cur.execute("SELECT COALESCE(MAX(Course_ID), 0) FROM Course")
+    first = ctx.cur.fetchone()[0] + 1
+    dept = ctx.departments[0][0] if ctx.departments else None
+    insert = "INSERT INTO Course VALUES(%s,%s,%s,%s)"
+    update = "UPDATE Course SET Course_Name=%s,Credits=%s,Dept_ID=%s WHERE Course_ID=%s"
+    delete = "DELETE FROM Course WHERE Course_ID=%s"
+    ids = [(first + i,) for i in range(n)]
+    cache = StatementCache(ctx.conn)
+
+    def text_row(i):
+        ctx.cur.execute(insert, (i, f"Bench Course {i}", 3, dept)); ctx.conn.commit()
+        ctx.cur.execute(update, (f"Bench Course {i}b", 4, dept, i)); ctx.conn.commit()
+        ctx.cur.execute(delete, (i,)); ctx.conn.commit()
+
+    def prepared_row(i):
+        cache.execute(insert, (i, f"Bench Course {i}", 3, dept)); ctx.conn.commit()
+        cache.execute(update, (f"Bench Course {i}b", 4, dept, i)); ctx.conn.commit()
+        cache.execute(delete, (i,)); ctx.conn.commit()
+
+    updates = [(f"Bench Course {i}c", 2, dept, i) for (i,) in ids]
+    def text_bulk():
+        ctx.cur.executemany(update, updates)
+        ctx.conn.commit()
+    def prepared_bulk():
+        for params in updates:
+            cache.execute(update, params)
+        ctx.conn.commit()
+
+    try:
+        out = {"crud_row_text": _stats(_time(text_row, ids), rows=n),
+               "crud_row_prepared": _stats(_time(prepared_row, ids), rows=n)}
+        ctx.cur.executemany(insert, [(i, f"Bench Course {i}", 3, dept) for (i,) in ids])
+        ctx.conn.commit()
+        runs = [()] * max(1, ctx.repeat // 4)
+        out["bulk_update_text"] = _stats(_time(text_bulk, runs), rows=n * len(runs))
+        out["bulk_update_prepared"] = _stats(_time(prepared_bulk, runs), rows=n * len(runs))
+    finally:
+        ctx.cur.execute("DELETE FROM Course WHERE Course_ID >= %s", (first,))
+        ctx.conn.commit()
+        cache.close()
+    return out
+
+def bench_export(ctx):
+    """Streaming CSV export of the whole Student table."""
+    fd, path = tempfile.mkstemp(suffix=".csv")
+    os.close(fd)
+    try:
+        rows = 0
+        def export():
+            nonlocal rows
+            rows = export_query(ctx.conn, "SELECT * FROM Student ORDER BY Stu_ID", (), path)
+        samples = _time(export, [()] * max(1, ctx.repeat // 10))
+        return {"csv_export_student": _stats(samples, rows=rows * len(samples))}
+    finally:
+        os.remove(path)
+
+BENCHMARKS = [bench_table_pages, bench_dashboard, bench_add_student, bench_procedures, bench_statements,
+              bench_export]
+
+# ----------------------- RUNNER -----------------------
+def run_suite(backend, repeat=20, only=None, log=print):
+    """Run every benchmark (or those named in `only`) and return the result document."""
+    ctx = _Context(backend, repeat)
+    results = {}
+    try:
+        ctx.cur.execute("SELECT " + ", ".join(f"(SELECT COUNT(*) FROM {t})"
+                                              for t in ("College", "Department", "Professor",
+                                                        "Course", "Student", "Enrollment")))
+        volumes = dict(zip(("College", "Department", "Professor", "Course", "Student", "Enrollment"),
+                           ctx.cur.fetchone()))
+        for bench in BENCHMARKS:
+            if only and bench.__name__ not in only:
+                continue
+            log(f"running {bench.__name__} ...")
+            results.update(bench(ctx))
+    finally:
+        ctx.close()
+    return {
+        "backend": backend.name,
+        "database": str(backend.database),
+        "started": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "repeat": repeat,
+        "volumes": volumes,
+        "results": results,
+    }
+
+def compare(current, baseline, tolerance=0.2):
+    """Benchmarks whose p50 is more than `tolerance` slower than in `baseline`."""
+    regressions = []
+    for name, cur in current["results"].items():
+        old = baseline.get("results", {}).get(name)
+        if old and old["p50_ms"] > 0 and cur["p50_ms"] > old["p50_ms"] * (1 + tolerance):
+            regressions.append((name, old["p50_ms"], cur["p50_ms"]))
+    return regressions
+
+def save(document, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=2, default=str)
+
+def load(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
@@ -0,0 +1,205 @@
+# college_cache.py — in-process caches for data the GUI reads often but rarely changes
+import threading, time
+
+# ----------------------- DASHBOARD STATS -----------------------
+STATS_TTL = 60.0   # seconds a stats snapshot is served before it is re-read
+STATS_TABLES = ("College", "Department", "Professor", "Student")
+
+# All four totals in a single round trip
+_TOTALS_SQL = "SELECT " + ", ".join(f"(SELECT COUNT(*) FROM {t})" for t in STATS_TABLES)
+
+_BY_COLLEGE_SQL = """
+    SELECT c.Clg_ID, c.Clg_Name, COUNT(s.Stu_ID)
+    FROM College c LEFT JOIN Student s ON s.Clg_ID = c.Clg_ID
+    GROUP BY c.Clg_ID, c.Clg_Name
+    ORDER BY c.Clg_ID
+"""
+
+_BY_DEPARTMENT_SQL = """
+    SELECT d.Dept_ID, d.Dept_Name,
+           (SELECT COUNT(*) FROM Student s WHERE s.Dept_ID = d.Dept_ID),
+           (SELECT COUNT(*) FROM Professor p WHERE p.Dept_ID = d.Dept_ID)
+    FROM Department d
+    ORDER BY d.Dept_ID
+"""
+
+class StatsCache:
+    """Snapshot of the Home page counts.
+
+    get() re-reads the database only when the snapshot is missing, older than
+    `ttl`, or was invalidated by a commit to one of STATS_TABLES. Per-college
+    and per-department breakdowns are loaded on first request and share the
+    same snapshot lifetime.
+    """
+
+    def __init__(self, ttl=STATS_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._taken = 0.0
+        self._generation = 0   # bumped by invalidate() so in-flight loads are not cached
+
+    def get(self, cur, breakdown=False):
+        with self._lock:
+            snap, gen = self._snapshot, self._generation
+            fresh = snap is not None and time.monotonic() - self._taken < self.ttl
+        if fresh and (not breakdown or "by_college" in snap):
+            return snap
+        if not fresh:
+            cur.execute(_TOTALS_SQL)
+            snap = dict(zip(STATS_TABLES, cur.fetchone()))
+        else:
+            snap = dict(snap)
+        if breakdown:
+            cur.execute(_BY_COLLEGE_SQL)
+            snap["by_college"] = cur.fetchall()
+            cur.execute(_BY_DEPARTMENT_SQL)
+            snap["by_department"] = cur.fetchall()
+        with self._lock:
+            if gen == self._generation:
+                self._snapshot = snap
+                if not fresh:
+                    self._taken = time.monotonic()
+        return snap
+
+    def invalidate(self, table=None):
+        """Drop the snapshot; `table` limits this to commits that change a count."""
+        if table is not None and table not in STATS_TABLES:
+            return
+        with self._lock:
+            self._snapshot = None
+            self._generation += 1
+
+# ----------------------- REFERENCE DATA -----------------------
+REF_TTL = 300.0   # seconds before College/Department/Course are re-read
+REF_SQL = {
+    "College": "SELECT Clg_ID, Clg_Name FROM College ORDER BY Clg_ID",
+    "Department": "SELECT Dept_ID, Dept_Name, HOD FROM Department ORDER BY Dept_ID",
+    "Course": "SELECT Course_ID, Course_Name, Credits, Dept_ID FROM Course ORDER BY Course_ID",
+}
+# Foreign-key columns that point at a cached table
+REF_FOREIGN_KEYS = {"Clg_ID": "College", "Dept_ID": "Department", "Course_ID": "Course"}
+
+def _as_id(value):
+    try:
+        return int(str(value).strip())
+    except (TypeError, ValueError):
+        return None
+
+class RefData:
+    """Immutable snapshot of the small dimension tables.
+
+    `rows[table]` maps primary key → the rest of the row as in REF_SQL; names
+    map back to keys case-insensitively.
+    """
+
+    def __init__(self, rows):
+        self.rows = rows
+        self._by_name = {t: {r[0].casefold(): k for k, r in rows[t].items() if r[0]} for t in rows}
+
+    def name(self, table, key):
+        row = self.rows[table].get(_as_id(key))
+        return row[0] if row else None
+
+    def key(self, table, name_or_key):
+        """Primary key for an ID or a name, or None when neither is known."""
+        k = _as_id(name_or_key)
+        if k in self.rows[table]:
+            return k
+        return self._by_name[table].get(str(name_or_key).strip().casefold())
+
+    def exists(self, table, key):
+        return _as_id(key) in self.rows[table]
+
+    def hod(self, dept):
+        """(Dept_Name, HOD) for a Dept_ID or Dept_Name, like fn_GetDepartmenttHOD; None if unknown."""
+        k = self.key("Department", dept)
+        if k is None:
+            return None
+        return self.rows["Department"][k]
+
+    def choices(self, table, text=""):
+        """Autocomplete entries ("ID - Name") whose ID starts with or name contains `text`."""
+        text = text.strip().casefold()
+        return [f"{k} - {r[0]}" for k, r in self.rows[table].items()
+                if not text or str(k).startswith(text) or text in (r[0] or "").casefold()]
+
+    def missing(self, values):
+        """[(column, value, table)] for foreign-key values that are not in the cache."""
+        out = []
+        for column, value in values.items():
+            table = REF_FOREIGN_KEYS.get(column)
+            if table and value not in (None, "") and not self.exists(table, value):
+                out.append((column, value, table))
+        return out
+
+class RefCache:
+    """College, Department and Course held in memory for lookups and FK checks.
+
+    get() re-reads only the tables that are older than `ttl` or were
+    invalidated by a commit; peek() never queries and is safe on the UI thread.
+    """
+
+    def __init__(self, ttl=REF_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._rows = {}      # table → {key: row}
+        self._taken = {}     # table → monotonic load time
+        self._generation = dict.fromkeys(REF_SQL, 0)
+        self._data = None
+
+    def _stale(self):
+        now = time.monotonic()
+        return [t for t in REF_SQL if t not in self._taken or now - self._taken[t] >= self.ttl]
+
+    def get(self, cur):
+        with self._lock:
+            stale = self._stale()
+            if not stale and self._data is not None:
+                return self._data
+            gens = {t: self._generation[t] for t in stale}
+        loaded = {}
+        for table in stale:
+            cur.execute(REF_SQL[table])
+            loaded[table] = {r[0]: tuple(r[1:]) for r in cur.fetchall()}
+        with self._lock:
+            rows = dict(self._rows)
+            rows.update(loaded)
+            for table in stale:
+                if gens[table] == self._generation[table]:
+                    self._rows[table] = loaded[table]
+                    self._taken[table] = time.monotonic()
+            self._data = RefData(rows)
+            return self._data
+
+    def peek(self):
+        """Last snapshot, possibly stale, or None before the first load."""
+        return self._data
+
+    def is_fresh(self):
+        with self._lock:
+            return self._data is not None and not self._stale()
+
+    def invalidate(self, table=None):
+        """Mark `table` (or every cached table) for re-reading; other tables are ignored."""
+        if table is not None and table not in REF_SQL:
+            return
+        with self._lock:
+            for t in ([table] if table else REF_SQL):
+                self._taken.pop(t, None)
+                self._generation[t] += 1
+
+    def check_foreign_keys(self, cur, values):
+        """Raise ValueError if a foreign key in `values` ({column: value}) does not exist.
+
+        A miss re-reads the referenced tables once before failing, so rows
+        added from another client since the last load are still accepted.
+        """
+        refs = self.get(cur)
+        missing = refs.missing(values)
+        if missing:
+            for _, _, table in missing:
+                self.invalidate(table)
+            missing = self.get(cur).missing(values)
+        if missing:
+            raise ValueError("\n".join(f"{c} {v} does not exist in {t}." for c, v, t in missing))
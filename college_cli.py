@@ -0,0 +1,244 @@
+# college_cli.py — headless rosters, counts, table dumps and reports (no Tk)
+#
+# Usage:  python college_cli.py rosters --by college --out rosters/
+#         python college_cli.py rosters --by department --format csv.gz --workers 8
+#         python college_cli.py counts --out counts.csv
+#         python college_cli.py dump --tables Student Course --out dumps/
+#         python college_cli.py report "Student GPA" --out gpa.csv
+#         python college_cli.py report "Course grades" --include-history --out grades.csv
+#         python college_cli.py check --fix-script fix.sql
+#
+# Work is fanned out over a thread pool with one pooled connection per
+# worker; --benchmark prints rows and files per second at the end.
+import argparse, csv, os, re, statistics, sys, threading, time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from college_db import DB_CONFIG, ConnectionPool
+from college_cache import RefCache
+from college_io import export_query
+import college_analytics as analytics
+import college_integrity as integrity
+import college_queries as q
+
+CLI_WORKERS = 4
+TABLE_KEYS = {"College": "Clg_ID", "Department": "Dept_ID", "Professor": "Prof_ID",
+              "Course": "Course_ID", "Student": "Stu_ID", "Enrollment": "Stu_ID, Course_ID, Term",
+              "Enrollment_History": "Term, Stu_ID, Course_ID"}
+
+def _slug(text):
+    return re.sub(r"[^A-Za-z0-9]+", "_", str(text)).strip("_") or "unnamed"
+
+# ----------------------- PARALLEL RUNNER -----------------------
+class Task:
+    """One unit of work: `func(conn)` returns the number of rows it produced."""
+
+    def __init__(self, label, func):
+        self.label = label
+        self.func = func
+        self.rows = 0
+        self.seconds = 0.0
+        self.error = None
+
+def run_tasks(tasks, workers=CLI_WORKERS, log=print):
+    """Run tasks on `workers` threads, each holding one pooled connection at a time."""
+    pool = ConnectionPool(size=workers, **DB_CONFIG)
+    lock = threading.Lock()
+
+    def run(task):
+        t = time.perf_counter()
+        try:
+            with pool.connection() as conn:
+                task.rows = task.func(conn) or 0
+        except Exception as e:
+            task.error = e
+        task.seconds = time.perf_counter() - t
+        with lock:
+            log(f"{task.label}: " + (f"FAILED ({task.error})" if task.error else f"{task.rows} rows"))
+        return task
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            for f in as_completed([ex.submit(run, t) for t in tasks]):
+                f.result()
+    finally:
+        pool.close_all()
+    return tasks
+
+def _reference_data():
+    pool = ConnectionPool(size=1, **DB_CONFIG)
+    try:
+        with pool.connection() as conn:
+            cur = conn.cursor(buffered=True)
+            try:
+                return RefCache().get(cur)
+            finally:
+                cur.close()
+    finally:
+        pool.close_all()
+
+# ----------------------- COMMANDS -----------------------
+def _export_task(label, sql, params, path):
+    return Task(label, lambda conn: export_query(conn, sql, params, path))
+
+def roster_tasks(args):
+    """One export per college (Student rows) or per department (sp_GetStudentsByDepartment)."""
+    refs = _reference_data()
+    table = "College" if args.by == "college" else "Department"
+    ids = [int(i) for i in args.ids] if args.ids else sorted(refs.rows[table])
+    tasks = []
+    for key in ids:
+        name = refs.name(table, key)
+        if name is None:
+            print(f"{table} {key} does not exist, skipped", file=sys.stderr)
+            continue
+        path = os.path.join(args.out, f"roster_{args.by}_{key}_{_slug(name)}.{args.format}")
+        if args.by == "college":
+            tasks.append(_export_task(f"{name}", "SELECT * FROM Student WHERE Clg_ID = %s ORDER BY Stu_ID",
+                                      (key,), path))
+        else:
+            # Same procedure (and export path) as the GUI's Get Students → Export
+            tasks.append(_export_task(f"{name}", "CALL sp_GetStudentsByDepartment(%s)", (name,), path))
+    return tasks
+
+def count_tasks(args):
+    """fn_GetStudentCountByCollege_ for every college, collected into one CSV."""
+    refs = _reference_data()
+    results = {}
+
+    def count(key):
+        def work(conn):
+            cur = conn.cursor(buffered=True)
+            try:
+                results[key] = q.student_count_by_college(cur, key)
+            finally:
+                cur.close()
+            return 1
+        return work
+
+    tasks = [Task(refs.name("College", k), count(k)) for k in sorted(refs.rows["College"])]
+
+    def write():
+        out = open(args.out, "w", newline="", encoding="utf-8") if args.out else sys.stdout
+        try:
+            w = csv.writer(out)
+            w.writerow(["Clg_ID", "Clg_Name", "Students"])
+            for k in sorted(results):
+                w.writerow([k, refs.name("College", k), results[k]])
+        finally:
+            if out is not sys.stdout:
+                out.close()
+    return tasks, write
+
+def dump_tasks(args):
+    """Every requested table to its own file, in parallel."""
+    tasks = []
+    for table in args.tables or list(TABLE_KEYS):
+        if table not in TABLE_KEYS:
+            raise SystemExit(f"Unknown table: {table}")
+        path = os.path.join(args.out, f"{table}.{args.format}")
+        tasks.append(_export_task(table, f"SELECT * FROM {table} ORDER BY {TABLE_KEYS[table]}", (), path))
+    return tasks
+
+def report_task(args):
+    """One college_analytics report written to CSV."""
+    def work(conn):
+        columns, rows = analytics.run_report(conn, args.name, include_history=args.include_history)
+        with open(args.out, "w", newline="", encoding="utf-8") as f:
+            w = csv.writer(f)
+            w.writerow(columns)
+            w.writerows(rows)
+        return len(rows)
+    return [Task(args.name, work)]
+
+def check_tasks(args):
+    """college_integrity checks, one task per table; `write` prints the findings."""
+    findings = {}
+
+    def check(table):
+        def work(conn):
+            findings[table] = integrity.check_table(conn, table)
+            return sum(f.count for f in findings[table])
+        return work
+
+    tables = list(dict.fromkeys(c.table for c in integrity.CHECKS))
+    tasks = [Task(table, check(table)) for table in tables if not args.tables or table in args.tables]
+
+    def write():
+        done = [f for t in tables for f in findings.get(t, [])]
+        print("\n".join(integrity.summary(done)))
+        if args.fix_script:
+            with open(args.fix_script, "w", encoding="utf-8") as f:
+                f.write(integrity.fix_script(done))
+            print(f"Fix-up script written to {args.fix_script}")
+    return tasks, write
+
+# ----------------------- BENCHMARK SUMMARY -----------------------
+def print_benchmark(tasks, elapsed, workers):
+    done = [t for t in tasks if not t.error]
+    rows = sum(t.rows for t in done)
+    lat = sorted(t.seconds for t in done) or [0.0]
+    print(f"\n--- benchmark ({workers} workers) ---")
+    print(f"tasks      {len(done)} ok, {len(tasks) - len(done)} failed")
+    print(f"elapsed    {elapsed:.3f} s")
+    print(f"rows       {rows}  ({rows / elapsed if elapsed else 0:.0f} rows/s)")
+    print(f"tasks/s    {len(done) / elapsed if elapsed else 0:.1f}")
+    print(f"task time  p50 {statistics.median(lat) * 1000:.1f} ms, "
+          f"p95 {lat[min(len(lat) - 1, int(0.95 * len(lat)))] * 1000:.1f} ms, "
+          f"sum {sum(lat):.3f} s (speed-up {sum(lat) / elapsed if elapsed else 0:.1f}x)")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless college database reports and exports.")
+    parser.add_argument("--workers", type=int, default=CLI_WORKERS, help="parallel connections (default: %(default)s)")
+    parser.add_argument("--benchmark", action="store_true", help="print throughput when done")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    formats = ["csv", "csv.gz", "parquet", "arrow"]
+    p = sub.add_parser("rosters", help="one student roster file per college or department")
+    p.add_argument("--by", choices=["college", "department"], default="college")
+    p.add_argument("--ids", nargs="+", help="only these Clg_IDs / Dept_IDs")
+    p.add_argument("--out", default=".", help="output directory")
+    p.add_argument("--format", choices=formats, default="csv")
+
+    p = sub.add_parser("counts", help="student count per college (fn_GetStudentCountByCollege_)")
+    p.add_argument("--out", help="CSV file (default: stdout)")
+
+    p = sub.add_parser("dump", help="export whole tables, one file each")
+    p.add_argument("--tables", nargs="+", help=f"default: all ({', '.join(TABLE_KEYS)})")
+    p.add_argument("--out", default=".", help="output directory")
+    p.add_argument("--format", choices=formats, default="csv")
+
+    p = sub.add_parser("report", help="an Analytics tab report as CSV")
+    p.add_argument("name", choices=list(analytics.REPORTS))
+    p.add_argument("--out", required=True)
+    p.add_argument("--include-history", action="store_true",
+                   help="also count archived terms (Enrollment_History), not just the current one")
+
+    p = sub.add_parser("check", help="integrity and data-quality checks (college_integrity)")
+    p.add_argument("--tables", nargs="+", help="only checks on these tables")
+    p.add_argument("--fix-script", metavar="FILE", help="write SQL that repairs what can be repaired")
+
+    args = parser.parse_args(argv)
+    after = None
+    if args.command == "rosters":
+        os.makedirs(args.out, exist_ok=True)
+        tasks = roster_tasks(args)
+    elif args.command == "counts":
+        tasks, after = count_tasks(args)
+    elif args.command == "check":
+        tasks, after = check_tasks(args)
+    elif args.command == "dump":
+        os.makedirs(args.out, exist_ok=True)
+        tasks = dump_tasks(args)
+    else:
+        tasks = report_task(args)
+
+    log = (lambda msg: print(msg, file=sys.stderr)) if args.command == "counts" and not args.out else print
+    start = time.perf_counter()
+    run_tasks(tasks, args.workers, log=log)
+    if after:
+        after()
+    if args.benchmark:
+        print_benchmark(tasks, time.perf_counter() - start, args.workers)
+    return 1 if any(t.error for t in tasks) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,293 @@
+# college_db.py — connection pool and background query execution for the GUI
+import queue, threading, uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+import mysql.connector
+from mysql.connector import errorcode
+import college_perf as perf
+
+# ----------------------- CONFIGURATION -----------------------
+DB_CONFIG = dict(
+    host="localhost",
+    user="root",           # Change if needed
+    password="chintu20",   # Change if needed
+    database="student_database"
+)
+POOL_SIZE = 4       # max open connections
+DB_WORKERS = 2      # background threads running queries
+STATEMENT_CACHE_SIZE = 32   # prepared statements kept per connection
+# Tags this process's writes in change_log (via @college_client) so its own
+# edits are not mistaken for someone else's
+CLIENT_ID = uuid.uuid4().hex
+
+# Errors that mean the connection to the server was lost. The statement in
+# flight may or may not have run on the server before that.
+_GONE = (errorcode.CR_SERVER_GONE_ERROR, errorcode.CR_CONN_HOST_ERROR)
+
+# ----------------------- CONNECTION POOL -----------------------
+class ConnectionPool:
+    """Bounded pool of MySQL connections.
+
+    Idle connections are pinged (and transparently reconnected) when they are
+    handed out, so a connection the server closed for being idle is never used.
+    Connections are wrapped so every statement is timed by college_perf.
+    """
+
+    def __init__(self, size=POOL_SIZE, **config):
+        self.config = config or DB_CONFIG
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+
+    def _connect(self):
+        conn = mysql.connector.connect(**self.config)
+        _tag(conn)
+        conn = perf.InstrumentedConnection(conn)
+        conn.statements = StatementCache(conn)
+        return conn
+
+    def acquire(self):
+        self._slots.acquire()
+        try:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                return self._connect()
+            try:
+                session = conn.connection_id
+                conn.ping(reconnect=True, attempts=2, delay=0)
+                if conn.connection_id != session:
+                    _tag(conn)   # a reconnect starts a new session
+                    conn.statements.reset()
+            except mysql.connector.Error:
+                self._close(conn)
+                conn = self._connect()
+            return conn
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self, conn, discard=False):
+        if discard:
+            self._close(conn)
+        else:
+            self._idle.put(conn)
+        self._slots.release()
+
+    @contextmanager
+    def connection(self):
+        conn = self.acquire()
+        discard = False
+        try:
+            yield conn
+        except mysql.connector.Error as e:
+            discard = e.errno in _GONE or not _is_alive(conn)
+            raise
+        finally:
+            self.release(conn, discard)
+
+    def close_all(self):
+        while True:
+            try:
+                self._close(self._idle.get_nowait())
+            except queue.Empty:
+                return
+
+    @staticmethod
+    def _close(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+class StatementCache:
+    """Server-side prepared statements of one connection, keyed by SQL text.
+
+    A statement is prepared the first time its SQL is run on the connection;
+    after that only its parameters travel, over the binary protocol. Beyond
+    `size` statements the least recently used one is closed.
+    """
+
+    def __init__(self, conn, size=STATEMENT_CACHE_SIZE):
+        self._conn = conn
+        self.size = size
+        self._cursors = OrderedDict()
+        self.hits = self.misses = 0
+
+    def cursor(self, sql):
+        cur = self._cursors.get(sql)
+        if cur is not None:
+            self.hits += 1
+            self._cursors.move_to_end(sql)
+            return cur
+        self.misses += 1
+        cur = self._cursors[sql] = self._conn.cursor(prepared=True)
+        if len(self._cursors) > self.size:
+            _, old = self._cursors.popitem(last=False)
+            old.close()   # deallocates the statement on the server
+        return cur
+
+    def execute(self, sql, params=()):
+        """Run `sql` as a prepared statement; returns the cursor holding its result."""
+        cur = self.cursor(sql)
+        cur.execute(sql, tuple(params))
+        return cur
+
+    def close(self):
+        for cur in self._cursors.values():
+            cur.close()
+        self._cursors.clear()
+
+    def reset(self):
+        """Forget every statement without closing it (its session is gone)."""
+        self._cursors.clear()
+
+def _tag(conn):
+    cur = conn.cursor()
+    cur.execute("SET @college_client = %s", (CLIENT_ID,))
+    cur.close()
+
+def _is_alive(conn):
+    try:
+        return conn.is_connected()
+    except Exception:
+        return False
+
+# ----------------------- EXECUTOR -----------------------
+class Job:
+    """Handle for a submitted query; cancel() drops it if it has not run yet
+    and suppresses its callbacks if it has."""
+
+    def __init__(self, func, on_done, on_error, key, action, readonly=False):
+        self.func = func
+        self.on_done = on_done
+        self.on_error = on_error
+        self.key = key
+        self.action = action   # UI action its statements are attributed to
+        self.readonly = readonly   # safe to run again after a lost connection
+        self.cancelled = False
+        # Server thread id while the job runs; guarded by `lock` so a KILL
+        # QUERY is never sent after the job has let go of its connection
+        self.conn_id = None
+        self.lock = threading.Lock()
+
+    def cancel(self):
+        self.cancelled = True
+
+class DBExecutor:
+    """Runs `func(cursor)` jobs on worker threads, one pooled connection each.
+
+    Each job is its own transaction: it is committed when `func` returns and
+    rolled back when it raises. Results and errors are handed to `post`
+    (the Tk after()-driven queue in the GUI) so callbacks run on the UI thread.
+    Submitting a job with the same `key` as a pending one cancels the older
+    one, e.g. a tab refresh superseding the previous refresh; if the older one
+    is already running its statement is stopped with KILL QUERY. Keyed jobs
+    should therefore be read-only.
+
+    A job whose connection is lost is retried once on a fresh connection,
+    but only if it had not started yet or is read-only (keyed jobs, or
+    `readonly=True`): a write may have run, or committed, before the
+    connection dropped, and must not be applied twice.
+    """
+
+    def __init__(self, pool, workers=DB_WORKERS, post=None):
+        self.pool = pool
+        self.post = post or (lambda func, *args: func(*args))
+        self._jobs = queue.Queue()
+        self._latest = {}
+        self._lock = threading.Lock()
+        for i in range(workers):
+            threading.Thread(target=self._worker, name=f"db-worker-{i}", daemon=True).start()
+
+    def submit(self, func, on_done=None, on_error=None, key=None, name=None, readonly=None):
+        """Queue `func(cursor)`; `name` is the UI action its statements are attributed to."""
+        name = name or perf.current_action() or key or "DB job"
+        job = Job(func, on_done, on_error, key, name, key is not None if readonly is None else readonly)
+        if key is not None:
+            with self._lock:
+                old = self._latest.get(key)
+                if old:
+                    old.cancel()
+                    if old.conn_id is not None:
+                        threading.Thread(target=self._kill, args=(old,), daemon=True).start()
+                self._latest[key] = job
+        self._jobs.put(job)
+        return job
+
+    def cancel(self, key):
+        with self._lock:
+            job = self._latest.pop(key, None)
+        if job:
+            job.cancel()
+
+    def run(self, func, readonly=False):
+        """Run a job synchronously on the calling thread and return its result."""
+        return self._execute(func, readonly=readonly)
+
+    def _kill(self, job):
+        with job.lock:
+            if job.conn_id is None:
+                return
+            try:
+                conn = self.pool._connect()
+                try:
+                    conn.cursor().execute(f"KILL QUERY {int(job.conn_id)}")
+                finally:
+                    conn.close()
+            except mysql.connector.Error as e:
+                print("Could not cancel query:", e)
+
+    def _execute(self, func, job=None, readonly=False):
+        readonly = job.readonly if job else readonly
+        for attempt in (1, 2):
+            started = False
+            try:
+                with self.pool.connection() as conn:
+                    cur = conn.cursor()
+                    # Lets college_queries run statements prepared on this connection
+                    cur.statements = conn.statements
+                    if job:
+                        job.conn_id = conn.connection_id
+                    try:
+                        started = True
+                        result = func(cur)
+                        conn.commit()
+                        return result
+                    except BaseException:
+                        if _is_alive(conn):
+                            conn.rollback()
+                        raise
+                    finally:
+                        if job:
+                            with job.lock:
+                                job.conn_id = None
+                        cur.close()
+            except mysql.connector.Error as e:
+                # Once the job started, its writes (or the COMMIT) may have
+                # reached the server before the connection dropped
+                if attempt == 2 or e.errno not in _GONE or (started and not readonly):
+                    raise
+
+    def _worker(self):
+        while True:
+            job = self._jobs.get()
+            if job.cancelled:
+                continue
+            try:
+                with perf.action(job.action):
+                    result = self._execute(job.func, job)
+            except Exception as e:
+                self._finish(job, job.on_error, e)
+            else:
+                self._finish(job, job.on_done, result)
+
+    def _finish(self, job, callback, value):
+        with self._lock:
+            if job.key is not None and self._latest.get(job.key) is job:
+                del self._latest[job.key]
+        if callback is None:
+            if isinstance(value, Exception):
+                print("DB job failed:", value)
+            return
+        # Re-check on the UI thread: the job may be cancelled while queued there
+        self.post(lambda: None if job.cancelled else callback(value))
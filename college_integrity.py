@@ -0,0 +1,286 @@
+# college_integrity.py — set-based referential-integrity and data-quality checks
+#
+# Every check is one anti-join or GROUP BY query over the whole table (run in
+# primary-key ranges of CHECK_CHUNK_SIZE so no single statement scans
+# everything at once), never a Python loop over rows. Tables are checked in
+# parallel, one pooled connection each. prevalidate() applies the same rules
+# to a batch of rows before a bulk import.
+import re, time
+from concurrent.futures import ThreadPoolExecutor
+
+CHECK_CHUNK_SIZE = 50000   # primary-key range covered by one chunk query
+INTEGRITY_WORKERS = 3
+SAMPLE_SIZE = 20           # offending keys kept per check for reports and the fix-up script
+PHONE_PATTERN = "^[0-9]{10}$"
+MIN_STUDENT_AGE = 18       # same rule as trg_Before_Student_Insert_Validate_DOB
+
+KEYS = {"College": ["Clg_ID"], "Department": ["Dept_ID"], "Professor": ["Prof_ID"],
+        "Course": ["Course_ID"], "Student": ["Stu_ID"], "Enrollment": ["Stu_ID", "Course_ID", "Term"],
+        "academic_term": ["Term"], "Enrollment_History": ["Term", "Stu_ID", "Course_ID"]}
+
+# (table, column, parent, parent key, ON DELETE action of the constraint)
+FOREIGN_KEYS = [
+    ("Student", "Clg_ID", "College", "Clg_ID", "SET NULL"),
+    ("Student", "Dept_ID", "Department", "Dept_ID", "SET NULL"),
+    ("Professor", "Dept_ID", "Department", "Dept_ID", "SET NULL"),
+    ("Course", "Dept_ID", "Department", "Dept_ID", "SET NULL"),
+    ("Enrollment", "Stu_ID", "Student", "Stu_ID", "CASCADE"),
+    ("Enrollment", "Course_ID", "Course", "Course_ID", "CASCADE"),
+]
+PEOPLE = ["Student", "Professor"]   # tables with Email and Phone_No columns
+INT_COLUMNS = {"Clg_ID", "Dept_ID", "Prof_ID", "Course_ID", "Stu_ID"}   # INT in the schema, text elsewhere
+
+# ----------------------- CHECKS -----------------------
+class Check:
+    """One rule over `table`.
+
+    `sql` selects the key columns of the offending rows of `table` (aliased t);
+    a chunked check's sql contains {range}, filled with a primary-key range
+    condition. `fix` is a set-based statement that repairs every offending row,
+    or None when the rows need a person to look at them.
+    """
+
+    def __init__(self, name, table, sql, fix=None, chunked=True):
+        self.name = name
+        self.table = table
+        self.sql = sql
+        self.fix = fix
+        self.chunked = chunked
+
+def _keys(table):
+    return ", ".join(f"t.{k}" for k in KEYS[table])
+
+def _orphans(table, column, parent, parent_key, on_delete):
+    join = f"{table} t LEFT JOIN {parent} p ON p.{parent_key} = t.{column}"
+    cond = f"t.{column} IS NOT NULL AND p.{parent_key} IS NULL"
+    # Repair the way the constraint would have, had the parent row been deleted
+    if on_delete == "CASCADE":
+        fix = f"DELETE t FROM {join} WHERE {cond};"
+    else:
+        fix = f"UPDATE {join} SET t.{column} = NULL WHERE {cond};"
+    return Check(f"{table}.{column} without a {parent}", table,
+                 f"SELECT {_keys(table)} FROM {join} WHERE {cond}{{range}}", fix)
+
+def _underage():
+    return Check(f"Student younger than {MIN_STUDENT_AGE}", "Student",
+                 f"SELECT t.Stu_ID FROM Student t "
+                 f"WHERE t.DOB > DATE_SUB(CURDATE(), INTERVAL {MIN_STUDENT_AGE} YEAR){{range}}")
+
+def _uppercase_email(table):
+    cond = "BINARY Email <> LOWER(Email)"
+    return Check(f"{table}.Email not lower case", table,
+                 f"SELECT {_keys(table)} FROM {table} t WHERE {cond}{{range}}",
+                 f"UPDATE {table} SET Email = LOWER(Email) WHERE {cond};")
+
+def _duplicate_email(table):
+    # Grouped over the whole table: duplicates can sit in different key ranges
+    key = KEYS[table][0]
+    return Check(f"{table}.Email duplicated", table,
+                 f"SELECT t.{key} FROM {table} t JOIN ("
+                 f"SELECT LOWER(TRIM(Email)) AS e FROM {table} GROUP BY e HAVING COUNT(*) > 1"
+                 f") d ON d.e = LOWER(TRIM(t.Email)) ORDER BY d.e, t.{key}", chunked=False)
+
+def _bad_phone(table):
+    cond = f"t.Phone_No IS NOT NULL AND t.Phone_No NOT REGEXP '{PHONE_PATTERN}'"
+    digits = "REGEXP_REPLACE(Phone_No, '[^0-9]', '')"
+    # Only separators/spaces are stripped automatically; anything else is left for review
+    return Check(f"{table}.Phone_No malformed", table,
+                 f"SELECT {_keys(table)} FROM {table} t WHERE {cond}{{range}}",
+                 f"UPDATE {table} SET Phone_No = {digits} WHERE Phone_No NOT REGEXP '{PHONE_PATTERN}' "
+                 f"AND {digits} REGEXP '{PHONE_PATTERN}';")
+
+CHECKS = ([_orphans(*fk) for fk in FOREIGN_KEYS] + [_underage()]
+          + [c for t in PEOPLE for c in (_uppercase_email(t), _duplicate_email(t), _bad_phone(t))])
+
+# ----------------------- RUNNING -----------------------
+class Finding:
+    def __init__(self, check):
+        self.check = check
+        self.count = 0
+        self.sample = []      # up to SAMPLE_SIZE offending keys
+        self.seconds = 0.0
+        self.error = None
+
+def _ranges(cur, table):
+    key = KEYS[table][0]
+    cur.execute(f"SELECT MIN({key}), MAX({key}) FROM {table}")
+    low, high = cur.fetchone()
+    if low is None:
+        return
+    while low <= high:
+        yield low, min(low + CHECK_CHUNK_SIZE - 1, high)
+        low += CHECK_CHUNK_SIZE
+
+def run_check(cur, check):
+    """Run one check, chunk by chunk, and return its Finding."""
+    finding = Finding(check)
+    t = time.perf_counter()
+
+    def collect(rows):
+        finding.count += len(rows)
+        room = SAMPLE_SIZE - len(finding.sample)
+        if room > 0:
+            finding.sample += [r[0] if len(r) == 1 else tuple(r) for r in rows[:room]]
+
+    if check.chunked:
+        key = KEYS[check.table][0]
+        sql = check.sql.replace("{range}", f" AND t.{key} BETWEEN %s AND %s")
+        for low, high in _ranges(cur, check.table):
+            cur.execute(sql, (low, high))
+            collect(cur.fetchall())
+    else:
+        cur.execute(check.sql)
+        collect(cur.fetchall())
+    finding.seconds = time.perf_counter() - t
+    return finding
+
+def check_table(conn, table, checks=None):
+    """Every check on `table`, in order, on one connection."""
+    findings = []
+    cur = conn.cursor(buffered=True)
+    try:
+        for check in checks or CHECKS:
+            if check.table != table:
+                continue
+            try:
+                findings.append(run_check(cur, check))
+            except Exception as e:
+                finding = Finding(check)
+                finding.error = e
+                findings.append(finding)
+    finally:
+        cur.close()
+    return findings
+
+def run_checks(pool, tables=None, workers=INTEGRITY_WORKERS, checks=None):
+    """Check tables in parallel, one pooled connection per table; findings in CHECKS order."""
+    checks = checks or CHECKS
+    tables = [t for t in dict.fromkeys(c.table for c in checks) if tables is None or t in tables]
+
+    def work(table):
+        with pool.connection() as conn:
+            return check_table(conn, table, checks)
+
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        done = [f for per_table in ex.map(work, tables) for f in per_table]
+    order = {id(c): i for i, c in enumerate(checks)}
+    return sorted(done, key=lambda f: order[id(f.check)])
+
+def summary(findings):
+    """One line per check, e.g. for a status bar or the CLI."""
+    lines = []
+    for f in findings:
+        if f.error:
+            lines.append(f"{f.check.name}: FAILED ({f.error})")
+        else:
+            lines.append(f"{f.check.name}: {f.count} row(s)" + (f", e.g. {f.sample[:5]}" if f.count else ""))
+    return lines
+
+def fix_script(findings):
+    """SQL that repairs what can be repaired automatically, in one transaction.
+
+    Checks without an automatic fix are listed as comments with sample keys.
+    """
+    out = ["-- Integrity fix-up script, review before running",
+           f"-- Generated {time.strftime('%Y-%m-%d %H:%M:%S')}", "", "START TRANSACTION;"]
+    manual = []
+    for f in findings:
+        if not f.count:
+            continue
+        note = f"-- {f.check.name}: {f.count} row(s), e.g. {', '.join(map(str, f.sample))}"
+        if f.check.fix:
+            out += ["", note, f.check.fix]
+        else:
+            manual += [note]
+    out += ["", "COMMIT;"]
+    if manual:
+        out += ["", "-- No automatic fix; review these rows by hand:"] + manual
+    return "\n".join(out) + "\n"
+
+# ----------------------- IMPORT PRE-VALIDATION -----------------------
+def _in(values):
+    return ", ".join(["%s"] * len(values))
+
+def normalize(column, v):
+    """`v` as the server compares it in `column`: an int for INT columns (so CSV
+    '007' and 7 are the same key), trimmed lower-case text otherwise."""
+    if v is None:
+        return None
+    if column in INT_COLUMNS:
+        try:
+            return int(str(v).strip())
+        except ValueError:
+            pass   # not a number; the INSERT reports it
+    return str(v).strip().lower()
+
+def prevalidate(cur, table, columns, rows, notes=None):
+    """Errors for a batch about to be inserted into `table`: {row index: message}.
+
+    A handful of set-based queries per batch (one per foreign key, the
+    primary key and each unique column) instead of discovering the problems
+    one failing INSERT at a time. Values may be CSV text. Data-quality
+    findings the server accepts anyway (a Phone_No not of PHONE_PATTERN) do
+    not block the row; they go to `notes` {row index: message} when given.
+    """
+    errors = {}
+    col = {c: i for i, c in enumerate(columns)}
+
+    def flag(i, message):
+        errors.setdefault(i, message)
+
+    def existing(sql_col, source, values):
+        values = sorted(values, key=str)
+        cur.execute(f"SELECT {sql_col} FROM {source} WHERE {sql_col} IN ({_in(values)})", values)
+        return {normalize(sql_col, r[0]) for r in cur.fetchall()}
+
+    # Primary key already present, or repeated within the batch
+    keys = [k for k in KEYS.get(table, []) if k in col]
+    if keys and len(keys) == len(KEYS[table]):
+        seen = {}
+        for i, row in enumerate(rows):
+            k = tuple(normalize(c, row[col[c]]) for c in keys)
+            if k in seen:
+                flag(i, f"Duplicate {', '.join(keys)} {', '.join(map(str, k))} in the file.")
+            seen.setdefault(k, i)
+        if seen:
+            tuples = ", ".join(f"({_in(keys)})" for _ in seen)
+            cur.execute(f"SELECT {', '.join(keys)} FROM {table} WHERE ({', '.join(keys)}) IN ({tuples})",
+                        [v for k in seen for v in k])
+            for r in cur.fetchall():
+                i = seen.get(tuple(normalize(c, v) for c, v in zip(keys, r)))
+                if i is not None:
+                    flag(i, f"{table} {', '.join(map(str, r))} already exists.")
+
+    # Foreign keys that point nowhere
+    for t, column, parent, parent_key, _ in FOREIGN_KEYS:
+        if t != table or column not in col:
+            continue
+        wanted = {normalize(column, row[col[column]]) for row in rows if row[col[column]] is not None}
+        if not wanted:
+            continue
+        found = existing(parent_key, parent, wanted)
+        for i, row in enumerate(rows):
+            v = row[col[column]]
+            if v is not None and normalize(column, v) not in found:
+                flag(i, f"{column} {v} does not exist in {parent}.")
+
+    if table in PEOPLE:
+        phone = re.compile(PHONE_PATTERN)
+        for column in ("Email", "Phone_No"):
+            if column not in col:
+                continue
+            values = {}
+            for i, row in enumerate(rows):
+                v = normalize(column, row[col[column]])
+                if v is None:
+                    continue
+                if column == "Phone_No" and not phone.match(v) and notes is not None:
+                    notes.setdefault(i, f"Malformed Phone_No '{row[col[column]]}'.")
+                if v in values:
+                    flag(i, f"Duplicate {column} '{row[col[column]]}' in the file.")
+                values.setdefault(v, i)
+            if values:
+                for v in existing(column, table, values):
+                    if v in values:
+                        flag(values[v], f"{column} '{v}' is already used by another {table}.")
+    return errors
@@ -0,0 +1,314 @@
+# college_io.py — bulk CSV import and streaming export for the GUI tabs
+import csv, gzip, importlib.util, io, os
+from itertools import chain
+from datetime import date, datetime
+import mysql.connector
+from mysql.connector import FieldType
+
+# Optional columnar output. pyarrow is slow to import, so it is only loaded
+# when a Parquet/Arrow file is actually written.
+ARROW_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+pa = pq = None
+
+def _load_arrow():
+    global pa, pq
+    if pa is None:
+        import pyarrow, pyarrow.parquet
+        pa, pq = pyarrow, pyarrow.parquet
+
+# ----------------------- BULK IMPORT -----------------------
+IMPORT_BATCH_SIZE = 1000   # rows per executemany / transaction
+
+def _check_student(row):
+    """Client-side copy of what sp_AddNewStudent and trg_Before_Student_Insert_Validate_DOB
+    enforce, so bad rows are rejected without a server round trip."""
+    if not row.get("Stu_ID"):
+        return "Stu_ID is required."
+    if not row.get("Name") or not row.get("Email"):
+        return "Name and Email are required."
+    if row.get("DOB"):
+        try:
+            dob = datetime.strptime(row["DOB"], "%Y-%m-%d").date()
+        except ValueError:
+            return f"Invalid DOB '{row['DOB']}', expected YYYY-MM-DD."
+        today = date.today()
+        try:
+            cutoff = today.replace(year=today.year - 18)
+        except ValueError:   # 29 Feb
+            cutoff = today.replace(year=today.year - 18, day=28)
+        if dob > cutoff:
+            return "Invalid DOB: Student must be at least 18 years old."
+    return None
+
+VALIDATORS = {"Student": _check_student}
+
+class ImportResult:
+    def __init__(self):
+        self.inserted = 0
+        self.rejected = 0
+        self.reject_path = None
+        self.flagged = 0          # imported rows with a data-quality finding
+        self.flag_path = None
+        self.cancelled = False
+
+class _Rejects:
+    """Reject file opened on the first bad row: the CSV columns plus an Error column."""
+
+    def __init__(self, path, columns, label="Error"):
+        self.path = path
+        self.columns = columns
+        self.label = label
+        self.count = 0
+        self._f = self._w = None
+
+    def add(self, values, error):
+        self.count += 1
+        if self._w is None:
+            self._f = open(self.path, "w", newline="", encoding="utf-8")
+            self._w = csv.writer(self._f)
+            self._w.writerow(list(self.columns) + [self.label])
+        self._w.writerow(["" if v is None else v for v in values] + [error])
+
+    def close(self):
+        if self._f:
+            self._f.close()
+
+def _map_header(header, columns):
+    """Return, per table column, the index of its CSV column (or None).
+
+    A header that names none of the columns is treated as data and the file is
+    read positionally.
+    """
+    names = [h.strip().lower() for h in header]
+    index = [names.index(c.lower()) if c.lower() in names else None for c in columns]
+    if all(i is None for i in index):
+        return None
+    return index
+
+def _insert_chunk(conn, sql, chunk, rejects):
+    """Insert one chunk in one transaction; on failure find the bad rows one by one."""
+    # Row-level failures (duplicate keys, FK violations, bad values, trigger
+    # SIGNALs) are DatabaseErrors; OperationalError means the connection is gone.
+    cur = conn.cursor()
+    try:
+        try:
+            cur.executemany(sql, chunk)
+            conn.commit()
+            return len(chunk)
+        except mysql.connector.OperationalError:
+            raise
+        except mysql.connector.DatabaseError:
+            conn.rollback()
+        ok = 0
+        for values in chunk:
+            try:
+                cur.execute(sql, values)
+                ok += 1
+            except mysql.connector.OperationalError:
+                raise
+            except mysql.connector.DatabaseError as e:
+                rejects.add(values, e.msg)
+        conn.commit()
+        return ok
+    finally:
+        cur.close()
+
+def _prevalidated(conn, table, columns, chunk, rejects, flags):
+    """Drop the rows college_integrity.prevalidate() refuses, so the
+    executemany() seldom has to fall back to row-by-row inserts; rows kept
+    with a data-quality finding are listed in `flags`."""
+    from college_integrity import prevalidate   # only needed once an import runs
+    cur = conn.cursor(buffered=True)
+    notes = {}
+    try:
+        errors = prevalidate(cur, table, columns, chunk, notes)
+    finally:
+        cur.close()
+    for i in sorted(errors):
+        rejects.add(chunk[i], errors[i])
+    for i in sorted(notes):
+        if i not in errors:
+            flags.add(chunk[i], notes[i])
+    return [row for i, row in enumerate(chunk) if i not in errors]
+
+def import_csv(conn, table, columns, path, batch_size=IMPORT_BATCH_SIZE, progress=None, cancel=None):
+    """Stream a CSV file into `table` in chunks of `batch_size` rows.
+
+    Each chunk is checked with a few set-based queries (foreign keys, keys and
+    unique columns, see college_integrity) and then inserted with one
+    executemany() in one transaction. Rows that fail validation or that the
+    server refuses go to `<path>.rejects.csv` with the reason instead of
+    aborting the import; rows imported with a data-quality finding (e.g. a
+    malformed Phone_No) are listed in `<path>.findings.csv`. `progress(fraction)` is called after
+    every chunk; the import stops between chunks once `cancel()` returns True.
+    """
+    result = ImportResult()
+    validate = VALIDATORS.get(table)
+    sql = (f"INSERT INTO {table} ({', '.join(columns)}) "
+           f"VALUES ({', '.join(['%s'] * len(columns))})")
+    rejects = _Rejects(os.path.splitext(path)[0] + ".rejects.csv", columns)
+    flags = _Rejects(os.path.splitext(path)[0] + ".findings.csv", columns, label="Finding")
+    size = os.path.getsize(path) or 1
+
+    def flush(chunk):
+        chunk = _prevalidated(conn, table, columns, chunk, rejects, flags)
+        return _insert_chunk(conn, sql, chunk, rejects) if chunk else 0
+
+    try:
+        # Progress is the byte offset of the file, the unit of `size`
+        with open(path, "rb") as fh, io.TextIOWrapper(fh, encoding="utf-8-sig", newline="") as f:
+            reader = csv.reader(f)
+            first = next(reader, None)
+            if first is None:
+                return result
+            index = _map_header(first, columns)
+            pending = [] if index is not None else [first]
+            if index is None:
+                index = list(range(len(columns)))
+            chunk = []
+            for raw in chain(pending, reader):
+                if not any(v.strip() for v in raw):
+                    continue
+                values = tuple((raw[i].strip() or None) if i is not None and i < len(raw) else None
+                               for i in index)
+                error = validate(dict(zip(columns, values))) if validate else None
+                if error:
+                    rejects.add(values, error)
+                    continue
+                chunk.append(values)
+                if len(chunk) >= batch_size:
+                    result.inserted += flush(chunk)
+                    chunk = []
+                    if progress:
+                        progress(min(fh.tell() / size, 1.0))
+                    if cancel and cancel():
+                        result.cancelled = True
+                        break
+            if chunk and not result.cancelled:
+                result.inserted += flush(chunk)
+            if progress:
+                progress(1.0)
+    finally:
+        rejects.close()
+        flags.close()
+    if rejects.count:
+        result.rejected = rejects.count
+        result.reject_path = rejects.path
+    if flags.count:
+        result.flagged = flags.count
+        result.flag_path = flags.path
+    return result
+
+# ----------------------- STREAMING EXPORT -----------------------
+EXPORT_FETCH_SIZE = 5000   # rows pulled from the server per fetchmany()
+
+class _CsvWriter:
+    """CSV output, gzip-compressed when the file name ends in .gz."""
+
+    def __init__(self, path, description, compress=False):
+        if compress:
+            self._f = gzip.open(path, "wt", newline="", encoding="utf-8")
+        else:
+            self._f = open(path, "w", newline="", encoding="utf-8")
+        self._w = csv.writer(self._f)
+        self._w.writerow([d[0] for d in description])
+
+    def write(self, rows):
+        self._w.writerows(rows)
+
+    def close(self):
+        self._f.close()
+
+def _arrow_type(type_code):
+    if type_code in (FieldType.TINY, FieldType.SHORT, FieldType.INT24,
+                     FieldType.LONG, FieldType.LONGLONG, FieldType.YEAR):
+        return pa.int64()
+    if type_code in (FieldType.FLOAT, FieldType.DOUBLE):
+        return pa.float64()
+    if type_code == FieldType.DATE:
+        return pa.date32()
+    if type_code in (FieldType.DATETIME, FieldType.TIMESTAMP):
+        return pa.timestamp("us")
+    # DECIMAL stays text so no precision is lost
+    return pa.string()
+
+class _ArrowWriter:
+    """Parquet (.parquet) or Arrow IPC (.arrow) output, one record batch per fetch."""
+
+    def __init__(self, path, description, parquet=True):
+        _load_arrow()
+        self._schema = pa.schema([(d[0], _arrow_type(d[1])) for d in description])
+        self._text = [t == pa.string() for t in self._schema.types]
+        if parquet:
+            self._w = pq.ParquetWriter(path, self._schema)
+        else:
+            self._w = pa.ipc.new_file(path, self._schema)
+
+    def write(self, rows):
+        cols = []
+        for i, text in enumerate(self._text):
+            col = [r[i] for r in rows]
+            if text:
+                col = [None if v is None else str(v) for v in col]
+            cols.append(col)
+        batch = pa.RecordBatch.from_arrays(
+            [pa.array(c, type=t) for c, t in zip(cols, self._schema.types)], schema=self._schema)
+        if isinstance(self._w, pq.ParquetWriter):
+            self._w.write_table(pa.Table.from_batches([batch]))
+        else:
+            self._w.write_batch(batch)
+
+    def close(self):
+        self._w.close()
+
+def export_formats():
+    """File types offered by the export dialog."""
+    types = [("CSV files", "*.csv"), ("Gzipped CSV", "*.csv.gz")]
+    if ARROW_AVAILABLE:
+        types += [("Parquet", "*.parquet"), ("Arrow IPC", "*.arrow")]
+    return types
+
+def export_query(conn, sql, params, path, progress=None, cancel=None):
+    """Stream the result of `sql` to `path` and return the number of rows written.
+
+    Uses an unbuffered cursor and fetchmany(), so only EXPORT_FETCH_SIZE rows
+    are in memory at a time whatever the result size. The output format
+    follows the file name: .csv, .csv.gz, .parquet or .arrow (pyarrow only).
+    `sql` may be a CALL; the procedure's first result set is exported.
+    """
+    if path.endswith((".parquet", ".arrow")) and not ARROW_AVAILABLE:
+        raise RuntimeError("Parquet/Arrow export needs the pyarrow package.")
+    cur = conn.cursor()   # unbuffered: rows stay on the server until fetched
+    written = 0
+    try:
+        cur.execute(sql, params)
+        tmp_path = path + ".part"
+        if path.endswith((".parquet", ".arrow")):
+            writer = _ArrowWriter(tmp_path, cur.description, parquet=path.endswith(".parquet"))
+        else:
+            writer = _CsvWriter(tmp_path, cur.description, compress=path.endswith(".gz"))
+        complete = False
+        try:
+            while True:
+                rows = cur.fetchmany(EXPORT_FETCH_SIZE)
+                if not rows:
+                    complete = True
+                    break
+                writer.write(rows)
+                written += len(rows)
+                if progress:
+                    progress(written)
+                if cancel and cancel():
+                    conn.consume_results()
+                    break
+        finally:
+            writer.close()
+            if complete:
+                os.replace(tmp_path, path)
+            else:
+                os.remove(tmp_path)
+        while cur.nextset():   # CALL ends with a status result
+            pass
+    finally:
+        cur.close()
+    return written
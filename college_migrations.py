@@ -0,0 +1,468 @@
+# college_migrations.py — versioned schema changes and checksum-gated SQL objects
+#
+# Usage:  python college_migrations.py            apply pending changes
+#         python college_migrations.py --status   list what would change
+import argparse, hashlib, re
+import mysql.connector
+from college_db import DB_CONFIG
+
+# ----------------------- METADATA TABLE -----------------------
+_META_DDL = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    name VARCHAR(128) PRIMARY KEY,
+    kind VARCHAR(16) NOT NULL,
+    checksum CHAR(64) NOT NULL,
+    applied_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+)
+"""
+_LOCK_NAME = "college_migrations"   # GET_LOCK name so two clients never migrate at once
+LOCK_TIMEOUT = 30                   # seconds to wait for another client's migration
+
+class MigrationLocked(RuntimeError):
+    """Another client held the migration lock for longer than the timeout."""
+
+def checksum(text):
+    """sha256 of the statement with whitespace normalised."""
+    return hashlib.sha256(re.sub(r"\s+", " ", text).strip().encode("utf-8")).hexdigest()
+
+# ----------------------- SCHEMA MIGRATIONS -----------------------
+# Applied once each, in order. `skip_if` is a query that returns a non-zero
+# count when the change is already present (e.g. a database created from the
+# current .sql script), in which case the migration is only recorded.
+class Migration:
+    def __init__(self, name, statements, skip_if=None):
+        self.name = name
+        self.statements = statements
+        self.skip_if = skip_if
+        self.checksum = checksum(";".join(statements))
+
+def _column_exists(table, column):
+    return ("SELECT COUNT(*) FROM information_schema.COLUMNS "
+            f"WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = '{table}' AND COLUMN_NAME = '{column}'")
+
+def _index_exists(table, index):
+    return ("SELECT COUNT(*) FROM information_schema.STATISTICS "
+            f"WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = '{table}' AND INDEX_NAME = '{index}'")
+
+def _index_on(table, column):
+    """Any index whose leading column is `column` (InnoDB adds one for each foreign key)."""
+    return ("SELECT COUNT(*) FROM information_schema.STATISTICS "
+            f"WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = '{table}' "
+            f"AND COLUMN_NAME = '{column}' AND SEQ_IN_INDEX = 1")
+
+MIGRATIONS = [
+    # The GUI and sp_AddNewStudent use Student.Dept_ID, which the original script never created
+    Migration("0001_student_dept_id", [
+        """ALTER TABLE Student
+           ADD COLUMN Dept_ID INT NULL,
+           ADD CONSTRAINT fk_student_dept FOREIGN KEY (Dept_ID) REFERENCES Department(Dept_ID)
+               ON DELETE SET NULL ON UPDATE CASCADE""",
+    ], skip_if=_column_exists("Student", "Dept_ID")),
+
+    # Search bar indexes. Name prefix indexes serve `Name LIKE 'abc%'`; the
+    # FULLTEXT indexes serve multi-word name searches. Email is already UNIQUE
+    # and the foreign-key columns normally already carry InnoDB's implicit
+    # index, so those are only created when missing.
+    Migration("0002_idx_student_name",
+              ["CREATE INDEX idx_student_name ON Student (Name(32))"],
+              skip_if=_index_exists("Student", "idx_student_name")),
+    Migration("0003_idx_professor_name",
+              ["CREATE INDEX idx_professor_name ON Professor (Name(32))"],
+              skip_if=_index_exists("Professor", "idx_professor_name")),
+    Migration("0004_idx_course_name",
+              ["CREATE INDEX idx_course_name ON Course (Course_Name(32))"],
+              skip_if=_index_exists("Course", "idx_course_name")),
+    Migration("0005_ft_student_name",
+              ["CREATE FULLTEXT INDEX ft_student_name ON Student (Name)"],
+              skip_if=_index_exists("Student", "ft_student_name")),
+    Migration("0006_ft_professor_name",
+              ["CREATE FULLTEXT INDEX ft_professor_name ON Professor (Name)"],
+              skip_if=_index_exists("Professor", "ft_professor_name")),
+    Migration("0007_idx_student_clg",
+              ["CREATE INDEX idx_student_clg ON Student (Clg_ID)"],
+              skip_if=_index_on("Student", "Clg_ID")),
+    Migration("0008_idx_student_dept",
+              ["CREATE INDEX idx_student_dept ON Student (Dept_ID)"],
+              skip_if=_index_on("Student", "Dept_ID")),
+    Migration("0009_idx_professor_dept",
+              ["CREATE INDEX idx_professor_dept ON Professor (Dept_ID)"],
+              skip_if=_index_on("Professor", "Dept_ID")),
+    Migration("0010_idx_course_dept",
+              ["CREATE INDEX idx_course_dept ON Course (Dept_ID)"],
+              skip_if=_index_on("Course", "Dept_ID")),
+
+    # Summary tables written by college_analytics.refresh_summaries()
+    Migration("0011_analytics_summaries", [
+        """CREATE TABLE IF NOT EXISTS stat_student_gpa (
+               Stu_ID INT PRIMARY KEY,
+               Courses INT NOT NULL,
+               Credits_Attempted DECIMAL(8,2) NOT NULL,
+               Credits_Earned DECIMAL(8,2) NOT NULL,
+               GPA DECIMAL(4,2) NULL,
+               refreshed_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+               FOREIGN KEY (Stu_ID) REFERENCES Student(Stu_ID) ON DELETE CASCADE ON UPDATE CASCADE
+           )""",
+        """CREATE TABLE IF NOT EXISTS stat_course_grades (
+               Course_ID INT PRIMARY KEY,
+               Enrolled INT NOT NULL,
+               Pass_Rate DECIMAL(5,3) NULL,
+               Avg_Points DECIMAL(4,2) NULL,
+               refreshed_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+               FOREIGN KEY (Course_ID) REFERENCES Course(Course_ID) ON DELETE CASCADE ON UPDATE CASCADE
+           )""",
+    ]),
+
+    # One row per write to a GUI table, appended by the change-log triggers
+    # below. The id doubles as a row version: a row changed after id N has
+    # an entry with id > N. `client` is the writer's @college_client.
+    Migration("0012_change_log", [
+        """CREATE TABLE IF NOT EXISTS change_log (
+               id BIGINT AUTO_INCREMENT PRIMARY KEY,
+               table_name VARCHAR(32) NOT NULL,
+               row_key INT NOT NULL,
+               op CHAR(1) NOT NULL,
+               client CHAR(32) NULL,
+               changed_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+               INDEX idx_change_log_table (table_name, id),
+               INDEX idx_change_log_row (table_name, row_key, id),
+               INDEX idx_change_log_time (changed_at)
+           )""",
+    ]),
+
+    # Academic terms. Codes are 'YYYY-S' (S = 1 or 2) so they sort in term
+    # order; the term running today is seeded so existing enrollments have one.
+    Migration("0013_academic_term", [
+        """CREATE TABLE IF NOT EXISTS academic_term (
+               Term VARCHAR(10) PRIMARY KEY,
+               Starts DATE NOT NULL,
+               Ends DATE NOT NULL
+           )""",
+        """INSERT IGNORE INTO academic_term (Term, Starts, Ends)
+           SELECT CONCAT(YEAR(CURDATE()), '-', IF(MONTH(CURDATE()) < 7, 1, 2)),
+                  MAKEDATE(YEAR(CURDATE()), 1) + INTERVAL IF(MONTH(CURDATE()) < 7, 0, 6) MONTH,
+                  MAKEDATE(YEAR(CURDATE()), 1) + INTERVAL IF(MONTH(CURDATE()) < 7, 6, 12) MONTH - INTERVAL 1 DAY""",
+    ]),
+
+    # Enrollment.Term: existing rows belong to the seeded term, and a course
+    # can be retaken in a later term. New rows without a term get the current
+    # one from trg_Enrollment_default_term.
+    Migration("0014_enrollment_term", [
+        "ALTER TABLE Enrollment ADD COLUMN Term VARCHAR(10) NOT NULL DEFAULT ''",
+        "UPDATE Enrollment SET Term = (SELECT MAX(Term) FROM academic_term)",
+        """ALTER TABLE Enrollment
+           DROP PRIMARY KEY,
+           ADD PRIMARY KEY (Stu_ID, Course_ID, Term),
+           ADD INDEX idx_enrollment_term (Term)""",
+    ], skip_if=_column_exists("Enrollment", "Term")),
+
+    # Closed terms are moved here by college_terms.rollover(). InnoDB cannot
+    # partition a table with foreign keys, so history lives in its own table
+    # (without foreign keys: it outlives deleted students and courses).
+    Migration("0015_enrollment_history", [
+        """CREATE TABLE IF NOT EXISTS Enrollment_History (
+               Stu_ID INT NOT NULL,
+               Course_ID INT NOT NULL,
+               Grade VARCHAR(2),
+               Term VARCHAR(10) NOT NULL,
+               Archived_At DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+               PRIMARY KEY (Term, Stu_ID, Course_ID),
+               INDEX idx_history_student (Stu_ID),
+               INDEX idx_history_course (Course_ID)
+           )""",
+    ]),
+
+    # Enrollment changes are logged with Stu_ID as row_key and Course_ID as
+    # ref_key, so refresh_summaries() can recompute just those students and courses
+    Migration("0016_change_log_ref_key",
+              ["ALTER TABLE change_log ADD COLUMN ref_key INT NULL AFTER row_key"],
+              skip_if=_column_exists("change_log", "ref_key")),
+
+    # Change id up to which the stat_* tables are current (the watermark)
+    Migration("0017_stat_refresh", [
+        """CREATE TABLE IF NOT EXISTS stat_refresh (
+               name VARCHAR(32) PRIMARY KEY,
+               change_id BIGINT NOT NULL,
+               refreshed_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+           )""",
+    ]),
+]
+
+# Tables whose writes are recorded in change_log, with their primary key
+TRACKED_TABLES = {"College": "Clg_ID", "Department": "Dept_ID", "Professor": "Prof_ID",
+                  "Course": "Course_ID", "Student": "Stu_ID"}
+
+# ----------------------- TRIGGERS / PROCEDURES / FUNCTIONS -----------------------
+# Re-created (DROP + CREATE) only when the body's checksum differs from the
+# one recorded at the last run.
+OBJECTS = [
+    # Trigger: Professor email lowercase
+    ("TRIGGER", "trg_student_Insert_Lowercase_Email", """
+        CREATE TRIGGER trg_student_Insert_Lowercase_Email
+        BEFORE INSERT ON Professor
+        FOR EACH ROW
+        BEGIN
+            SET NEW.Email = LOWER(NEW.Email);
+        END;
+        """),
+
+    # Trigger: Student DOB validation (student must be at least 18); rows
+    # reloaded by college_backup.restore (@college_restore) were checked when first added
+    ("TRIGGER", "trg_Before_Student_Insert_Validate_DOB", """
+        CREATE TRIGGER trg_Before_Student_Insert_Validate_DOB
+        BEFORE INSERT ON Student
+        FOR EACH ROW
+        BEGIN
+            IF @college_restore IS NULL AND NEW.DOB > DATE_SUB(CURDATE(), INTERVAL 18 YEAR) THEN
+                SIGNAL SQLSTATE '45000'
+                SET MESSAGE_TEXT = 'Invalid DOB: Student must be at least 18 years old.';
+            END IF;
+        END;
+        """),
+
+    # Procedure: Add New Student (includes Dept_ID)
+    ("PROCEDURE", "sp_AddNewStudent", """
+        CREATE PROCEDURE sp_AddNewStudent(
+            IN p_Stu_ID INT,
+            IN p_Name VARCHAR(255),
+            IN p_Phone VARCHAR(20),
+            IN p_Email VARCHAR(255),
+            IN p_DOB DATE,
+            IN p_Gender VARCHAR(10),
+            IN p_Clg_ID INT,
+            IN p_Dept_ID INT
+        )
+        BEGIN
+            INSERT INTO Student (Stu_ID, Name, Phone_No, Email, DOB, Gender, Clg_ID, Dept_ID)
+            VALUES (p_Stu_ID, p_Name, p_Phone, p_Email, p_DOB, p_Gender, p_Clg_ID, p_Dept_ID);
+        END;
+        """),
+
+    # Procedure: Get Students by Department (direct lookup using Student + Department)
+    ("PROCEDURE", "sp_GetStudentsByDepartment", """
+        CREATE PROCEDURE sp_GetStudentsByDepartment(IN p_Dept_Name VARCHAR(255))
+        BEGIN
+            SELECT s.Name, s.Email
+            FROM Student s
+            JOIN Department d ON s.Dept_ID = d.Dept_ID
+            WHERE d.Dept_Name = p_Dept_Name;
+        END;
+        """),
+
+    # Function: Get Department HOD
+    ("FUNCTION", "fn_GetDepartmenttHOD", """
+        CREATE FUNCTION fn_GetDepartmenttHOD(p_Dept_Name VARCHAR(255))
+        RETURNS VARCHAR(255)
+        READS SQL DATA
+        BEGIN
+            DECLARE v_HOD_Name VARCHAR(255);
+            SELECT HOD INTO v_HOD_Name FROM Department WHERE Dept_Name = p_Dept_Name;
+            RETURN v_HOD_Name;
+        END;
+        """),
+
+    # Function: current academic term (the latest that has started, else the first)
+    ("FUNCTION", "fn_CurrentTerm", """
+        CREATE FUNCTION fn_CurrentTerm()
+        RETURNS VARCHAR(10)
+        READS SQL DATA
+        BEGIN
+            DECLARE v_Term VARCHAR(10);
+            SELECT MAX(Term) INTO v_Term FROM academic_term WHERE Starts <= CURDATE();
+            IF v_Term IS NULL THEN
+                SELECT MIN(Term) INTO v_Term FROM academic_term;
+            END IF;
+            RETURN v_Term;
+        END;
+        """),
+
+    # Trigger: enrollments inserted without a term belong to the current one
+    ("TRIGGER", "trg_Enrollment_default_term", """
+        CREATE TRIGGER trg_Enrollment_default_term
+        BEFORE INSERT ON Enrollment
+        FOR EACH ROW
+        BEGIN
+            IF NEW.Term IS NULL OR NEW.Term = '' THEN
+                SET NEW.Term = fn_CurrentTerm();
+            END IF;
+        END;
+        """),
+
+    # Function: Get Student Count by College
+    ("FUNCTION", "fn_GetStudentCountByCollege_", """
+        CREATE FUNCTION fn_GetStudentCountByCollege_(p_Clg_ID INT)
+        RETURNS INT
+        READS SQL DATA
+        BEGIN
+            DECLARE v_Student_Count INT;
+            SELECT COUNT(*) INTO v_Student_Count FROM Student WHERE Clg_ID = p_Clg_ID;
+            RETURN v_Student_Count;
+        END;
+        """),
+]
+
+def _change_log_triggers():
+    """AFTER INSERT/UPDATE/DELETE triggers feeding change_log for TRACKED_TABLES.
+
+    Rows changed by an ON DELETE/UPDATE CASCADE are not logged (InnoDB does
+    not fire triggers for cascaded changes). Nor are rows written by
+    college_backup.restore (@college_restore set), which logs one 'R' entry
+    per table instead.
+    """
+    log = "INSERT INTO change_log (table_name, row_key, op, client) VALUES ('{t}', {k}, '{op}', @college_client)"
+    for t, key in TRACKED_TABLES.items():
+        yield ("TRIGGER", f"trg_{t}_log_insert", f"""
+        CREATE TRIGGER trg_{t}_log_insert AFTER INSERT ON {t}
+        FOR EACH ROW
+        BEGIN
+            IF @college_restore IS NULL THEN
+                {log.format(t=t, k=f"NEW.{key}", op="I")};
+            END IF;
+        END;
+        """)
+        yield ("TRIGGER", f"trg_{t}_log_update", f"""
+        CREATE TRIGGER trg_{t}_log_update AFTER UPDATE ON {t}
+        FOR EACH ROW
+        BEGIN
+            IF @college_restore IS NULL THEN
+                IF OLD.{key} <> NEW.{key} THEN
+                    {log.format(t=t, k=f"OLD.{key}", op="D")};
+                END IF;
+                {log.format(t=t, k=f"NEW.{key}", op="U")};
+            END IF;
+        END;
+        """)
+        yield ("TRIGGER", f"trg_{t}_log_delete", f"""
+        CREATE TRIGGER trg_{t}_log_delete AFTER DELETE ON {t}
+        FOR EACH ROW
+        BEGIN
+            IF @college_restore IS NULL THEN
+                {log.format(t=t, k=f"OLD.{key}", op="D")};
+            END IF;
+        END;
+        """)
+
+def _enrollment_log_triggers():
+    """change_log triggers for Enrollment, read by college_analytics.refresh_summaries().
+
+    Its key is composite, so entries carry Stu_ID as row_key and Course_ID as
+    ref_key; no tab merges them. Restores are skipped like the others.
+    """
+    log = ("INSERT INTO change_log (table_name, row_key, ref_key, op, client) "
+           "VALUES ('Enrollment', {r}.Stu_ID, {r}.Course_ID, '{op}', @college_client)")
+    yield ("TRIGGER", "trg_Enrollment_log_insert", f"""
+        CREATE TRIGGER trg_Enrollment_log_insert AFTER INSERT ON Enrollment
+        FOR EACH ROW
+        BEGIN
+            IF @college_restore IS NULL THEN
+                {log.format(r="NEW", op="I")};
+            END IF;
+        END;
+        """)
+    yield ("TRIGGER", "trg_Enrollment_log_update", f"""
+        CREATE TRIGGER trg_Enrollment_log_update AFTER UPDATE ON Enrollment
+        FOR EACH ROW
+        BEGIN
+            IF @college_restore IS NULL THEN
+                IF OLD.Stu_ID <> NEW.Stu_ID OR OLD.Course_ID <> NEW.Course_ID THEN
+                    {log.format(r="OLD", op="D")};
+                END IF;
+                {log.format(r="NEW", op="U")};
+            END IF;
+        END;
+        """)
+    yield ("TRIGGER", "trg_Enrollment_log_delete", f"""
+        CREATE TRIGGER trg_Enrollment_log_delete AFTER DELETE ON Enrollment
+        FOR EACH ROW
+        BEGIN
+            IF @college_restore IS NULL THEN
+                {log.format(r="OLD", op="D")};
+            END IF;
+        END;
+        """)
+
+OBJECTS += list(_change_log_triggers()) + list(_enrollment_log_triggers())
+
+# ----------------------- RUNNER -----------------------
+def _applied(cur):
+    cur.execute(_META_DDL)
+    cur.execute("SELECT name, checksum FROM schema_migrations")
+    return dict(cur.fetchall())
+
+def _record(cur, name, kind, digest):
+    cur.execute("REPLACE INTO schema_migrations (name, kind, checksum) VALUES (%s, %s, %s)",
+                (name, kind, digest))
+
+def pending(cur):
+    """List of (kind, name) that migrate() would apply."""
+    applied = _applied(cur)
+    todo = [("SCHEMA", m.name) for m in MIGRATIONS if m.name not in applied]
+    todo += [(kind, name) for kind, name, body in OBJECTS if applied.get(name) != checksum(body)]
+    return todo
+
+def migrate(cur, log=print, lock_timeout=LOCK_TIMEOUT):
+    """Apply pending schema migrations, then re-create changed SQL objects.
+
+    Waits up to `lock_timeout` seconds for the migration lock (GET_LOCK) and
+    raises MigrationLocked when another client still holds it. When nothing
+    changed the work under the lock is a CREATE TABLE IF NOT EXISTS for
+    schema_migrations (a no-op once it exists) and one SELECT on it. Returns
+    the number of changes applied.
+    """
+    cur.execute("SELECT GET_LOCK(%s, %s)", (_LOCK_NAME, lock_timeout))
+    if not cur.fetchone()[0]:
+        raise MigrationLocked(f"Another client has been running migrations for over {lock_timeout} s.")
+    try:
+        applied = _applied(cur)
+        done = 0
+        for m in MIGRATIONS:
+            if m.name in applied:
+                if applied[m.name] != m.checksum:
+                    log(f"Warning: migration {m.name} changed after it was applied; not re-run.")
+                continue
+            skip = False
+            if m.skip_if:
+                cur.execute(m.skip_if)
+                skip = bool(cur.fetchone()[0])
+            if not skip:
+                for stmt in m.statements:
+                    cur.execute(stmt)
+            _record(cur, m.name, "SCHEMA", m.checksum)
+            log(f"{'Recorded' if skip else 'Applied'} migration {m.name}")
+            done += 1
+        for kind, name, body in OBJECTS:
+            digest = checksum(body)
+            if applied.get(name) == digest:
+                continue
+            cur.execute(f"DROP {kind} IF EXISTS {name}")
+            cur.execute(body)
+            _record(cur, name, kind, digest)
+            log(f"Created {kind.lower()} {name}")
+            done += 1
+        return done
+    finally:
+        cur.execute("SELECT RELEASE_LOCK(%s)", (_LOCK_NAME,))
+        cur.fetchone()
+
+# ----------------------- COMMAND LINE -----------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Apply College Management System schema migrations.")
+    parser.add_argument("--status", action="store_true", help="only list pending changes")
+    args = parser.parse_args(argv)
+
+    conn = mysql.connector.connect(**DB_CONFIG)
+    try:
+        cur = conn.cursor()
+        if args.status:
+            todo = pending(cur)
+            for kind, name in todo:
+                print(f"pending  {kind:<9} {name}")
+            print(f"{len(todo)} pending change(s).")
+        else:
+            n = migrate(cur)
+            conn.commit()
+            print(f"{n} change(s) applied." if n else "Schema is up to date.")
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,293 @@
+# college_perf.py — per-statement timing, slow-query log and rolling percentiles
+import json, os, re, threading, time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+# ----------------------- SETTINGS -----------------------
+SLOW_QUERY_MS = 250          # statements slower than this go to the slow-query log
+SLOW_LOG_PATH = os.path.join(os.getcwd(), "slow_queries.log")
+EXPLAIN_SLOW = False         # also log EXPLAIN output for slow SELECTs
+PERF_WINDOW = 1000           # latencies kept per statement for percentiles
+
+# ----------------------- UI ACTION CONTEXT -----------------------
+_local = threading.local()
+
+def current_action():
+    return getattr(_local, "action", None)
+
+@contextmanager
+def action(name):
+    """Label the statements run inside the block with the UI action that caused them."""
+    prev = current_action()
+    _local.action = name
+    try:
+        yield
+    finally:
+        _local.action = prev
+
+# ----------------------- STATEMENT STATS -----------------------
+_LITERALS = [
+    (re.compile(r"'(?:[^'\\]|\\.|'')*'"), "?"),         # string literals
+    (re.compile(r"\b\d+(?:\.\d+)?\b"), "?"),           # numbers
+    (re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)"), "(?)"),  # IN (...) / VALUES (...) lists
+    (re.compile(r"\s+"), " "),
+]
+
+def normalize(sql):
+    """Statement text with literals and placeholders folded, used as the stats key."""
+    sql = sql.replace("%s", "?")
+    for pattern, repl in _LITERALS:
+        sql = pattern.sub(repl, sql)
+    return sql.strip()
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    i = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[i]
+
+class _Stat:
+    __slots__ = ("calls", "total", "rows", "max", "latencies", "action")
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.rows = 0
+        self.max = 0.0
+        self.latencies = deque(maxlen=PERF_WINDOW)
+        self.action = None
+
+class Recorder:
+    """Thread-safe collection of statement timings."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+        self.started = datetime.now()
+
+    def record(self, sql, seconds, rows=0, action_name=None, explain=None):
+        key = normalize(sql)
+        with self._lock:
+            st = self._stats.get(key)
+            if st is None:
+                st = self._stats[key] = _Stat()
+            st.calls += 1
+            st.total += seconds
+            st.rows += max(rows, 0)
+            st.max = max(st.max, seconds)
+            st.latencies.append(seconds)
+            st.action = action_name or current_action() or st.action
+        if seconds * 1000 >= SLOW_QUERY_MS:
+            self._log_slow(key, seconds, rows, action_name or current_action(), explain)
+
+    def _log_slow(self, sql, seconds, rows, action_name, explain):
+        lines = [f"{datetime.now():%Y-%m-%d %H:%M:%S}\t{seconds * 1000:.1f} ms\t{rows} rows\t"
+                 f"{action_name or '-'}\t{sql}"]
+        for row in explain or []:
+            lines.append("    EXPLAIN " + " | ".join("" if v is None else str(v) for v in row))
+        try:
+            with open(SLOW_LOG_PATH, "a", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+        except OSError as e:
+            print("Could not write slow-query log:", e)
+
+    def snapshot(self):
+        """One dict per statement, slowest total first."""
+        with self._lock:
+            items = [(k, st.calls, st.total, st.rows, st.max, sorted(st.latencies), st.action)
+                     for k, st in self._stats.items()]
+        out = []
+        for sql, calls, total, rows, mx, lat, act in items:
+            out.append({
+                "sql": sql, "calls": calls, "rows": rows, "action": act,
+                "total_ms": round(total * 1000, 2),
+                "avg_ms": round(total * 1000 / calls, 2),
+                "p50_ms": round(_percentile(lat, 50) * 1000, 2),
+                "p95_ms": round(_percentile(lat, 95) * 1000, 2),
+                "max_ms": round(mx * 1000, 2),
+            })
+        out.sort(key=lambda s: s["total_ms"], reverse=True)
+        return out
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+            self.started = datetime.now()
+
+    def export_json(self, path):
+        data = {"started": self.started.isoformat(timespec="seconds"),
+                "exported": datetime.now().isoformat(timespec="seconds"),
+                "slow_query_ms": SLOW_QUERY_MS,
+                "statements": self.snapshot()}
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+
+recorder = Recorder()
+
+# ----------------------- CONNECTION / CURSOR WRAPPERS -----------------------
+class InstrumentedCursor:
+    """Cursor proxy that times each statement from execute() until its rows
+    have been fetched.
+
+    A statement is recorded once it is complete: straight after execute()
+    when it returns no rows, after fetchall() or a full iteration otherwise.
+    Results read with fetchone()/fetchmany() are recorded when the next
+    statement starts or the cursor closes. Cursors kept open for reuse (the
+    prepared statements of college_db.StatementCache) thus report every run.
+    """
+
+    def __init__(self, cursor, conn):
+        self._cur = cursor
+        self._conn = conn
+        self._sql = None
+        self._params = None
+        self._rows = 0
+        self._elapsed = 0.0
+        self._action = None
+
+    def __getattr__(self, name):
+        return getattr(self._cur, name)
+
+    def __iter__(self):
+        for row in self._cur:
+            self._rows += 1
+            yield row
+        self._finish()
+
+    def _start(self, sql, params):
+        self._finish()
+        self._sql, self._params = sql, params
+        self._rows = 0
+        self._elapsed = 0.0
+        self._action = current_action()
+
+    def _timed(self, func, *args):
+        t = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            self._elapsed += time.perf_counter() - t
+
+    def _finish(self):
+        if self._sql is None:
+            return
+        sql, self._sql = self._sql, None
+        explain = None
+        if (EXPLAIN_SLOW and self._elapsed * 1000 >= SLOW_QUERY_MS
+                and sql.lstrip().upper().startswith("SELECT")):
+            explain = self._explain(sql, self._params)
+        recorder.record(sql, self._elapsed, self._rows, self._action, explain)
+
+    def _explain(self, sql, params):
+        try:
+            cur = self._conn.cursor(buffered=True)
+            try:
+                cur.execute("EXPLAIN " + sql, params)
+                return cur.fetchall()
+            finally:
+                cur.close()
+        except Exception:
+            return None   # e.g. the slow statement's rows were not fully read
+
+    def execute(self, sql, params=None):
+        self._start(sql, params)
+        result = self._timed(self._cur.execute, sql, params)
+        if self._cur.description is None:
+            self._rows = self._cur.rowcount
+            self._finish()
+        return result
+
+    def executemany(self, sql, seq):
+        self._start(sql, None)
+        result = self._timed(self._cur.executemany, sql, seq)
+        self._rows = self._cur.rowcount
+        self._finish()
+        return result
+
+    def callproc(self, name, args=()):
+        self._start(f"CALL {name}({', '.join(['%s'] * len(args))})", None)
+        return self._timed(self._cur.callproc, name, args)
+
+    def stored_results(self):
+        for result in self._cur.stored_results():
+            self._rows += max(result.rowcount, 0)
+            yield result
+
+    def fetchone(self):
+        row = self._timed(self._cur.fetchone)
+        if row is not None:
+            self._rows += 1
+        return row
+
+    def fetchmany(self, size=1):
+        rows = self._timed(self._cur.fetchmany, size)
+        self._rows += len(rows)
+        return rows
+
+    def fetchall(self):
+        rows = self._timed(self._cur.fetchall)
+        self._rows += len(rows)
+        self._finish()
+        return rows
+
+    def close(self):
+        self._finish()
+        return self._cur.close()
+
+class InstrumentedConnection:
+    """Connection proxy whose cursors are InstrumentedCursors."""
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def cursor(self, *args, **kwargs):
+        return InstrumentedCursor(self._conn.cursor(*args, **kwargs), self._conn)
+
+# ----------------------- STARTUP TIMING -----------------------
+class StartupTimer:
+    """Where launch time goes.
+
+    mark() closes the launch phase that began at the previous mark (or when
+    this module was imported); resume() restarts the clock without recording,
+    to leave out time spent waiting for the user at the login window.
+    record() adds work measured separately, such as a tab built on first
+    selection, which is listed apart from the launch phases.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._last = time.perf_counter()
+        self.phases = []     # (label, seconds) up to the first paint
+        self.deferred = []   # (label, seconds) done later, on demand or in the background
+
+    def mark(self, label):
+        now = time.perf_counter()
+        with self._lock:
+            self.phases.append((label, now - self._last))
+            self._last = now
+
+    def resume(self):
+        with self._lock:
+            self._last = time.perf_counter()
+
+    def record(self, label, seconds):
+        with self._lock:
+            self.deferred.append((label, seconds))
+
+    def report(self):
+        with self._lock:
+            phases, deferred = list(self.phases), list(self.deferred)
+        width = max([len(label) for label, _ in phases + deferred] + [24])
+        lines = [f"{label:<{width}}  {s * 1000:8.1f} ms" for label, s in phases]
+        lines.append(f"{'time to first window':<{width}}  {sum(s for _, s in phases) * 1000:8.1f} ms")
+        if deferred:
+            lines.append("")
+            lines.append("Deferred:")
+            lines += [f"{label:<{width}}  {s * 1000:8.1f} ms" for label, s in deferred]
+        return "\n".join(lines)
+
+startup = StartupTimer()
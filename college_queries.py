@@ -0,0 +1,155 @@
+# college_queries.py — SQL shared by the GUI, the benchmarks and command-line tools
+#
+# Every function takes an open cursor (or builds SQL for one) and has no Tk or
+# connection state, so it can be reused outside the GUI.
+
+# ----------------------- PREPARED STATEMENTS -----------------------
+# Cursors handed out by college_db.DBExecutor carry their connection's
+# StatementCache as `cur.statements`; elsewhere these fall back to the text
+# protocol on the cursor itself.
+def execute(cur, sql, params=()):
+    """Run a write, prepared once per connection when possible; returns the row count."""
+    statements = getattr(cur, "statements", None)
+    if statements is None:
+        cur.execute(sql, params)
+        return cur.rowcount
+    return statements.execute(sql, params).rowcount
+
+PREPARED_MANY_MAX = 100   # larger UPDATE/DELETE batches keep executemany()
+
+def execute_many(cur, sql, seq):
+    """Run a write for every parameter tuple in `seq`.
+
+    INSERTs keep executemany(), which sends them as one multi-row INSERT.
+    Small UPDATE and DELETE batches (the GUI's staged edits) reuse one
+    prepared statement per row instead of sending the SQL text each time;
+    batches over PREPARED_MANY_MAX rows keep executemany(), which has not
+    been measured against a MySQL server yet.
+    """
+    seq = list(seq)
+    statements = getattr(cur, "statements", None)
+    if (statements is None or len(seq) > PREPARED_MANY_MAX
+            or sql.lstrip().upper().startswith("INSERT")):
+        cur.executemany(sql, seq)
+        return
+    for params in seq:
+        statements.execute(sql, params)
+
+def select(cur, sql, params=()):
+    """Rows of a lookup, prepared once per connection when possible."""
+    statements = getattr(cur, "statements", None)
+    if statements is None:
+        cur.execute(sql, params)
+        return cur.fetchall()
+    rows = statements.execute(sql, params).fetchall()
+    # Some connector versions hand back text columns of prepared results as bytearray
+    return [tuple(v.decode() if isinstance(v, bytearray) else v for v in row) for row in rows]
+
+# ----------------------- TABLE BROWSING -----------------------
+def _where_sql(conds):
+    return " WHERE " + " AND ".join(conds) if conds else ""
+
+def count_query(table, where=((), ())):
+    """(sql, params) counting the rows of `table` matching the search conditions."""
+    conds, params = where
+    return f"SELECT COUNT(*) FROM {table}" + _where_sql(conds), list(params)
+
+def page_query(table, key, limit, where=((), ()), after=None, before=None):
+    """(sql, params) for one keyset page of `table` ordered by `key`.
+
+    Rows with key > `after` come back ascending; rows with key < `before` come
+    back descending (callers reverse them).
+    """
+    conds, params = list(where[0]), list(where[1])
+    order = key
+    if after is not None:
+        conds.append(f"{key} > %s"); params.append(after)
+    elif before is not None:
+        conds.append(f"{key} < %s"); params.append(before)
+        order += " DESC"
+    return (f"SELECT * FROM {table}" + _where_sql(conds) + f" ORDER BY {order} LIMIT %s",
+            params + [limit])
+
+def fetch_page(cur, table, key, limit, where=((), ()), after=None, before=None):
+    """Rows of one keyset page, always in ascending key order."""
+    cur.execute(*page_query(table, key, limit, where, after, before))
+    rows = cur.fetchall()
+    return rows[::-1] if before is not None else rows
+
+# ----------------------- STORED PROCEDURES / FUNCTIONS -----------------------
+def add_student(cur, vals):
+    """sp_AddNewStudent with (Stu_ID, Name, Phone_No, Email, DOB, Gender, Clg_ID, Dept_ID)."""
+    # A plain CALL: callproc() adds SET/SELECT round trips for the arguments
+    cur.execute("CALL sp_AddNewStudent(%s, %s, %s, %s, %s, %s, %s, %s)", tuple(vals))
+
+def students_by_department(cur, dept_name):
+    """(Name, Email) rows from sp_GetStudentsByDepartment."""
+    cur.callproc("sp_GetStudentsByDepartment", (dept_name,))
+    result = []
+    for r in cur.stored_results():
+        result.extend(r.fetchall())
+    return result
+
+def student_count_by_college(cur, clg_id):
+    res = select(cur, "SELECT fn_GetStudentCountByCollege_(%s)", (clg_id,))
+    return res[0][0] if res else 0
+
+def department_hod(cur, dept_input):
+    """(Dept_Name, HOD) for a Dept_ID or Dept_Name; HOD is None when unknown."""
+    # Translate Dept_ID → Dept_Name if necessary
+    row = select(cur, "SELECT Dept_Name FROM Department WHERE Dept_ID = %s", (dept_input,))
+    dept_name = row[0][0] if row else dept_input
+    hod = select(cur, "SELECT fn_GetDepartmenttHOD(%s)", (dept_name,))
+    return dept_name, hod[0][0] if hod else None
+
+def current_term(cur):
+    """fn_CurrentTerm(): the academic term new enrollments belong to (None if there are no terms)."""
+    res = select(cur, "SELECT fn_CurrentTerm()")
+    return res[0][0] if res else None
+
+# ----------------------- CHANGE TRACKING -----------------------
+# change_log is filled by triggers (see college_migrations); its id is a
+# version number shared by every tracked table. op is I, U or D for one row,
+# or R (row_key 0) when college_backup.restore replaced the whole table.
+CHANGE_BATCH = 500   # changes merged per poll; more than this means a full reload
+
+class StaleEditError(Exception):
+    """The row was changed by another client after it was loaded for editing."""
+
+def change_log_head(cur):
+    """Id of the newest change_log entry (0 when empty)."""
+    cur.execute("SELECT COALESCE(MAX(id), 0) FROM change_log")
+    return cur.fetchone()[0]
+
+def changes_since(cur, table, since, limit=CHANGE_BATCH):
+    """[(id, row_key, op)] for `table` after change id `since`, oldest first."""
+    cur.execute("SELECT id, row_key, op FROM change_log WHERE table_name = %s AND id > %s "
+                "ORDER BY id LIMIT %s", (table, since, limit))
+    return cur.fetchall()
+
+def fetch_rows(cur, table, key, keys, where=((), ())):
+    """Current rows for the given primary keys that still match the search conditions."""
+    keys = list(keys)
+    if not keys:
+        return []
+    conds = [f"{key} IN ({', '.join(['%s'] * len(keys))})"] + list(where[0])
+    cur.execute(f"SELECT * FROM {table}" + _where_sql(conds), keys + list(where[1]))
+    return cur.fetchall()
+
+def check_not_stale(cur, table, key, value, seen, client):
+    """Lock the row and raise StaleEditError if another client changed it after change id `seen`.
+
+    Call inside the transaction that writes the row: the FOR UPDATE lock
+    keeps anyone else from changing it between this check and the commit.
+    """
+    if not select(cur, f"SELECT {key} FROM {table} WHERE {key} = %s FOR UPDATE", (value,)):
+        raise StaleEditError(f"{table} {value} does not exist (it may have been deleted by another user).")
+    if select(cur, "SELECT 1 FROM change_log WHERE table_name = %s AND (row_key = %s OR op = 'R') "
+                   "AND id > %s AND NOT (client <=> %s) LIMIT 1", (table, value, seen, client)):
+        raise StaleEditError(f"{table} {value} was changed by another user after you loaded it.\n"
+                             "The row has been reloaded; re-apply your edit if it is still needed.")
+
+def prune_change_log(cur, days):
+    """Drop change_log entries older than `days`; returns the number removed."""
+    cur.execute("DELETE FROM change_log WHERE changed_at < NOW() - INTERVAL %s DAY", (days,))
+    return cur.rowcount
@@ -0,0 +1,282 @@
+# college_store.py — column-oriented client-side store for the rows a tab has loaded
+from array import array
+from bisect import bisect_left
+from datetime import date, datetime
+from decimal import Decimal
+
+_NUMBER = (int, float, Decimal)
+
+def _text(row):
+    """Lower-cased text of a whole row, as matched by the quick filter."""
+    return "\x1f".join("" if v is None else str(v) for v in row).casefold()
+
+class _Reversed:
+    """Wraps a sort value so that it compares the other way round."""
+
+    __slots__ = ("v",)
+
+    def __init__(self, v):
+        self.v = v
+
+    def __lt__(self, other):
+        return other.v < self.v
+
+    def __eq__(self, other):
+        return self.v == other.v
+
+class RowStore:
+    """Rows held column by column, always in primary-key (first column) order.
+
+    The store holds a contiguous key range of a result set: pages are added
+    at either end (extend/prepend) and dropped from either end (keep).
+    Integer columns are packed into array('q') while every value fits; other
+    columns are plain lists. Sort orders are computed once per column and
+    reused until rows are added or removed; the lower-cased text used by
+    view() is kept up to date row by row.
+    """
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        self.clear()
+
+    def clear(self):
+        self._cols = [array("q") for _ in self.columns]
+        self._orders = {}    # column index → ascending row order, dropped when the rows change
+        self._texts = None   # [row text] for view(), built on first use
+
+    def __len__(self):
+        return len(self._cols[0])
+
+    def _changed(self):
+        self._orders.clear()
+
+    @staticmethod
+    def _fits(values):
+        return all(type(v) is int and -2 ** 63 <= v < 2 ** 63 for v in values)
+
+    def _unpack(self, i):
+        # Fall back to a list once a value is not a 64-bit int (None, text, ...)
+        if isinstance(self._cols[i], array):
+            self._cols[i] = list(self._cols[i])
+
+    def _pack_check(self, rows):
+        for i, values in enumerate(zip(*rows)):
+            if isinstance(self._cols[i], array) and not self._fits(values):
+                self._unpack(i)
+
+    # ----- reads -----
+    def row(self, i):
+        return tuple(col[i] for col in self._cols)
+
+    def rows(self, indices):
+        cols = self._cols
+        return [tuple(col[i] for col in cols) for i in indices]
+
+    def first_key(self):
+        return self._cols[0][0] if len(self) else None
+
+    def last_key(self):
+        return self._cols[0][-1] if len(self) else None
+
+    def find(self, key):
+        """Position of `key`, or None."""
+        keys = self._cols[0]
+        i = bisect_left(keys, key)
+        return i if i < len(keys) and keys[i] == key else None
+
+    def get(self, key):
+        """The row for `key`, or None."""
+        pos = self.find(key)
+        return None if pos is None else self.row(pos)
+
+    # ----- writes -----
+    def extend(self, rows):
+        """Append rows whose keys all sort after the current last key (a server page)."""
+        if not rows:
+            return
+        self._pack_check(rows)
+        for col, values in zip(self._cols, zip(*rows)):
+            col.extend(values)
+        if self._texts is not None:
+            self._texts.extend(_text(r) for r in rows)
+        self._changed()
+
+    def prepend(self, rows):
+        """Insert rows whose keys all sort before the current first key (a server page)."""
+        if not rows:
+            return
+        self._pack_check(rows)
+        for i, values in enumerate(zip(*rows)):
+            col = self._cols[i]
+            self._cols[i] = (array("q", values) if isinstance(col, array) else list(values)) + col
+        if self._texts is not None:
+            self._texts[:0] = [_text(r) for r in rows]
+        self._changed()
+
+    def keep(self, start, stop):
+        """Drop every row outside positions start..stop-1."""
+        for i, col in enumerate(self._cols):
+            self._cols[i] = col[start:stop]
+        if self._texts is not None:
+            self._texts = self._texts[start:stop]
+        self._changed()
+
+    def upsert(self, row):
+        """Insert or replace `row`, keeping key order; returns the row it replaced, or None."""
+        pos = self.find(row[0])
+        self._pack_check([row])
+        if pos is None:
+            pos = bisect_left(self._cols[0], row[0])
+            for col, v in zip(self._cols, row):
+                col.insert(pos, v)
+            if self._texts is not None:
+                self._texts.insert(pos, _text(row))
+            self._changed()
+            return None
+        old = self.row(pos)
+        for col, v in zip(self._cols, row):
+            col[pos] = v
+        if self._texts is not None:
+            self._texts[pos] = _text(row)
+        # Same positions, but the row may now sort elsewhere in other columns
+        self._changed()
+        return old
+
+    def remove(self, key):
+        """Remove the row for `key`; returns it, or None if it was not loaded."""
+        pos = self.find(key)
+        if pos is None:
+            return None
+        old = self.row(pos)
+        for col in self._cols:
+            del col[pos]
+        if self._texts is not None:
+            del self._texts[pos]
+        self._changed()
+        return old
+
+    # ----- sort / filter -----
+    def _kind(self, i):
+        """How column i sorts: natural order for numbers and for dates of one type,
+        case-insensitive text for anything else."""
+        kinds = {type(v) for v in self._cols[i] if v is not None}
+        if kinds and all(issubclass(k, _NUMBER) for k in kinds):
+            return "number"
+        if len(kinds) == 1 and issubclass(next(iter(kinds)), (date, datetime)):
+            return "date"
+        return "text"
+
+    @staticmethod
+    def _value_key(kind):
+        """Sort value for one column value of `kind`; NULLs become (True, placeholder)
+        so they sort after every value and are never compared with one."""
+        if kind == "text":
+            return lambda v: (True, "") if v is None else (False, str(v).casefold())
+        null = (True, 0 if kind == "number" else date.min)
+        return lambda v: null if v is None else (False, v)
+
+    def sort_key(self, column=None, descending=False):
+        """Key function on whole rows giving the order view() uses: `column`
+        ascending or descending, NULLs last either way, ties in key order."""
+        if column is None:
+            return lambda row: row[0]
+        i = self.columns.index(column)
+        value = self._value_key(self._kind(i))
+        if descending:
+            def key(row):
+                null, v = value(row[i])
+                return null, _Reversed(v), row[0]
+            return key
+        return lambda row: (*value(row[i]), row[0])
+
+    def order(self, column):
+        """Row positions in ascending order of `column`, NULLs last, ties in key
+        order (cached until rows change)."""
+        i = self.columns.index(column)
+        cached = self._orders.get(i)
+        if cached is not None:
+            return cached
+        col = self._cols[i]
+        if i == 0:
+            order = range(len(col))   # the store is kept in key order
+        else:
+            value = self._value_key(self._kind(i))
+            keys = [value(v) for v in col]
+            order = sorted(range(len(col)), key=keys.__getitem__)   # stable: ties stay in key order
+        self._orders[i] = order
+        return order
+
+    @staticmethod
+    def matches(row, text):
+        """True when any column of `row` contains `text` (already lower-cased)."""
+        return not text or text in _text(row)
+
+    def view(self, sort=None, descending=False, text=""):
+        """Keys of the rows to show, in display order: optionally sorted by column
+        `sort` (NULLs last in both directions, ties in key order) and limited to
+        rows where any column contains `text` (case-insensitive)."""
+        order = self.order(sort) if sort else range(len(self))
+        if descending and sort:
+            i = self.columns.index(sort)
+            col = self._cols[i]
+            nulls = [p for p in order if col[p] is None]
+            values = [p for p in order if col[p] is not None]
+            value = self._value_key(self._kind(i))
+            # reverse=True keeps equal values in their (key) order
+            order = sorted(values, key=lambda p: value(col[p]), reverse=True) + nulls
+        text = text.strip().casefold()
+        if text:
+            if self._texts is None:
+                self._texts = [_text(r) for r in zip(*self._cols)]
+            texts = self._texts
+            order = [p for p in order if text in texts[p]]
+        keys = self._cols[0]
+        return [keys[p] for p in order]
+
+class SortedView:
+    """The keys a tab shows, in display order, kept in step with single-row
+    changes by bisection instead of sorting and filtering the store again."""
+
+    def __init__(self, store, sort=None, descending=False, text=""):
+        self.store = store
+        self.sort = sort
+        self.descending = descending
+        self.text = text.strip().casefold()
+        self.rebuild()
+
+    def rebuild(self):
+        self.keys = self.store.view(self.sort, self.descending, self.text)
+        self._key = self.store.sort_key(self.sort, self.descending)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __getitem__(self, i):
+        return self.keys[i]
+
+    def _bisect(self, target, row_of):
+        lo, hi = 0, len(self.keys)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key(row_of(self.keys[mid])) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def update(self, key, old, new):
+        """Row `key` changed from `old` to `new` (None for an insert or a delete);
+        the store already holds `new`."""
+        get = self.store.get
+        try:
+            if old is not None and self.store.matches(old, self.text):
+                i = self._bisect(self._key(old), lambda k: old if k == key else get(k))
+                if i < len(self.keys) and self.keys[i] == key:
+                    del self.keys[i]
+                elif key in self.keys:
+                    self.keys.remove(key)
+            if new is not None and self.store.matches(new, self.text):
+                self.keys.insert(self._bisect(self._key(new), get), key)
+        except TypeError:
+            # A value of another type (e.g. text in a number column) changes how the column sorts
+            self.rebuild()
@@ -0,0 +1,144 @@
+# college_terms.py — academic terms and the Enrollment → Enrollment_History rollover
+#
+# Enrollment holds the current term (and any term not yet rolled over);
+# Enrollment_History holds closed terms. A term is closed once a later term
+# has started (fn_CurrentTerm() is later). rollover() moves closed terms in
+# batches of ROLLOVER_BATCH rows, each batch copied and deleted in its own
+# short transaction, so Enrollment stays usable while it runs.
+#
+#   python college_terms.py status
+#   python college_terms.py add 2027-1 2027-01-01 2027-06-30
+#   python college_terms.py rollover
+import argparse, re, sys, time
+from college_db import DB_CONFIG, ConnectionPool
+import college_queries as q
+
+ROLLOVER_BATCH = 5000
+TERM_PATTERN = re.compile(r"^\d{4}-\d$")   # 'YYYY-S', so codes sort in term order
+
+def terms(cur):
+    """[(Term, Starts, Ends, rows in Enrollment, rows in Enrollment_History)], oldest first."""
+    cur.execute("""
+        SELECT t.Term, t.Starts, t.Ends,
+               (SELECT COUNT(*) FROM Enrollment e WHERE e.Term = t.Term),
+               (SELECT COUNT(*) FROM Enrollment_History h WHERE h.Term = t.Term)
+        FROM academic_term t ORDER BY t.Term
+    """)
+    return cur.fetchall()
+
+def add_term(cur, term, starts, ends):
+    """Add (or correct the dates of) a term; raises ValueError for a malformed code."""
+    if not TERM_PATTERN.match(term or ""):
+        raise ValueError(f"Term '{term}' is not of the form YYYY-S, e.g. 2027-1")
+    if str(starts) > str(ends):
+        raise ValueError(f"Term {term} ends before it starts")
+    q.execute(cur, "INSERT INTO academic_term (Term, Starts, Ends) VALUES (%s, %s, %s) "
+                   "ON DUPLICATE KEY UPDATE Starts = VALUES(Starts), Ends = VALUES(Ends)",
+              (term, starts, ends))
+
+def closed_terms(cur):
+    """Terms before the current one that still have rows in Enrollment."""
+    current = q.current_term(cur)
+    if current is None:
+        return []
+    cur.execute("SELECT DISTINCT Term FROM Enrollment WHERE Term < %s ORDER BY Term", (current,))
+    return [r[0] for r in cur.fetchall()]
+
+_UP_TO = "Term = %s AND (Stu_ID < %s OR (Stu_ID = %s AND Course_ID <= %s))"
+
+def rollover(conn, batch=ROLLOVER_BATCH, progress=None, cancel=None, log=print):
+    """Move every closed term from Enrollment to Enrollment_History; returns {term: rows moved}.
+
+    Each batch is the next `batch` keys of the term in (Stu_ID, Course_ID)
+    order, read from idx_enrollment_term; it is copied and deleted in one
+    transaction, so a cancelled or failed run leaves every row in exactly one
+    of the two tables and can simply be run again. `progress(moved, total)`
+    is called after every batch.
+    """
+    cur = conn.cursor(buffered=True)
+    moved = {}
+    try:
+        closed = closed_terms(cur)
+        if not closed:
+            return moved
+        cur.execute(f"SELECT COUNT(*) FROM Enrollment WHERE Term IN ({', '.join(['%s'] * len(closed))})",
+                    tuple(closed))
+        total = cur.fetchone()[0]
+        done = 0
+        conn.commit()
+        for term in closed:
+            moved[term] = 0
+            t = time.perf_counter()
+            while not (cancel and cancel()):
+                cur.execute("SELECT Stu_ID, Course_ID FROM Enrollment WHERE Term = %s "
+                            "ORDER BY Stu_ID, Course_ID LIMIT %s", (term, batch))
+                keys = cur.fetchall()
+                if not keys:
+                    break
+                stu, course = keys[-1]
+                params = (term, stu, stu, course)
+                try:
+                    cur.execute("INSERT INTO Enrollment_History (Stu_ID, Course_ID, Grade, Term) "
+                                f"SELECT Stu_ID, Course_ID, Grade, Term FROM Enrollment WHERE {_UP_TO} "
+                                "ON DUPLICATE KEY UPDATE Grade = VALUES(Grade), Archived_At = CURRENT_TIMESTAMP",
+                                params)
+                    cur.execute(f"DELETE FROM Enrollment WHERE {_UP_TO}", params)
+                    n = cur.rowcount
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
+                moved[term] += n
+                done += n
+                if progress:
+                    progress(done, total)
+            log(f"{term}: {moved[term]} row(s) archived in {time.perf_counter() - t:.1f} s")
+            if cancel and cancel():
+                break
+    finally:
+        cur.close()
+    return moved
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Academic terms and Enrollment history rollover.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("status", help="list terms with their current and archived enrollments")
+    p = sub.add_parser("add", help="add a term, or change its dates")
+    p.add_argument("term", help="YYYY-S, e.g. 2027-1")
+    p.add_argument("starts", help="YYYY-MM-DD")
+    p.add_argument("ends", help="YYYY-MM-DD")
+    p = sub.add_parser("rollover", help="move closed terms to Enrollment_History")
+    p.add_argument("--batch", type=int, default=ROLLOVER_BATCH, help="rows per transaction (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    pool = ConnectionPool(size=1, **DB_CONFIG)
+    try:
+        with pool.connection() as conn:
+            if args.command == "rollover":
+                moved = rollover(conn, batch=args.batch)
+                print(f"{sum(moved.values())} row(s) archived." if moved else "No closed terms to archive.")
+                return 0
+            cur = conn.cursor(buffered=True)
+            try:
+                if args.command == "add":
+                    try:
+                        add_term(cur, args.term, args.starts, args.ends)
+                    except ValueError as e:
+                        print(e, file=sys.stderr)
+                        return 2
+                    conn.commit()
+                    print(f"Term {args.term} saved.")
+                else:
+                    current = q.current_term(cur)
+                    print(f"{'Term':<8} {'Starts':<10} {'Ends':<10} {'Current':>9} {'Archived':>9}")
+                    for term, starts, ends, hot, archived in terms(cur):
+                        mark = " *" if term == current else ""
+                        print(f"{term:<8} {str(starts):<10} {str(ends):<10} {hot:>9} {archived:>9}{mark}")
+            finally:
+                cur.close()
+    finally:
+        pool.close_all()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
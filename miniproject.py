@@ -1,160 +1,374 @@
 # college_gui_complete_project_final.py
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import csv, os
+import csv, os, queue, re, shutil, threading, time
 import mysql.connector
 from datetime import datetime
-
-# Optional logo
-try:
-    from PIL import Image, ImageTk
-    PIL_AVAILABLE = True
-except Exception:
-    PIL_AVAILABLE = False
+from college_db import CLIENT_ID, DB_CONFIG, ConnectionPool, DBExecutor
+from college_io import export_formats, export_query, import_csv
+from college_cache import REF_FOREIGN_KEYS, RefCache, StatsCache
+from college_migrations import MigrationLocked, migrate
+import college_perf as perf
+import college_queries as q
+from college_store import RowStore, SortedView
+# college_analytics, college_backup, college_integrity and college_terms are
+# imported where they are used, when a tab or action first needs them.
+
+perf.startup.mark("imports")
 
 # ----------------------- DATABASE CONNECTION -----------------------
-try:
-    conn = mysql.connector.connect(
-        host="localhost",
-        user="root",           # Change if needed
-        password="chintu20",   # Change if needed
-        database="student_database"
-    )
-    cursor = conn.cursor()
-    print("Connected to Database:", conn.database)
-except mysql.connector.Error as e:
-    messagebox.showerror("Database Error", str(e))
-    raise SystemExit("MySQL connection failed.")
+# Connection settings live in college_db.DB_CONFIG. Nothing connects at import
+# time; connect_database() runs when the GUI starts.
+pool = ConnectionPool(**DB_CONFIG)
+
+# ----------------------- UI THREAD HAND-OFF -----------------------
+# Tk is not thread-safe: background threads queue callables here and the
+# mainloop runs them from _pump_ui().
+_ui_calls = queue.Queue()
+
+def post_ui(func, *args):
+    _ui_calls.put((func, args))
+
+def _pump_ui(widget):
+    while True:
+        try:
+            func, args = _ui_calls.get_nowait()
+        except queue.Empty:
+            break
+        try:
+            func(*args)
+        except Exception as e:
+            print("UI callback failed:", e)
+    widget.after(50, _pump_ui, widget)
+
+# All queries run on background workers; callbacks come back through post_ui
+db = DBExecutor(pool, post=post_ui)
 
 # ----------------------- DATABASE BACKUP -----------------------
-def backup_database():
-    """Creates a backup .sql file after every commit."""
-    try:
-        dump_path = os.path.join(os.getcwd(), "student_database_backup.sql")
-        # Note: -p followed immediately by password (no space)
-        cmd = f'mysqldump -u root -pchintu20 student_database > "{dump_path}"'
-        os.system(cmd)
-        print("Backup saved:", dump_path)
-    except Exception as e:
-        print("Backup failed:", e)
-
-# ----------------------- SETUP TRIGGERS / FUNCTIONS / PROCEDURES -----------------------
-def setup_sql_objects():
+BACKUP_DIR = os.getcwd()
+BACKUP_PATH = os.path.join(BACKUP_DIR, "student_database_backup")   # a college_backup dump directory
+INCREMENTAL_PREFIX = "student_database_incr_"
+BACKUP_DELAY = 5.0       # seconds of quiet after the last commit before dumping
+FULL_BACKUP_EVERY = 10   # incremental dumps between two full dumps
+
+def backup_database(tables=None):
+    """Dump the database (or only `tables`) with college_backup and return the directory.
+
+    A full dump replaces BACKUP_PATH once it is complete; a table subset goes
+    to a timestamped incremental directory next to it. Tables are dumped in
+    parallel from one consistent snapshot. A full dump supersedes every
+    incremental one, so those are removed after it.
+    """
+    if tables:
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        dump_path = os.path.join(BACKUP_DIR, f"{INCREMENTAL_PREFIX}{stamp}")
+    else:
+        dump_path = BACKUP_PATH
+    import college_backup as backup
+    backup.dump(dump_path, sorted(tables) if tables else None, log=lambda msg: None)
+    if not tables:
+        prune_incrementals()
+    return dump_path
+
+def prune_incrementals(backup_dir=None):
+    """Delete the incremental dumps older than the full dump at BACKUP_PATH; returns their names."""
+    backup_dir = backup_dir or BACKUP_DIR
+    full = os.path.join(backup_dir, os.path.basename(BACKUP_PATH))
+    if not os.path.exists(full):
+        return []
+    cutoff = os.path.getmtime(full)
+    removed = []
+    for name in sorted(os.listdir(backup_dir)):
+        path = os.path.join(backup_dir, name)
+        if name.startswith(INCREMENTAL_PREFIX) and os.path.isdir(path) and os.path.getmtime(path) <= cutoff:
+            shutil.rmtree(path, ignore_errors=True)
+            removed.append(name)
+    return removed
+
+class BackupScheduler:
+    """Debounced background backups.
+
+    Every commit calls request(table); the dump runs on a worker thread once
+    no further request has arrived for `delay` seconds, so a burst of edits
+    costs one dump. Between full dumps only the tables touched since the last
+    backup are dumped (incremental mode).
+    """
+
+    def __init__(self, delay=BACKUP_DELAY, incremental=True, full_every=FULL_BACKUP_EVERY):
+        self.delay = delay
+        self.incremental = incremental
+        self.full_every = full_every
+        self.last_success = None
+        self.last_duration = None
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)   # notified when a dump finishes
+        self._timer = None
+        self._dirty = set()
+        self._running = False
+        self._incrementals = 0
+
+    def request(self, table=None):
+        with self._lock:
+            self._dirty.add(table)
+            if self._timer:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.delay, self._run)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """Run any pending backup now, on the calling thread (used at exit).
+
+        A dump already running on the timer thread is waited for first, so
+        tables changed while it ran are still backed up before exit.
+        """
+        with self._lock:
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
+            while self._running:
+                self._idle.wait()
+            if not self._dirty:
+                return
+            tables = self._take()
+        self._dump(tables)
+
+    def _take(self):
+        """Claim the pending tables for one dump; the caller holds the lock."""
+        self._timer = None
+        tables, self._dirty = self._dirty, set()
+        self._running = True
+        return tables
+
+    def _run(self):
+        with self._lock:
+            if self._running:
+                # A dump is in progress; try again after it had time to finish
+                self._timer = threading.Timer(self.delay, self._run)
+                self._timer.daemon = True
+                self._timer.start()
+                return
+            tables = self._take()
+        self._dump(tables)
+
+    def _dump(self, tables):
+        start = time.perf_counter()
+        try:
+            full = (not self.incremental or None in tables
+                    or self._incrementals >= self.full_every or not os.path.exists(BACKUP_PATH))
+            path = backup_database(None if full else tables)
+            self._incrementals = 0 if full else self._incrementals + 1
+            self.last_success = datetime.now()
+            self.last_duration = time.perf_counter() - start
+            kind = "Full" if full else "Incremental"
+            perf.recorder.record(f"dump ({kind.lower()})", self.last_duration, 0, "backup")
+            print("Backup saved:", path)
+            post_ui(show_status, f"{kind} backup saved at {self.last_success:%H:%M:%S} "
+                                 f"({self.last_duration:.1f}s).")
+        except Exception as e:   # any failure, so the timer thread never drops the pending tables
+            print("Backup failed:", repr(e))
+            with self._lock:
+                self._dirty |= tables   # keep them for the next attempt
+            post_ui(show_status, f"Backup failed: {e}")
+        finally:
+            with self._lock:
+                self._running = False
+                self._idle.notify_all()
+
+backup_scheduler = BackupScheduler()
+
+# ----------------------- SCHEMA / SQL OBJECTS -----------------------
+# Triggers, procedures and functions are maintained by college_migrations and
+# only re-created when their definition changed, so a normal launch only reads
+# schema_migrations. Startup waits at most MIGRATION_LOCK_TIMEOUT seconds for
+# another client that is migrating, then opens with the current schema.
+# Deployments that run `python college_migrations.py` as a separate step can
+# set MIGRATE_ON_START = False.
+MIGRATE_ON_START = True
+MIGRATION_LOCK_TIMEOUT = 2
+
+def connect_database():
+    """Check the server is reachable and bring the schema up to date before the GUI opens."""
     try:
-        # Trigger: Professor email lowercase
-        cursor.execute("DROP TRIGGER IF EXISTS trg_student_Insert_Lowercase_Email;")
-        cursor.execute("""
-        CREATE TRIGGER trg_student_Insert_Lowercase_Email
-        BEFORE INSERT ON Professor
-        FOR EACH ROW
-        BEGIN
-            SET NEW.Email = LOWER(NEW.Email);
-        END;
-        """)
-
-        # Trigger: Student DOB validation (student must be at least 18)
-        cursor.execute("DROP TRIGGER IF EXISTS trg_Before_Student_Insert_Validate_DOB;")
-        cursor.execute("""
-        CREATE TRIGGER trg_Before_Student_Insert_Validate_DOB
-        BEFORE INSERT ON Student
-        FOR EACH ROW
-        BEGIN
-            IF NEW.DOB > DATE_SUB(CURDATE(), INTERVAL 18 YEAR) THEN
-                SIGNAL SQLSTATE '45000'
-                SET MESSAGE_TEXT = 'Invalid DOB: Student must be at least 18 years old.';
-            END IF;
-        END;
-        """)
-
-        # Procedure: Add New Student (includes Dept_ID)
-        cursor.execute("DROP PROCEDURE IF EXISTS sp_AddNewStudent;")
-        cursor.execute("""
-        CREATE PROCEDURE sp_AddNewStudent(
-            IN p_Stu_ID INT,
-            IN p_Name VARCHAR(255),
-            IN p_Phone VARCHAR(20),
-            IN p_Email VARCHAR(255),
-            IN p_DOB DATE,
-            IN p_Gender VARCHAR(10),
-            IN p_Clg_ID INT,
-            IN p_Dept_ID INT
-        )
-        BEGIN
-            INSERT INTO Student (Stu_ID, Name, Phone_No, Email, DOB, Gender, Clg_ID, Dept_ID)
-            VALUES (p_Stu_ID, p_Name, p_Phone, p_Email, p_DOB, p_Gender, p_Clg_ID, p_Dept_ID);
-        END;
-        """)
-
-        # Procedure: Get Students by Department (direct lookup using Student + Department)
-        cursor.execute("DROP PROCEDURE IF EXISTS sp_GetStudentsByDepartment;")
-        cursor.execute("""
-        CREATE PROCEDURE sp_GetStudentsByDepartment(IN p_Dept_Name VARCHAR(255))
-        BEGIN
-            SELECT s.Name, s.Email
-            FROM Student s
-            JOIN Department d ON s.Dept_ID = d.Dept_ID
-            WHERE d.Dept_Name = p_Dept_Name;
-        END;
-        """)
-
-        # Function: Get Department HOD
-        cursor.execute("DROP FUNCTION IF EXISTS fn_GetDepartmenttHOD;")
-        cursor.execute("""
-        CREATE FUNCTION fn_GetDepartmenttHOD(p_Dept_Name VARCHAR(255))
-        RETURNS VARCHAR(255)
-        READS SQL DATA
-        BEGIN
-            DECLARE v_HOD_Name VARCHAR(255);
-            SELECT HOD INTO v_HOD_Name FROM Department WHERE Dept_Name = p_Dept_Name;
-            RETURN v_HOD_Name;
-        END;
-        """)
-
-        # Function: Get Student Count by College
-        cursor.execute("DROP FUNCTION IF EXISTS fn_GetStudentCountByCollege_;")
-        cursor.execute("""
-        CREATE FUNCTION fn_GetStudentCountByCollege_(p_Clg_ID INT)
-        RETURNS INT
-        READS SQL DATA
-        BEGIN
-            DECLARE v_Student_Count INT;
-            SELECT COUNT(*) INTO v_Student_Count FROM Student WHERE Clg_ID = p_Clg_ID;
-            RETURN v_Student_Count;
-        END;
-        """)
-
-        conn.commit()
-        print("All Triggers, Procedures, and Functions created/updated.")
+        probe = pool.acquire()
+        print("Connected to Database:", probe.database)
+        pool.release(probe)
     except mysql.connector.Error as e:
-        print("SQL Object Creation Error:", e)
-
-# Try to create SQL objects (safe to run even if some referenced tables don't exist yet)
-try:
-    setup_sql_objects()
-except Exception as ex:
-    print("Could not complete SQL object setup (some tables might not exist yet):", ex)
+        messagebox.showerror("Database Error", str(e))
+        raise SystemExit("MySQL connection failed.")
+    perf.startup.mark("connect")
+    if MIGRATE_ON_START:
+        try:
+            db.run(lambda cur: migrate(cur, lock_timeout=MIGRATION_LOCK_TIMEOUT))
+        except MigrationLocked:
+            messagebox.showwarning("Schema upgrade", "Another client is upgrading the database schema right now.\n"
+                                                     "The app opens with the current schema; restart it once "
+                                                     "the upgrade has finished to use new features.")
+        except Exception as ex:
+            print("Could not complete schema migration (some tables might not exist yet):", ex)
+        perf.startup.mark("migrations check")
+    try:
+        db.run(lambda cur: q.prune_change_log(cur, CHANGE_LOG_RETENTION_DAYS))
+    except Exception as ex:
+        print("Could not prune change_log:", ex)
+
+# ----------------------- TABS -----------------------
+# Tabs are built, and their first page loaded, when first selected. With
+# PREFETCH_NEXT_TAB the next table tab is then built in the background too.
+PREFETCH_NEXT_TAB = True
+PREFETCH_DELAY_MS = 1500
+
+# ----------------------- MULTI-CLIENT SYNC -----------------------
+# The visible tab polls change_log and merges rows other clients changed;
+# updates are refused if the row changed after it was loaded for editing.
+SYNC_INTERVAL_MS = 5000        # 0 = only on Refresh
+CHANGE_LOG_RETENTION_DAYS = 7  # older change_log entries are pruned at launch
+
+# ----------------------- PAGING -----------------------
+PAGE_SIZE = 200        # rows fetched per keyset page
+MAX_TREE_ROWS = 600    # rows rendered in a Treeview at once (a window over the loaded rows)
+# Sorting or quick-filtering loads the rest of the result set into the
+# tab's RowStore first, when it has at most this many rows; larger results
+# are sorted/filtered over the rows loaded so far.
+STORE_MAX_ROWS = 100000
+STORE_FETCH_SIZE = 5000   # rows per query while loading the rest
+# In key order a tab keeps at most this many loaded rows around the rendered
+# window; pages farther away are dropped and fetched again when scrolled to.
+STORE_KEEP_ROWS = 5 * MAX_TREE_ROWS
+QUICK_FILTER_DELAY_MS = 150
+
+# ----------------------- DASHBOARD STATS -----------------------
+stats_cache = StatsCache()
+STATS_AUTO_REFRESH_MS = 0   # e.g. 30000 to re-read the Home counts every 30 s; 0 = off
+
+# ----------------------- REFERENCE DATA -----------------------
+# College/Department/Course kept in memory for HOD and name lookups, FK
+# checks before writes, and the Clg_ID/Dept_ID autocomplete lists
+ref_cache = RefCache()
+
+# ----------------------- SEARCH -----------------------
+SEARCH_DELAY_MS = 300   # pause in typing before the search query is sent
+# Name columns with a FULLTEXT index (see college_migrations); multi-word
+# searches on them use MATCH ... AGAINST instead of a prefix LIKE
+FULLTEXT_COLUMNS = {("Student", "Name"), ("Professor", "Name")}
+
+def search_mode(table, column, key):
+    """How the search bar filters `column`: exact match, prefix, or None (not searchable)."""
+    if column == key or column in ("Dept_ID", "Clg_ID"):
+        return "exact"
+    if column == "Email" or column.endswith("Name"):
+        return "fulltext" if (table, column) in FULLTEXT_COLUMNS else "prefix"
+    return None
+
+def build_search_where(table, values):
+    """Turn {column: (mode, text)} into ([conditions], [params]) for a WHERE clause.
+
+    Every condition is index-friendly: `=` on keys, `LIKE 'text%'` on the
+    (prefix-)indexed name/email columns, MATCH on FULLTEXT columns.
+    """
+    conds, params = [], []
+    for column, (mode, text) in values.items():
+        text = text.strip()
+        if not text:
+            continue
+        words = text.split()
+        if mode == "exact":
+            conds.append(f"{column} = %s"); params.append(text)
+        elif mode == "fulltext" and len(words) > 1:
+            cleaned = [re.sub(r'[+\-<>()~*"@]', "", w) for w in words]
+            query = " ".join(f"+{w}*" for w in cleaned if w)
+            if query:
+                conds.append(f"MATCH({column}) AGAINST (%s IN BOOLEAN MODE)"); params.append(query)
+        else:
+            escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            conds.append(f"{column} LIKE %s"); params.append(escaped + "%")
+    return conds, params
 
 # ----------------------- UTILITIES -----------------------
+def load_logo(path="college_logo.png", size=(140, 140)):
+    """Logo as a PhotoImage, or None without Pillow or the file.
+
+    Pillow is imported here rather than at module load; it is only needed
+    for this one image.
+    """
+    try:
+        from PIL import Image, ImageTk
+        return ImageTk.PhotoImage(Image.open(path).convert("RGBA").resize(size))
+    except Exception:
+        return None
+
 def show_status(msg):
     try:
         status_var.set(msg)
     except:
         pass
 
-def export_tree_to_csv(tree, filename_prefix):
-    rows = [tree.item(i)["values"] for i in tree.get_children()]
-    if not rows:
-        messagebox.showinfo("Export", "No data to export.")
-        return
+def table_committed(table):
+    """Called after every successful commit to `table` from the GUI."""
+    backup_scheduler.request(table)
+    stats_cache.invalidate(table)
+    ref_cache.invalidate(table)
+
+def progress_popup(parent, title, text, maximum=None, cancellable=True):
+    """Small window with a progress bar and a Cancel button for background jobs.
+
+    Returns (popup, bar, label, stop); `stop` is set when the user cancels.
+    Without `maximum` the bar just shows activity.
+    """
+    popup = tk.Toplevel(parent)
+    popup.title(title)
+    popup.geometry("380x130")
+    label = ttk.Label(popup, text=text)
+    label.pack(anchor="w", padx=12, pady=(12, 4))
+    bar = ttk.Progressbar(popup, length=350, maximum=maximum or 100,
+                          mode="determinate" if maximum else "indeterminate")
+    bar.pack(padx=12, pady=4)
+    if not maximum:
+        bar.start(15)
+    stop = threading.Event()
+    if cancellable:
+        ttk.Button(popup, text="Cancel", command=stop.set).pack(pady=6)
+    return popup, bar, label, stop
+
+def export_query_dialog(parent, sql, params, filename_prefix, total=None):
+    """Stream a query straight from the server into a CSV/CSV.gz/Parquet/Arrow file.
+
+    Rows never pass through a Treeview, so the whole table (or procedure
+    result) is exported regardless of what is loaded on screen.
+    """
     file = filedialog.asksaveasfilename(defaultextension=".csv",
                                         initialfile=f"{filename_prefix}.csv",
-                                        filetypes=[("CSV files", "*.csv")])
-    if file:
-        with open(file, "w", newline="", encoding="utf-8") as f:
-            w = csv.writer(f)
-            w.writerow([tree.heading(c)["text"] for c in tree["columns"]])
-            w.writerows(rows)
-        messagebox.showinfo("Export", f"Exported to {file}")
+                                        filetypes=export_formats())
+    if not file:
+        return
+    popup, bar, label, stop = progress_popup(parent, "Export", os.path.basename(file), total)
+
+    def progress(n):
+        post_ui(label.configure, {"text": f"{os.path.basename(file)}: {n} rows written"})
+        if total:
+            post_ui(bar.configure, {"value": n})
+
+    def finish(n):
+        popup.destroy()
+        if stop.is_set():
+            messagebox.showinfo("Export", "Export cancelled.")
+        else:
+            messagebox.showinfo("Export", f"Exported {n} rows to {file}")
+
+    def failed(e):
+        popup.destroy()
+        messagebox.showerror("Export", f"Export failed: {e}")
+
+    def run():
+        try:
+            with perf.action(f"Export {filename_prefix}"), pool.connection() as c:
+                n = export_query(c, sql, params, file, progress, stop.is_set)
+        except Exception as e:
+            post_ui(failed, e)
+        else:
+            post_ui(finish, n)
+
+    threading.Thread(target=run, daemon=True).start()
 
 # ----------------------- TABLE FRAME CLASS -----------------------
 class TableFrame(ttk.Frame):
@@ -166,6 +380,36 @@ class TableFrame(ttk.Frame):
         self.update_q = update_q
         self.delete_q = delete_q
         self.sp_add = sp_add
+        # Loaded rows live in a column store in primary-key order (the first
+        # column is the key of every tab); the tree shows MAX_TREE_ROWS of the
+        # current sorted/filtered view, from position self._win. Tree item
+        # ids are str(primary key).
+        self.key = columns[0]
+        self.store = RowStore(columns)
+        self._view = SortedView(self.store)   # keys in display order
+        self._win = 0
+        self._shown = {}           # iid → primary key, for the rendered rows
+        self._sort = None          # column sorted on, or None for key order
+        self._desc = False
+        self._quick = ""           # in-memory quick filter text
+        self._quick_after = None
+        self._more_before = False  # the server has rows before store.first_key()
+        self._more_after = False   # the server has rows after store.last_key()
+        self._loading = False
+        self._total = 0
+        self._page_key = f"{table}:page"   # newer page loads supersede older ones
+        self._where = ([], [])   # search bar conditions and their parameters
+        self._search_after = None
+        # Batch mode: str(primary key) → (op, key, values) waiting for Apply;
+        # op is "insert", "update" or "delete"
+        self.pending = {}
+        self._pending_base = {}   # str(key) → change id when the key was first staged
+        self.batch_mode = tk.BooleanVar(value=False)
+        # Change tracking: newest change_log id merged into the tree, and the
+        # one current when each row was picked for editing (str(key) → id)
+        self._seen = 0
+        self._edit_base = {}
+        self._sync_key = f"{table}:sync"
 
         ttk.Label(self, text=f"{table} Management", font=("Segoe UI", 14, "bold")).pack(anchor="w", padx=12, pady=(8,0))
         form = ttk.LabelFrame(self, text="Fields")
@@ -174,7 +418,14 @@ class TableFrame(ttk.Frame):
         for c in columns:
             row = ttk.Frame(form); row.pack(fill="x", pady=2)
             ttk.Label(row, text=c, width=18).pack(side="left")
-            e = ttk.Entry(row); e.pack(side="left", fill="x", expand=True)
+            if c in REF_FOREIGN_KEYS and c != self.key:
+                # Foreign key: pick from the cached referenced table
+                e = ttk.Combobox(row)
+                e.configure(postcommand=lambda e=e, c=c: self._fill_choices(e, c))
+                e.bind("<<ComboboxSelected>>", lambda _, e=e: self._pick_choice(e))
+            else:
+                e = ttk.Entry(row)
+            e.pack(side="left", fill="x", expand=True)
             self.entries[c] = e
 
         btns = ttk.Frame(self); btns.pack(fill="x", padx=12, pady=6)
@@ -182,103 +433,991 @@ class TableFrame(ttk.Frame):
         ttk.Button(btns, text="Update", command=self.update_record).pack(side="left", padx=4)
         ttk.Button(btns, text="Delete", command=self.delete_record).pack(side="left", padx=4)
         ttk.Button(btns, text="Refresh", command=self.fetch_data).pack(side="left", padx=4)
+        ttk.Button(btns, text="Import CSV", command=self.import_csv).pack(side="left", padx=4)
+        ttk.Button(btns, text="Export", command=self.export_table).pack(side="left", padx=4)
+        ttk.Button(btns, text="Restore", command=self.restore_table).pack(side="left", padx=4)
         if extra_buttons:
             for name, func in extra_buttons:
                 ttk.Button(btns, text=name, command=func).pack(side="left", padx=4)
+        ttk.Checkbutton(btns, text="Batch mode", variable=self.batch_mode,
+                        command=self._toggle_batch).pack(side="left", padx=(16, 4))
+        self.apply_btn = ttk.Button(btns, text="Apply", command=self.apply_batch, state="disabled")
+        self.discard_btn = ttk.Button(btns, text="Discard", command=self.discard_batch, state="disabled")
+
+        # Search bar: typed values become parameterized WHERE conditions
+        search = ttk.LabelFrame(self, text="Search")
+        search.pack(fill="x", padx=12, pady=(0, 6))
+        self.filters = {}
+        for c in columns:
+            mode = search_mode(table, c, self.key)
+            if not mode:
+                continue
+            ttk.Label(search, text=c).pack(side="left", padx=(6, 2))
+            e = ttk.Entry(search, width=14); e.pack(side="left", padx=(0, 6), pady=4)
+            e.bind("<KeyRelease>", self._schedule_search)
+            self.filters[c] = (mode, e)
+        ttk.Button(search, text="Clear", command=self.clear_search).pack(side="left", padx=4)
+        # Quick filter: matches any column of the loaded rows, no query
+        ttk.Label(search, text="Quick filter").pack(side="left", padx=(16, 2))
+        self.quick_entry = ttk.Entry(search, width=16)
+        self.quick_entry.pack(side="left", padx=(0, 6), pady=4)
+        self.quick_entry.bind("<KeyRelease>", self._schedule_quick_filter)
+
+        # Staged changes, shown only in batch mode
+        self.pending_box = ttk.LabelFrame(self, text="Pending changes")
+        self.pending_tree = ttk.Treeview(self.pending_box, columns=["Change"] + columns,
+                                         show="headings", height=4)
+        for c in ["Change"] + columns:
+            self.pending_tree.heading(c, text=c)
+            self.pending_tree.column(c, width=100, anchor="center")
+        self.pending_tree.pack(fill="x", padx=4, pady=4)
 
         frame = ttk.Frame(self); frame.pack(fill="both", expand=True)
+        self._tree_frame = frame
         self.tree = ttk.Treeview(frame, columns=columns, show="headings")
         self.tree.pack(side="left", fill="both", expand=True)
-        scroll = ttk.Scrollbar(frame, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scroll.set)
-        scroll.pack(side="right", fill="y")
+        self.scroll = ttk.Scrollbar(frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self._on_yscroll)
+        self.scroll.pack(side="right", fill="y")
         for c in columns:
-            self.tree.heading(c, text=c)
+            self.tree.heading(c, text=c, command=lambda c=c: self.sort_by(c))
             self.tree.column(c, width=140, anchor="center")
+        self.tree.tag_configure("pending_update", background="#fff3b0")
+        self.tree.tag_configure("pending_delete", background="#f6c6c6", foreground="#777777")
 
         self.tree.bind("<ButtonRelease-1>", self.on_row_select)
         self.fetch_data()
+        if SYNC_INTERVAL_MS:
+            self.after(SYNC_INTERVAL_MS, self._sync)
 
     def fetch_data(self):
-        try:
-            cursor.execute(f"SELECT * FROM {self.table}")
-            rows = cursor.fetchall()
-        except mysql.connector.Error as e:
-            rows = []
-            print(f"Error fetching {self.table}: {e}")
-        for r in self.tree.get_children(): self.tree.delete(r)
-        for row in rows: self.tree.insert("", "end", values=row)
-        show_status(f"{self.table}: {len(rows)} records loaded.")
+        """Reset the view to the first page and refresh the total row count."""
+        self._loading = True
+        where = self._where
+        def work(cur):
+            # Head first: a change landing while the page is read is merged again, never missed
+            head = q.change_log_head(cur)
+            cur.execute(*q.count_query(self.table, where))
+            total = cur.fetchone()[0]
+            return total, self._fetch_page(cur, where), head
+        db.cancel(self._sync_key)
+        db.submit(work, self._on_first_page, self._on_load_error, key=self._page_key,
+                  name=f"{self.table}: load")
+
+    def _schedule_search(self, _=None):
+        # Debounce: query only once typing pauses for SEARCH_DELAY_MS
+        if self._search_after:
+            self.after_cancel(self._search_after)
+        self._search_after = self.after(SEARCH_DELAY_MS, self._apply_search)
+
+    def _apply_search(self):
+        self._search_after = None
+        where = build_search_where(self.table, {c: (mode, e.get()) for c, (mode, e) in self.filters.items()})
+        if where == self._where:
+            return
+        self._where = where
+        # Supersedes (and kills, if running) the previous search's query
+        self.fetch_data()
+
+    def clear_search(self):
+        for _, e in self.filters.values():
+            e.delete(0, "end")
+        self._apply_search()
+
+    def _on_first_page(self, result):
+        self._total, rows, self._seen = result
+        self.store.clear()
+        self.store.extend(rows)
+        self._more_before = False
+        self._more_after = len(rows) == PAGE_SIZE
+        self._win = 0
+        self._loading = False
+
+        def show():
+            # Every row was read again, so no rendered item can be kept
+            self.tree.delete(*self._shown)
+            self._shown = {}
+            self._refresh_view()
+        if self._sort or self._quick:
+            self._load_all(show)
+        else:
+            show()
+
+    def _on_load_error(self, e):
+        self._loading = False
+        print(f"Error fetching {self.table}: {e}")
+        show_status(f"{self.table}: load failed.")
+
+    def _fetch_page(self, cur, where, after=None, before=None, size=PAGE_SIZE):
+        """One keyset page: rows with key > after or key < before, in key order."""
+        return q.fetch_page(cur, self.table, self.key, size, where, after, before)
+
+    # ----- rendering the loaded rows -----
+    def _refresh_view(self):
+        """Recompute the sorted/filtered view and re-render the tree window."""
+        self._view = SortedView(self.store, self._sort, self._desc, self._quick)
+        self._trim()
+        self._render()
+
+    def _trim(self):
+        """In key order, keep at most STORE_KEEP_ROWS loaded rows around the window;
+        pages dropped here are fetched again when scrolled back to."""
+        n = len(self.store)
+        if self._sort or self._quick or n <= STORE_KEEP_ROWS:
+            return
+        # Unsorted and unfiltered, view positions are store positions
+        lo = max(0, min(self._win - (STORE_KEEP_ROWS - MAX_TREE_ROWS) // 2, n - STORE_KEEP_ROWS))
+        hi = lo + STORE_KEEP_ROWS
+        self._more_before = self._more_before or lo > 0
+        self._more_after = self._more_after or hi < n
+        self.store.keep(lo, hi)
+        self._win -= lo
+        self._view.rebuild()
+
+    def _render(self, changed=()):
+        """Bring the tree in line with the window of the view.
+
+        Only items that enter, leave or move within the window, and the rows
+        in `changed` (iids whose values changed), are touched.
+        """
+        self._win = max(0, min(self._win, len(self._view) - MAX_TREE_ROWS))
+        keys = self._view[self._win:self._win + MAX_TREE_ROWS]
+        wanted = {str(k) for k in keys}
+        gone = [iid for iid in self._shown if iid not in wanted]
+        if gone:
+            self.tree.delete(*gone)
+            for iid in gone:
+                del self._shown[iid]
+        children = list(self.tree.get_children())
+        if changed:
+            # A changed row that now follows a different row is detached and
+            # put back at its new index below; every other item stays put
+            order = [str(k) for k in keys]
+            before, after = self._predecessors(children), self._predecessors(order)
+            for iid in changed:
+                if iid in before and iid in after and before[iid] != after[iid]:
+                    children.remove(iid)
+                    self.tree.detach(iid)
+        for i, key in enumerate(keys):
+            iid = str(key)
+            if iid not in self._shown:
+                self.tree.insert("", i, iid=iid, values=self.store.get(key))
+                self._shown[iid] = key
+                children.insert(i, iid)
+                self._mark_pending(iid)
+                continue
+            if i >= len(children) or children[i] != iid:
+                if iid in children:
+                    children.remove(iid)
+                    self.tree.detach(iid)
+                self.tree.move(iid, "", i)
+                children.insert(i, iid)
+            if iid in changed:
+                self.tree.item(iid, values=self.store.get(key))
+                self._mark_pending(iid)
+        self._show_window_status()
+
+    def _predecessors(self, iids):
+        """iid → the rendered item before it in `iids` (None for the first)."""
+        out, prev = {}, None
+        for iid in iids:
+            if iid in self._shown:
+                out[iid] = prev
+                prev = iid
+        return out
+
+    def _shift(self, delta):
+        """Move the rendered window by `delta` rows, keeping the row at the edge in view."""
+        children = self.tree.get_children()
+        anchor = children[-1 if delta >= 0 else 0] if children else None
+        self._win = max(0, min(self._win + delta, len(self._view) - MAX_TREE_ROWS))
+        self._render()
+        if anchor and self.tree.exists(anchor):
+            self.tree.see(anchor)
+
+    def _on_yscroll(self, first, last):
+        self.scroll.set(first, last)
+        if self._loading or not self._view:
+            return
+        # Sorted or filtered views cannot drop pages, so they stop growing at STORE_MAX_ROWS
+        can_grow = not (self._sort or self._quick) or len(self.store) < STORE_MAX_ROWS
+        if float(last) >= 1.0:
+            if self._win + MAX_TREE_ROWS < len(self._view):
+                self._shift(PAGE_SIZE)
+            elif self._more_after and can_grow:
+                self._loading = True
+                after, where = self.store.last_key(), self._where
+                db.submit(lambda cur: self._fetch_page(cur, where, after=after),
+                          self._on_next_page, self._on_load_error, key=self._page_key,
+                          name=f"{self.table}: next page")
+        elif float(first) <= 0.0:
+            if self._win > 0:
+                self._shift(-PAGE_SIZE)
+            elif self._more_before and can_grow:
+                self._loading = True
+                before, where = self.store.first_key(), self._where
+                db.submit(lambda cur: self._fetch_page(cur, where, before=before),
+                          self._on_prev_page, self._on_load_error, key=self._page_key,
+                          name=f"{self.table}: previous page")
+
+    def _on_next_page(self, rows):
+        self._loading = False
+        self._more_after = len(rows) == PAGE_SIZE
+        if not rows:
+            return
+        self.store.extend(rows)
+        self._view.rebuild()
+        self._trim()
+        self._shift(PAGE_SIZE if len(self._view) > self._win + MAX_TREE_ROWS else 0)
+
+    def _on_prev_page(self, rows):
+        self._loading = False
+        self._more_before = len(rows) == PAGE_SIZE
+        if not rows:
+            return
+        self.store.prepend(rows)
+        self._view.rebuild()
+        if not (self._sort or self._quick):
+            self._win += len(rows)   # same rows as before; they moved down in the view
+        self._trim()
+        self._shift(-PAGE_SIZE)
+
+    def _show_window_status(self):
+        shown = len(self.tree.get_children())
+        msg = f"{self.table}: {len(self.store)} of {self._total} records loaded"
+        if self._quick:
+            msg += f", {len(self._view)} match the quick filter"
+        if self._sort:
+            msg += f", sorted by {self._sort}{' (desc)' if self._desc else ''}"
+        if shown:
+            msg += f"; showing {self._win + 1}-{self._win + shown}"
+        show_status(msg + ".")
+
+    # ----- in-memory sort and filter -----
+    def sort_by(self, column):
+        """Header click: sort the loaded rows by `column`; a second click reverses."""
+        if self._sort == column:
+            self._desc = not self._desc
+        else:
+            self._sort, self._desc = column, False
+        for c in self.columns:
+            arrow = (" ▼" if self._desc else " ▲") if c == column else ""
+            self.tree.heading(c, text=c + arrow)
+        self._win = 0
+        self._load_all(self._refresh_view)
+
+    def _schedule_quick_filter(self, _=None):
+        if self._quick_after:
+            self.after_cancel(self._quick_after)
+        self._quick_after = self.after(QUICK_FILTER_DELAY_MS, self._apply_quick_filter)
+
+    def _apply_quick_filter(self):
+        self._quick_after = None
+        text = self.quick_entry.get()
+        if text == self._quick:
+            return
+        self._quick, self._win = text, 0
+        self._load_all(self._refresh_view)
+
+    def _load_all(self, then):
+        """Fetch the rest of the result set into the store (if it fits), then call `then`."""
+        if not (self._more_after or self._more_before) or self._total > STORE_MAX_ROWS or self._loading:
+            then()
+            return
+        self._loading = True
+        # Pages dropped from the front are read again with the rest
+        restart = self._more_before
+        after, where = None if restart else self.store.last_key(), self._where
+        show_status(f"{self.table}: loading the remaining {self._total - len(self.store)} rows...")
+        def work(cur):
+            rows, last = [], after
+            while True:
+                page = self._fetch_page(cur, where, after=last, size=STORE_FETCH_SIZE)
+                rows.extend(page)
+                if len(page) < STORE_FETCH_SIZE:
+                    return rows
+                last = page[-1][0]
+        def done(rows):
+            self._loading = False
+            self._more_before = self._more_after = False
+            if restart:
+                self.store.clear()
+            self.store.extend(rows)
+            then()
+        db.submit(work, done, self._on_load_error, key=self._page_key, name=f"{self.table}: load all")
+
+    def _selected_row(self):
+        """Store row for the focused tree item, or None."""
+        key = self._shown.get(self.tree.focus())
+        return None if key is None else self.store.get(key)
+
+    # ----- single-row patches -----
+    def refresh_row(self, key, added=False):
+        """Re-read one row by primary key and patch it into the store and tree."""
+        conds, params = self._where
+        def work(cur):
+            rows = q.select(cur, f"SELECT * FROM {self.table} WHERE {self.key} = %s"
+                            + "".join(f" AND {c}" for c in conds), [key] + list(params))
+            return rows[0] if rows else None
+        db.submit(work, lambda row: self._apply_row(key, row, added), self._on_load_error,
+                  name=f"{self.table}: refresh row", readonly=True)
+
+    @staticmethod
+    def _key_value(key):
+        # Keys typed into the form or read from change_log arrive as text
+        return int(key) if isinstance(key, str) and key.lstrip("-").isdigit() else key
+
+    def _apply_row(self, key, row, added=False, render=True):
+        """Insert, update or remove the row for `key`; `row` is None when the
+        row is gone (or no longer matches the search bar).
+
+        The store and the view are patched in place and, with `render`, only
+        that row's tree item is touched (plus whatever it pushes in or out of
+        the window).
+        """
+        key = self._key_value(key)
+        old = new = None
+        if row is None:
+            old = self.store.remove(key)
+            if old is not None:
+                self._total -= 1
+        else:
+            first, last = self.store.first_key(), self.store.last_key()
+            # Rows outside the loaded key range arrive with their page
+            outside = ((self._more_after and last is not None and row[0] > last)
+                       or (self._more_before and first is not None and row[0] < first))
+            if not outside:
+                old, new = self.store.upsert(row), row
+            if added:
+                self._total += 1
+        if old is not None or new is not None:
+            self._view.update(key, old, new)
+        if render:
+            self._render(changed={str(key)})
+
+    # ----- multi-client sync -----
+    def _sync(self):
+        """Poll change_log and merge rows changed since the last merge (visible tab only)."""
+        self.after(SYNC_INTERVAL_MS, self._sync)
+        if self._loading or not self.winfo_ismapped():
+            return
+        seen, where = self._seen, self._where
+        def work(cur):
+            changes = q.changes_since(cur, self.table, seen)
+            if len(changes) >= q.CHANGE_BATCH or any(op == "R" for _, _, op in changes):
+                return seen, None, None   # too many to merge row by row, or the table was restored
+            ops = {key: op for _, key, op in changes}
+            last = changes[-1][0] if changes else seen
+            return last, ops, q.fetch_rows(cur, self.table, self.key, ops, where)
+        db.submit(work, lambda r: self._merge_changes(seen, *r), self._on_load_error,
+                  key=self._sync_key, name=f"{self.table}: sync")
+
+    def _merge_changes(self, base, last, ops, rows):
+        if base != self._seen or self._loading:
+            return   # a reload or another merge happened meanwhile
+        if ops is None:
+            self.fetch_data()
+            return
+        if not ops:
+            return
+        found = {row[0]: row for row in rows}
+        changed = set()
+        for key, op in ops.items():
+            key = self._key_value(key)
+            added = op == "I" and self.store.find(key) is None
+            self._apply_row(key, found.get(key), added=added, render=False)
+            changed.add(str(key))
+        self._render(changed)
+        self._seen = last
+        # Other clients' writes make the cached counts and lookups stale too
+        stats_cache.invalidate(self.table)
+        ref_cache.invalidate(self.table)
+        show_status(f"{self.table}: {len(ops)} row(s) changed by other users merged.")
+
+    def _base_for(self, key):
+        return self._edit_base.get(str(key), self._seen)
+
+    def _fill_choices(self, combo, column):
+        """Drop-down list for a foreign-key field, filtered by what is typed so far."""
+        refs = ref_cache.peek()
+        if refs is not None:
+            combo["values"] = refs.choices(REF_FOREIGN_KEYS[column], combo.get())
+        if not ref_cache.is_fresh():
+            # Reload in the background; the list updates on the next open
+            db.submit(ref_cache.get, lambda refs: combo.configure(
+                values=refs.choices(REF_FOREIGN_KEYS[column], combo.get())),
+                key="refs", name="Reference data")
+
+    @staticmethod
+    def _pick_choice(combo):
+        # "3 - Computer Science" → "3"
+        combo.set(combo.get().split(" - ", 1)[0])
+
+    def _foreign_keys(self, vals):
+        return {c: v for c, v in zip(self.columns, vals) if c in REF_FOREIGN_KEYS and c != self.key}
+
+    def _write(self, work, title, message, key, added=False):
+        """Run a write on the DB worker; on success schedule a backup and patch the row."""
+        def done(_):
+            table_committed(self.table)
+            self.refresh_row(key, added)
+            messagebox.showinfo(title, message)
+        def failed(e):
+            if isinstance(e, q.StaleEditError):
+                self.refresh_row(key)   # show what the other user saved
+            messagebox.showerror("Error", str(e))
+        db.submit(work, done, failed, name=f"{self.table}: {title}")
+
+    # ----- batch mode -----
+    def _toggle_batch(self):
+        if self.batch_mode.get():
+            self.pending_box.pack(fill="x", padx=12, pady=(0, 6), before=self._tree_frame)
+            self.apply_btn.pack(side="left", padx=4)
+            self.discard_btn.pack(side="left", padx=4)
+        elif self.pending:
+            messagebox.showwarning("Batch mode", "Apply or discard the pending changes first.")
+            self.batch_mode.set(True)
+        else:
+            self.pending_box.pack_forget()
+            self.apply_btn.pack_forget()
+            self.discard_btn.pack_forget()
+
+    def _stage(self, op, key, vals=None):
+        """Record a change for the next Apply, folding it into any change already staged for `key`."""
+        iid = str(key)
+        prev = self.pending.get(iid, (None,))[0]
+        if prev is None:
+            self._pending_base[iid] = self._base_for(key)
+        if op == "delete" and prev == "insert":
+            del self.pending[iid]          # never reached the database
+            del self._pending_base[iid]
+        else:
+            if op == "update" and prev == "insert":
+                op = "insert"
+            elif op == "insert" and prev == "delete":
+                op = "update"              # delete + re-add of the same key
+            self.pending[iid] = (op, key, vals)
+        self._mark_pending(iid)
+        self._show_pending()
+
+    def _mark_pending(self, iid):
+        """Highlight a loaded row that has a staged update or delete."""
+        if not self.tree.exists(iid):
+            return
+        op, _, vals = self.pending.get(iid, (None, None, None))
+        if op == "update":
+            self.tree.item(iid, values=vals, tags=("pending_update",))
+        elif op == "delete":
+            self.tree.item(iid, tags=("pending_delete",))
+        else:
+            self.tree.item(iid, tags=())
+
+    def _show_pending(self):
+        self.pending_tree.delete(*self.pending_tree.get_children())
+        for op, key, vals in self.pending.values():
+            self.pending_tree.insert("", "end", values=[op] + list(vals or [key]))
+        state = "normal" if self.pending else "disabled"
+        self.apply_btn.configure(state=state)
+        self.discard_btn.configure(state=state)
+        self.pending_box.configure(text=f"Pending changes ({len(self.pending)})")
+
+    def apply_batch(self):
+        """Send every staged change in one transaction: all of them are applied or none."""
+        changes = list(self.pending.values())
+        if not changes or not messagebox.askyesno(
+                "Apply", f"Apply {len(changes)} pending change(s) to {self.table}?"):
+            return
+        deletes = [(key,) for op, key, _ in changes if op == "delete"]
+        updates = [tuple(vals[1:] + vals[:1]) for op, _, vals in changes if op == "update"]
+        inserts = [vals for op, _, vals in changes if op == "insert"]
+        bases = dict(self._pending_base)
+
+        def work(cur):
+            for op, key, vals in changes:
+                if op != "insert":
+                    q.check_not_stale(cur, self.table, self.key, key, bases[str(key)], CLIENT_ID)
+                if vals:
+                    ref_cache.check_foreign_keys(cur, self._foreign_keys(vals))
+            # Deletes first so re-used unique values are free again
+            if deletes:
+                q.execute_many(cur, self.delete_q, deletes)
+            if updates:
+                q.execute_many(cur, self.update_q, updates)
+            if inserts:
+                if self.sp_add and self.table == "Student":
+                    for vals in inserts:
+                        q.add_student(cur, vals)
+                else:
+                    q.execute_many(cur, self.insert_q, inserts)
+
+        def done(_):
+            self.pending.clear()
+            self._pending_base.clear()
+            self._show_pending()
+            table_committed(self.table)   # one backup request for the whole batch
+            self.fetch_data()
+            messagebox.showinfo("Applied", f"{len(changes)} change(s) committed to {self.table}.")
+
+        def failed(e):
+            messagebox.showerror("Batch rolled back", f"No changes were applied:\n{e}")
 
+        db.submit(work, done, failed, name=f"{self.table}: Apply batch")
+
+    def discard_batch(self):
+        if self.pending and not messagebox.askyesno(
+                "Discard", f"Discard {len(self.pending)} pending change(s)?"):
+            return
+        self.pending.clear()
+        self._pending_base.clear()
+        self._show_pending()
+        self.fetch_data()   # restore the rows shown with staged values
+
+    # ----- single-row writes (staged instead in batch mode) -----
     def add_record(self):
         vals = tuple(e.get() or None for e in self.entries.values())
-        try:
+        if self.batch_mode.get():
+            self._stage("insert", vals[0], vals)
+            return
+        def work(cur):
+            # Checked against the cache first so a bad ID never reaches the server
+            ref_cache.check_foreign_keys(cur, self._foreign_keys(vals))
             if self.sp_add and self.table == "Student":
                 # Call stored procedure with the exact parameter order:
                 # (Stu_ID, Name, Phone_No, Email, DOB, Gender, Clg_ID, Dept_ID)
-                cursor.callproc("sp_AddNewStudent", vals)
+                q.add_student(cur, vals)
             else:
-                cursor.execute(self.insert_q, vals)
-            conn.commit(); backup_database()
-            self.fetch_data()
-            messagebox.showinfo("Success", f"Record added to {self.table}.")
-        except mysql.connector.Error as e:
-            messagebox.showerror("Error", str(e))
-        except Exception as ex:
-            messagebox.showerror("Error", str(ex))
+                q.execute(cur, self.insert_q, vals)
+        self._write(work, "Success", f"Record added to {self.table}.", vals[0], added=True)
 
     def update_record(self):
         vals = [e.get() for e in self.entries.values()]
         # For update queries we expect queries to be written in the form that moves the key to the end.
         # Example update_q: "UPDATE Student SET Name=%s,... WHERE Stu_ID=%s"
+        if self.batch_mode.get():
+            self._stage("update", vals[0], vals)
+            return
         params = tuple(vals[1:] + vals[:1])
-        try:
-            cursor.execute(self.update_q, params)
-            conn.commit(); backup_database()
-            self.fetch_data()
-            messagebox.showinfo("Updated", f"{self.table} record updated.")
-        except mysql.connector.Error as e:
-            messagebox.showerror("Error", str(e))
+        base = self._base_for(vals[0])
+        def work(cur):
+            # Optimistic concurrency: refuse to overwrite someone else's newer edit
+            q.check_not_stale(cur, self.table, self.key, vals[0], base, CLIENT_ID)
+            ref_cache.check_foreign_keys(cur, self._foreign_keys(vals))
+            q.execute(cur, self.update_q, params)
+        self._write(work, "Updated", f"{self.table} record updated.", vals[0])
 
     def delete_record(self):
         sel = self.tree.focus()
         if not sel: return
-        key = self.tree.item(sel)["values"][0]
+        row = self._selected_row()
+        if row is None: return
+        key = row[0]
+        if self.batch_mode.get():
+            self._stage("delete", key)
+            return
         if not messagebox.askyesno("Confirm", f"Delete {self.table} ID {key}?"):
             return
+        def done(_):
+            table_committed(self.table)
+            self._apply_row(key, None)
+            messagebox.showinfo("Deleted", f"{self.table} record deleted.")
+        db.submit(lambda cur: q.execute(cur, self.delete_q, (key,)), done,
+                  lambda e: messagebox.showerror("Error", str(e)), name=f"{self.table}: Deleted")
+
+    def export_table(self):
+        """Export the whole table, or only the rows matching the search bar."""
+        conds, params = self._where
+        sql = f"SELECT * FROM {self.table}"
+        if conds:
+            sql += " WHERE " + " AND ".join(conds)
+        export_query_dialog(self, sql + f" ORDER BY {self.key}", tuple(params),
+                            f"{self.table}_{datetime.now().strftime('%Y%m%d')}", total=self._total)
+
+    def import_csv(self):
+        """Bulk-load a CSV file into this table on a background thread."""
+        path = filedialog.askopenfilename(title=f"Import {self.table}",
+                                          filetypes=[("CSV files", "*.csv"), ("All files", "*.*")])
+        if not path:
+            return
+        popup, bar, _, stop = progress_popup(self, f"Importing into {self.table}",
+                                             os.path.basename(path), maximum=100)
+
+        def finish(result):
+            popup.destroy()
+            if result.inserted:
+                table_committed(self.table)
+                self.fetch_data()
+            msg = f"{result.inserted} rows imported into {self.table}."
+            if result.cancelled:
+                msg += "\nImport cancelled."
+            if result.rejected:
+                msg += f"\n{result.rejected} rows rejected, see:\n{result.reject_path}"
+            if result.flagged:
+                msg += f"\n{result.flagged} rows imported with data-quality findings, see:\n{result.flag_path}"
+            messagebox.showinfo("Import CSV", msg)
+
+        def failed(e):
+            popup.destroy()
+            messagebox.showerror("Import CSV", f"Import stopped: {e}")
+
+        def run():
+            try:
+                with perf.action(f"{self.table}: Import CSV"), pool.connection() as c:
+                    result = import_csv(c, self.table, self.columns, path,
+                                        progress=lambda f: post_ui(bar.configure, {"value": f * 100}),
+                                        cancel=stop.is_set)
+            except Exception as e:
+                post_ui(failed, e)
+            else:
+                post_ui(finish, result)
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def restore_table(self):
+        """Replace this table's rows with those of a college_backup dump."""
+        import college_backup as backup
+        if self.pending:
+            messagebox.showwarning("Restore", "Apply or discard the pending changes first.")
+            return
+        path = filedialog.askdirectory(title=f"Restore {self.table} from dump", initialdir=BACKUP_DIR)
+        if not path:
+            return
         try:
-            cursor.execute(self.delete_q, (key,))
-            conn.commit(); backup_database()
+            manifest = backup.load_manifest(path)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Restore", f"Not a dump directory: {e}")
+            return
+        entry = manifest["tables"].get(self.table)
+        if entry is None:
+            messagebox.showerror("Restore", f"The dump has no {self.table} table.")
+            return
+        if not messagebox.askyesno("Restore", f"Replace all {self._total} rows of {self.table} with the "
+                                              f"{entry['rows']} rows dumped at {manifest['created']}?"):
+            return
+        popup, bar, _, _ = progress_popup(self, f"Restoring {self.table}", os.path.basename(path),
+                                          maximum=100, cancellable=False)
+
+        def finish(loaded):
+            popup.destroy()
+            table_committed(self.table)
             self.fetch_data()
-            messagebox.showinfo("Deleted", f"{self.table} record deleted.")
-        except mysql.connector.Error as e:
-            messagebox.showerror("Error", str(e))
+            messagebox.showinfo("Restore", f"{loaded[self.table]} rows restored into {self.table}.\n"
+                                           "Run the Integrity checks if other tables refer to it.")
+
+        def failed(e):
+            popup.destroy()
+            self.fetch_data()
+            messagebox.showerror("Restore", f"Restore failed: {e}")
+
+        def run():
+            try:
+                with perf.action(f"{self.table}: Restore"):
+                    loaded = backup.restore(path, [self.table], log=lambda msg: None,
+                                            progress=lambda f: post_ui(bar.configure, {"value": f * 100}))
+            except Exception as e:
+                post_ui(failed, e)
+            else:
+                post_ui(finish, loaded)
+
+        threading.Thread(target=run, daemon=True).start()
 
     def on_row_select(self, _):
         sel = self.tree.focus()
         if not sel: return
-        vals = self.tree.item(sel)["values"]
-        for i, c in enumerate(self.columns):
+        row = self._selected_row()
+        if row is None: return
+        pending = self.pending.get(sel)
+        if pending and pending[0] == "update":
+            row = pending[2]   # show the staged values, as the tree does
+        self._edit_base[sel] = self._seen
+        for c, v in zip(self.columns, row):
             self.entries[c].delete(0, "end")
-            # If row shorter than columns (because SELECT * returns), guard it
+            self.entries[c].insert(0, "" if v is None else v)
+
+# ----------------------- LAZY TABS -----------------------
+class LazyTab(ttk.Frame):
+    """Notebook page whose content is built by `build(parent)` on first use."""
+
+    def __init__(self, notebook, title, build):
+        super().__init__(notebook)
+        self.title = title
+        self._build = build
+        self.content = None
+        notebook.add(self, text=title)
+
+    def ensure_built(self):
+        if self.content is None:
+            t = time.perf_counter()
+            self.content = self._build(self)
+            self.content.pack(fill="both", expand=True)
+            perf.startup.record(f"{self.title} tab built", time.perf_counter() - t)
+        return self.content
+
+# ----------------------- PERFORMANCE TAB -----------------------
+class PerformanceFrame(ttk.Frame):
+    """Per-statement timings collected by college_perf, slowest total first."""
+
+    COLUMNS = ("Statement", "Calls", "Total ms", "Avg ms", "p95 ms", "Max ms", "Rows", "Last action")
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        ttk.Label(self, text="Query Performance", font=("Segoe UI", 14, "bold")).pack(anchor="w", padx=12, pady=(8,0))
+        ttk.Label(self, text=f"Statements slower than {perf.SLOW_QUERY_MS} ms are also written to {perf.SLOW_LOG_PATH}"
+                  ).pack(anchor="w", padx=12)
+
+        btns = ttk.Frame(self); btns.pack(fill="x", padx=12, pady=6)
+        ttk.Button(btns, text="Refresh", command=self.refresh).pack(side="left", padx=4)
+        ttk.Button(btns, text="Reset", command=self.reset).pack(side="left", padx=4)
+        ttk.Button(btns, text="Export JSON", command=self.export_json).pack(side="left", padx=4)
+        ttk.Button(btns, text="Startup times", command=self.show_startup).pack(side="left", padx=4)
+
+        frame = ttk.Frame(self); frame.pack(fill="both", expand=True)
+        self.tree = ttk.Treeview(frame, columns=self.COLUMNS, show="headings")
+        self.tree.pack(side="left", fill="both", expand=True)
+        scroll = ttk.Scrollbar(frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scroll.set)
+        scroll.pack(side="right", fill="y")
+        for c in self.COLUMNS:
+            self.tree.heading(c, text=c)
+            self.tree.column(c, width=80, anchor="center")
+        self.tree.column("Statement", width=460, anchor="w")
+        self.tree.column("Last action", width=160, anchor="w")
+        self.refresh()
+
+    def refresh(self):
+        for r in self.tree.get_children(): self.tree.delete(r)
+        for st in perf.recorder.snapshot():
+            self.tree.insert("", "end", values=(st["sql"], st["calls"], st["total_ms"], st["avg_ms"],
+                                                st["p95_ms"], st["max_ms"], st["rows"], st["action"] or ""))
+
+    def reset(self):
+        perf.recorder.reset()
+        self.refresh()
+
+    def show_startup(self):
+        messagebox.showinfo("Startup times", perf.startup.report())
+
+    def export_json(self):
+        file = filedialog.asksaveasfilename(defaultextension=".json",
+                                            initialfile=f"perf_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+                                            filetypes=[("JSON files", "*.json")])
+        if file:
+            perf.recorder.export_json(file)
+            messagebox.showinfo("Export", f"Exported to {file}")
+
+# ----------------------- ANALYTICS TAB -----------------------
+ANALYTICS_MAX_ROWS = 5000   # rows shown in the grid; Export CSV always writes the full report
+
+class AnalyticsFrame(ttk.Frame):
+    """Grade reports from college_analytics, computed on a background thread."""
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        import college_analytics as analytics   # loaded with the tab (numpy is loaded on first report)
+        self.columns, self.rows = [], []
+        ttk.Label(self, text="Enrollment Analytics", font=("Segoe UI", 14, "bold")).pack(anchor="w", padx=12, pady=(8,0))
+        engine = "numpy" if analytics.NUMPY_AVAILABLE else "pure Python (install numpy for large data)"
+        ttk.Label(self, text=f"Enrollment joined with Course, grouped with {engine}; "
+                             "current term only unless Include history is ticked").pack(anchor="w", padx=12)
+
+        btns = ttk.Frame(self); btns.pack(fill="x", padx=12, pady=6)
+        self.report = ttk.Combobox(btns, values=list(analytics.REPORTS), state="readonly", width=22)
+        self.report.current(0)
+        self.report.pack(side="left", padx=4)
+        ttk.Button(btns, text="Run", command=self.run).pack(side="left", padx=4)
+        ttk.Button(btns, text="Export CSV", command=self.export_csv).pack(side="left", padx=4)
+        ttk.Button(btns, text="Update summary tables", command=self.update_summaries).pack(side="left", padx=4)
+        self.include_history = tk.BooleanVar(value=False)
+        ttk.Checkbutton(btns, text="Include history", variable=self.include_history).pack(side="left", padx=4)
+        ttk.Button(btns, text="Roll over closed terms", command=self.rollover).pack(side="left", padx=4)
+
+        frame = ttk.Frame(self); frame.pack(fill="both", expand=True)
+        self.tree = ttk.Treeview(frame, show="headings")
+        self.tree.pack(side="left", fill="both", expand=True)
+        scroll = ttk.Scrollbar(frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scroll.set)
+        scroll.pack(side="right", fill="y")
+
+    def _background(self, name, work, done):
+        """Run `work(conn)` on its own thread and connection, then `done(result)` on the UI thread."""
+        def run():
             try:
-                self.entries[c].insert(0, vals[i])
-            except Exception:
-                self.entries[c].insert(0, "")
+                with perf.action(f"Analytics: {name}"), pool.connection() as c:
+                    result = work(c)
+            except Exception as e:
+                post_ui(messagebox.showerror, "Analytics", f"{name} failed: {e}")
+            else:
+                post_ui(done, result)
+        show_status(f"Analytics: {name}...")
+        threading.Thread(target=run, daemon=True).start()
+
+    def run(self):
+        import college_analytics as analytics
+        name = self.report.get()
+        history = self.include_history.get()
+        label = f"{name} (all terms)" if history else name
+        self._background(label, lambda c: analytics.run_report(c, name, include_history=history),
+                         lambda r: self._show(label, *r))
+
+    def _show(self, name, columns, rows):
+        self.columns, self.rows = columns, rows
+        self.tree.delete(*self.tree.get_children())
+        self.tree.configure(columns=columns)
+        for c in columns:
+            self.tree.heading(c, text=c)
+            self.tree.column(c, width=70 if len(columns) > 8 else 120, anchor="center")
+        for row in rows[:ANALYTICS_MAX_ROWS]:
+            self.tree.insert("", "end", values=["" if v is None else v for v in row])
+        shown = f"first {ANALYTICS_MAX_ROWS} of " if len(rows) > ANALYTICS_MAX_ROWS else ""
+        show_status(f"Analytics: {name}, showing {shown}{len(rows)} rows.")
+
+    def export_csv(self):
+        if not self.rows:
+            messagebox.showinfo("Export", "Run a report first.")
+            return
+        name = self.report.get().lower().replace(" ", "_")
+        file = filedialog.asksaveasfilename(defaultextension=".csv",
+                                            initialfile=f"{name}_{datetime.now().strftime('%Y%m%d')}.csv",
+                                            filetypes=[("CSV files", "*.csv")])
+        if file:
+            with open(file, "w", newline="", encoding="utf-8") as f:
+                w = csv.writer(f)
+                w.writerow(self.columns)
+                w.writerows(self.rows)
+            messagebox.showinfo("Export", f"Exported {len(self.rows)} rows to {file}")
+
+    def update_summaries(self):
+        import college_analytics as analytics
+        def done(changed):
+            show_status("Analytics: summary tables up to date.")
+            messagebox.showinfo("Summary tables", "\n".join(f"{t}: {n} rows changed" for t, n in changed.items()))
+        self._background("Update summary tables", analytics.refresh_summaries, done)
+
+    def rollover(self):
+        import college_terms
+        if not messagebox.askyesno("Roll over", "Move the enrollments of every closed term to "
+                                                "Enrollment_History?\nReports then show them only with "
+                                                "'Include history'."):
+            return
+        popup, bar, label, stop = progress_popup(self, "Rolling over terms", "Archiving closed terms...",
+                                                 maximum=100)
+
+        def progress(done, total):
+            post_ui(bar.configure, {"value": done * 100 / total if total else 100})
+            post_ui(label.configure, {"text": f"{done} of {total} enrollments archived"})
+
+        def finish(moved):
+            popup.destroy()
+            if moved:
+                table_committed("Enrollment")
+                table_committed("Enrollment_History")
+            note = " (cancelled)" if stop.is_set() else ""
+            show_status(f"Analytics: {sum(moved.values())} enrollments archived{note}.")
+            messagebox.showinfo("Roll over", "\n".join(f"{t}: {n} enrollments archived" for t, n in moved.items())
+                                or "No closed terms to archive.")
+
+        def run():
+            try:
+                with perf.action("Analytics: Roll over terms"), pool.connection() as c:
+                    moved = college_terms.rollover(c, progress=progress, cancel=stop.is_set, log=lambda msg: None)
+            except Exception as e:
+                post_ui(popup.destroy)
+                post_ui(messagebox.showerror, "Roll over", f"Roll over failed: {e}")
+            else:
+                post_ui(finish, moved)
+
+        threading.Thread(target=run, daemon=True).start()
+
+# ----------------------- INTEGRITY TAB -----------------------
+class IntegrityFrame(ttk.Frame):
+    """Set-based integrity and data-quality checks from college_integrity."""
+
+    COLUMNS = ("Check", "Table", "Rows", "Examples", "Fix", "ms")
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.findings = []
+        ttk.Label(self, text="Data Integrity", font=("Segoe UI", 14, "bold")).pack(anchor="w", padx=12, pady=(8,0))
+        ttk.Label(self, text="Orphaned foreign keys, underage students, e-mail and phone number problems"
+                  ).pack(anchor="w", padx=12)
+
+        btns = ttk.Frame(self); btns.pack(fill="x", padx=12, pady=6)
+        ttk.Button(btns, text="Run checks", command=self.run).pack(side="left", padx=4)
+        ttk.Button(btns, text="Save fix-up script", command=self.save_script).pack(side="left", padx=4)
+
+        frame = ttk.Frame(self); frame.pack(fill="both", expand=True)
+        self.tree = ttk.Treeview(frame, columns=self.COLUMNS, show="headings")
+        self.tree.pack(side="left", fill="both", expand=True)
+        scroll = ttk.Scrollbar(frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scroll.set)
+        scroll.pack(side="right", fill="y")
+        for c in self.COLUMNS:
+            self.tree.heading(c, text=c)
+            self.tree.column(c, width=80, anchor="center")
+        self.tree.column("Check", width=260, anchor="w")
+        self.tree.column("Examples", width=320, anchor="w")
+        self.tree.tag_configure("problem", background="#f6c6c6")
+
+    def run(self):
+        import college_integrity as integrity
+        def work():
+            try:
+                with perf.action("Integrity: Run checks"):
+                    findings = integrity.run_checks(pool)
+            except Exception as e:
+                post_ui(messagebox.showerror, "Integrity", f"Checks failed: {e}")
+            else:
+                post_ui(self._show, findings)
+        show_status("Integrity: running checks...")
+        threading.Thread(target=work, daemon=True).start()
+
+    def _show(self, findings):
+        self.findings = findings
+        self.tree.delete(*self.tree.get_children())
+        for f in findings:
+            rows = f"error: {f.error}" if f.error else f.count
+            fix = "automatic" if f.check.fix else "review"
+            self.tree.insert("", "end", values=(f.check.name, f.check.table, rows,
+                                                ", ".join(map(str, f.sample)), fix if f.count else "",
+                                                round(f.seconds * 1000, 1)),
+                             tags=("problem",) if f.count or f.error else ())
+        bad = sum(1 for f in findings if f.count)
+        show_status(f"Integrity: {len(findings)} checks, {bad} with problems.")
+
+    def save_script(self):
+        import college_integrity as integrity
+        if not any(f.count for f in self.findings):
+            messagebox.showinfo("Integrity", "Run the checks first; there is nothing to fix.")
+            return
+        file = filedialog.asksaveasfilename(defaultextension=".sql",
+                                            initialfile=f"integrity_fix_{datetime.now().strftime('%Y%m%d')}.sql",
+                                            filetypes=[("SQL files", "*.sql")])
+        if file:
+            with open(file, "w", encoding="utf-8") as f:
+                f.write(integrity.fix_script(self.findings))
+            messagebox.showinfo("Integrity", f"Fix-up script written to {file}")
 
 # ----------------------- SPECIAL BUTTON FUNCTIONS -----------------------
 def get_student_count():
-    clg = college_tab.entries["Clg_ID"].get()
+    clg = college_tab.ensure_built().entries["Clg_ID"].get()
     if not clg:
         messagebox.showwarning("Input Required", "Enter College ID first.")
         return
-    try:
-        cursor.execute("SELECT fn_GetStudentCountByCollege_(%s)", (clg,))
-        res = cursor.fetchone()
-        total = res[0] if res else 0
-        messagebox.showinfo("Student Count", f"Total Students: {total}")
-    except mysql.connector.Error as e:
-        messagebox.showerror("DB Error", f"Error while fetching count: {e}")
+
+    def work(cur):
+        # Unknown colleges are answered from the reference cache without calling the function
+        if not ref_cache.get(cur).exists("College", clg):
+            return None
+        return q.student_count_by_college(cur, clg)
+
+    def show(total):
+        if total is None:
+            messagebox.showinfo("Student Count", f"No college with ID '{clg}'.")
+        else:
+            messagebox.showinfo("Student Count", f"Total Students: {total}")
+
+    db.submit(work, show,
+              lambda e: messagebox.showerror("DB Error", f"Error while fetching count: {e}"),
+              name="Student count", readonly=True)
 
 def get_students_by_dept():
     """
@@ -287,18 +1426,12 @@ def get_students_by_dept():
     - Calls stored procedure sp_GetStudentsByDepartment (created at startup)
     - Presents Name + Email in popup and allows CSV export
     """
-    dept = dept_tab.entries["Dept_Name"].get().strip()
+    dept = dept_tab.ensure_built().entries["Dept_Name"].get().strip()
     if not dept:
         messagebox.showwarning("Input Required", "Enter Department Name first.")
         return
 
-    try:
-        # Call stored procedure
-        cursor.callproc("sp_GetStudentsByDepartment", (dept,))
-        result = []
-        for r in cursor.stored_results():
-            result.extend(r.fetchall())
-
+    def show(result):
         if not result:
             messagebox.showinfo("No Results", f"No students found for '{dept}'.")
             return
@@ -320,28 +1453,34 @@ def get_students_by_dept():
 
         ttk.Button(
             popup,
-            text="Export CSV",
-            command=lambda: export_tree_to_csv(tv, f"students_{dept}_{datetime.now().strftime('%Y%m%d')}")
+            text="Export",
+            command=lambda: export_query_dialog(popup, "CALL sp_GetStudentsByDepartment(%s)", (dept,),
+                                                f"students_{dept}_{datetime.now().strftime('%Y%m%d')}",
+                                                total=len(result))
         ).pack(pady=6)
-    except mysql.connector.Error as e:
-        messagebox.showerror("DB Error", f"Error while fetching students: {e}")
+
+    def work(cur):
+        # Skip the procedure call for department names that do not exist
+        if ref_cache.get(cur).key("Department", dept) is None:
+            return []
+        return q.students_by_department(cur, dept)
+
+    # Call stored procedure
+    db.submit(work, show,
+              lambda e: messagebox.showerror("DB Error", f"Error while fetching students: {e}"),
+              name="Students by department", readonly=True)
 
 def get_hod():
-    dept_input = course_tab.entries["Dept_ID"].get().strip()
+    dept_input = course_tab.ensure_built().entries["Dept_ID"].get().strip()
     if not dept_input:
         messagebox.showwarning("Input Required", "Enter Department ID or Name.")
         return
-    try:
-        # Translate Dept_ID → Dept_Name if necessary
-        cursor.execute("SELECT Dept_Name FROM Department WHERE Dept_ID = %s", (dept_input,))
-        row = cursor.fetchone()
-        dept_name = row[0] if row else dept_input
-        cursor.execute("SELECT fn_GetDepartmenttHOD(%s)", (dept_name,))
-        hod = cursor.fetchone()
-        hod_name = hod[0] if hod and hod[0] else "No HOD found"
-        messagebox.showinfo("HOD", f"HOD of '{dept_name}': {hod_name}")
-    except mysql.connector.Error as e:
-        messagebox.showerror("DB Error", f"Error while fetching HOD: {e}")
+
+    # Answered from the reference cache: no round trip unless it is stale
+    db.submit(lambda cur: ref_cache.get(cur).hod(dept_input) or (dept_input, None),
+              lambda r: messagebox.showinfo("HOD", f"HOD of '{r[0]}': {r[1] or 'No HOD found'}"),
+              lambda e: messagebox.showerror("DB Error", f"Error while fetching HOD: {e}"),
+              name="Department HOD", readonly=True)
 
 
 
@@ -354,6 +1493,14 @@ def open_main_app():
     root.geometry("1200x760")
 
     status_var = tk.StringVar(value="Ready")
+    ttk.Label(root, textvariable=status_var, anchor="w").pack(side="bottom", fill="x", padx=10, pady=(0, 4))
+    _pump_ui(root)
+
+    def _on_close():
+        show_status("Saving backup...")
+        backup_scheduler.flush()
+        root.destroy()
+    root.protocol("WM_DELETE_WINDOW", _on_close)
     notebook = ttk.Notebook(root)
     notebook.pack(fill="both", expand=True, padx=8, pady=8)
 
@@ -369,13 +1516,9 @@ def open_main_app():
     canvas.create_rectangle(440, 180, 1160, 540, fill="#0f172a", outline="#233044")  # main card
 
     # Logo (optional)
-    if PIL_AVAILABLE:
-        try:
-            img = Image.open("college_logo.png").convert("RGBA").resize((140, 140))
-            logo_img = ImageTk.PhotoImage(img)
-            canvas.create_image(210, 110, image=logo_img)
-        except Exception:
-            canvas.create_text(210, 110, text="🏛️", font=("Segoe UI Emoji", 64), fill="#e6eef9")
+    canvas.logo_img = load_logo()   # keep a reference or Tk drops the image
+    if canvas.logo_img:
+        canvas.create_image(210, 110, image=canvas.logo_img)
     else:
         canvas.create_text(210, 110, text="🏛️", font=("Segoe UI Emoji", 64), fill="#e6eef9")
 
@@ -395,22 +1538,10 @@ def open_main_app():
     canvas.create_text(800, 240, text="Live stats fetched from the database",
                        font=("Segoe UI", 10), fill="#9fb1ff")
 
-    # Helper to fetch stats
-    def _fetch_stats():
-        c = d = p = s = 0
-        try:
-            cursor.execute("SELECT COUNT(*) FROM College"); c = cursor.fetchone()[0]
-        except: pass
-        try:
-            cursor.execute("SELECT COUNT(*) FROM Department"); d = cursor.fetchone()[0]
-        except: pass
-        try:
-            cursor.execute("SELECT COUNT(*) FROM Professor"); p = cursor.fetchone()[0]
-        except: pass
-        try:
-            cursor.execute("SELECT COUNT(*) FROM Student"); s = cursor.fetchone()[0]
-        except: pass
-        return c, d, p, s
+    # Helper to fetch stats (served from stats_cache, one round trip when stale)
+    def _fetch_stats(cur):
+        snap = stats_cache.get(cur)
+        return [snap[t] for t in ("College", "Department", "Professor", "Student")]
 
     # Draw stat tiles inside the main card
     tile_w, tile_h = 280, 90
@@ -423,7 +1554,7 @@ def open_main_app():
         nonlocal _stat_items
         _stat_items.clear()
         labels = ["Colleges", "Departments", "Professors", "Students"]
-        values = list(_fetch_stats())
+        values = ["…"] * len(labels)   # filled in by _refresh_tiles once the counts arrive
         emojis = ["🏫", "🏛️", "👨‍🏫", "🎓"]
 
         for i, (label, val, emoji) in enumerate(zip(labels, values, emojis)):
@@ -446,8 +1577,13 @@ def open_main_app():
                                         font=("Segoe UI", 16, "bold"), anchor="w", fill="#ffffff")
             _stat_items.append((label, val_id))
 
-    def _refresh_tiles():
-        values = list(_fetch_stats())
+    stats_requested = time.perf_counter()
+
+    def _show_stats(values):
+        nonlocal stats_requested
+        if stats_requested:
+            perf.startup.record("home stats (background)", time.perf_counter() - stats_requested)
+            stats_requested = None
         for i, (_, val_id) in enumerate(_stat_items):
             try:
                 canvas.itemconfigure(val_id, text=str(values[i]))
@@ -455,7 +1591,42 @@ def open_main_app():
                 pass
         show_status("Stats refreshed.")
 
+    def _refresh_tiles(force=False):
+        if force:
+            stats_cache.invalidate()
+        db.submit(_fetch_stats, _show_stats,
+                  lambda e: show_status(f"Could not load stats: {e}"), key="home:stats", name="Home stats")
+
+    def _auto_refresh():
+        _refresh_tiles(force=True)
+        root.after(STATS_AUTO_REFRESH_MS, _auto_refresh)
+
+    def _show_breakdown(snap):
+        popup = tk.Toplevel(root)
+        popup.title("Breakdown")
+        popup.geometry("560x460")
+        for title, cols, rows in (
+                ("Students per College", ("Clg_ID", "College", "Students"), snap["by_college"]),
+                ("Per Department", ("Dept_ID", "Department", "Students", "Professors"), snap["by_department"])):
+            box = ttk.LabelFrame(popup, text=title)
+            box.pack(fill="both", expand=True, padx=10, pady=6)
+            tv = ttk.Treeview(box, columns=cols, show="headings", height=6)
+            for c in cols:
+                tv.heading(c, text=c)
+                tv.column(c, width=120, anchor="center")
+            tv.pack(fill="both", expand=True)
+            for row in rows:
+                tv.insert("", "end", values=row)
+
+    def _open_breakdown():
+        db.submit(lambda cur: stats_cache.get(cur, breakdown=True), _show_breakdown,
+                  lambda e: messagebox.showerror("DB Error", f"Error while fetching breakdown: {e}"),
+                  name="Home breakdown", readonly=True)
+
     _draw_tiles()
+    _refresh_tiles()
+    if STATS_AUTO_REFRESH_MS:
+        root.after(STATS_AUTO_REFRESH_MS, _auto_refresh)
 
     # Buttons on card: Refresh Stats  &  Open Dashboard
     def _open_dashboard():
@@ -467,7 +1638,15 @@ def open_main_app():
     canvas.create_rectangle(rx0, ry0, rx1, ry1, fill="#1f3a8a", outline="#274690", tags=refresh_btn_tag)
     canvas.create_text((rx0+rx1)//2, (ry0+ry1)//2, text="Refresh Stats",
                        font=("Segoe UI Semibold", 11, "bold"), fill="#e6eef9", tags=refresh_btn_tag)
-    canvas.tag_bind(refresh_btn_tag, "<Button-1>", lambda e: _refresh_tiles())
+    canvas.tag_bind(refresh_btn_tag, "<Button-1>", lambda e: _refresh_tiles(force=True))
+
+    # Breakdown button (canvas button)
+    breakdown_btn_tag = "breakdown_btn"
+    bx0, by0, bx1, by1 = 580, 480, 740, 520
+    canvas.create_rectangle(bx0, by0, bx1, by1, fill="#1f3a8a", outline="#274690", tags=breakdown_btn_tag)
+    canvas.create_text((bx0+bx1)//2, (by0+by1)//2, text="Breakdown",
+                       font=("Segoe UI Semibold", 11, "bold"), fill="#e6eef9", tags=breakdown_btn_tag)
+    canvas.tag_bind(breakdown_btn_tag, "<Button-1>", lambda e: _open_breakdown())
 
     # Primary button (canvas button)
     start_btn_tag = "start_btn"
@@ -482,12 +1661,21 @@ def open_main_app():
                        font=("Segoe UI", 9), fill="#89a2ff")
 
     notebook.add(home, text="Home")
+    # Coming back to Home redraws from the cache (no query unless a commit invalidated it)
+    notebook.bind("<<NotebookTabChanged>>",
+                  lambda e: _refresh_tiles() if notebook.select() == str(home) else None, add="+")
+
+    perf.startup.mark("main window + home page")
 
     # ----------------------- DATABASE TABS -----------------------
+    # Registered now, built (and their first page queried) on first selection
+    table_tabs = []
+
     def add_tab(title, cols, ins, upd, dele, extra=None, sp_add=False):
-        frame = TableFrame(notebook, title, cols, ins, upd, dele, extra, sp_add)
-        notebook.add(frame, text=title)
-        return frame
+        tab = LazyTab(notebook, title,
+                      lambda parent: TableFrame(parent, title, cols, ins, upd, dele, extra, sp_add))
+        table_tabs.append(tab)
+        return tab
 
     college_tab = add_tab("College",
         ["Clg_ID","Clg_Name","Address"],
@@ -529,6 +1717,35 @@ def open_main_app():
         sp_add=True
     )
 
+    LazyTab(notebook, "Analytics", AnalyticsFrame)
+    LazyTab(notebook, "Integrity", IntegrityFrame)
+    perf_tab = LazyTab(notebook, "Performance", PerformanceFrame)
+
+    def _prefetch_after(tab):
+        # The table tab after `tab` is the likeliest next pick
+        later = table_tabs[table_tabs.index(tab) + 1:]
+        if later and later[0].content is None:
+            later[0].ensure_built()
+
+    def _on_tab_changed(_):
+        page = root.nametowidget(notebook.select())
+        if not isinstance(page, LazyTab):
+            return
+        built = page.content is not None
+        page.ensure_built()
+        if page is perf_tab and built:
+            page.content.refresh()
+        if PREFETCH_NEXT_TAB and not built and page in table_tabs:
+            root.after(PREFETCH_DELAY_MS, _prefetch_after, page)
+    notebook.bind("<<NotebookTabChanged>>", _on_tab_changed, add="+")
+    perf.startup.mark("tabs registered")
+
+    def _first_paint():
+        perf.startup.mark("first paint")
+        print("Startup times:\n" + perf.startup.report())
+        db.submit(ref_cache.get, key="refs", name="Reference data")   # warm the lookup cache
+    root.after_idle(_first_paint)
+
     
 # ----------------------- ADMIN LOGIN PAGE -----------------------
 def admin_login():
@@ -556,6 +1773,7 @@ def admin_login():
 
         if u == "Miniproject" and p == "DBMS":
             messagebox.showinfo("Login Success", "Welcome Admin!")
+            perf.startup.resume()   # time spent typing is not launch time
             login.destroy()
             open_main_app()     # Launch your full GUI
         else:
@@ -566,9 +1784,11 @@ def admin_login():
 
     # allow pressing Enter to submit
     login.bind('<Return>', lambda event: validate_login())
+    login.after_idle(perf.startup.mark, "login window")
 
     login.mainloop()
 
 # ----------------------- START APPLICATION -----------------------
 if __name__ == "__main__":
+    connect_database()
     admin_login()
@@ -0,0 +1,72 @@
+import os, sys
+
+# The modules live at the top of the repository, next to miniproject.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import re, sqlite3
+import pytest
+
+class SQLiteCursor:
+    """The slice of the mysql-connector cursor API these modules use, over sqlite3.
+
+    %s placeholders, MySQL's ON DUPLICATE KEY UPDATE col = VALUES(col),
+    <=> and FOR UPDATE (a no-op: SQLite has one writer) are translated;
+    everything else must already be valid SQLite.
+    """
+
+    def __init__(self, db):
+        self._cur = db.cursor()
+        self.rowcount = -1
+
+    def execute(self, sql, params=()):
+        sql = sql.replace("%s", "?").replace("ON DUPLICATE KEY UPDATE", "ON CONFLICT DO UPDATE SET")
+        sql = re.sub(r"VALUES\((\w+)\)", r"excluded.\1", sql)
+        sql = sql.replace("<=>", "IS").replace(" FOR UPDATE", "")
+        self._cur.execute(sql, tuple(params))
+        self.rowcount = self._cur.rowcount
+
+    @property
+    def description(self):
+        return self._cur.description
+
+    def nextset(self):
+        return None
+
+    def executemany(self, sql, seq):
+        for params in seq:
+            self.execute(sql, params)
+
+    def fetchone(self):
+        return self._cur.fetchone()
+
+    def fetchall(self):
+        return self._cur.fetchall()
+
+    def fetchmany(self, size):
+        return self._cur.fetchmany(size)
+
+    def close(self):
+        pass
+
+class SQLiteConnection:
+    def __init__(self):
+        self.db = sqlite3.connect(":memory:")
+        self.db.execute("PRAGMA foreign_keys = ON")
+
+    def cursor(self, **kwargs):
+        return SQLiteCursor(self.db)
+
+    def commit(self):
+        self.db.commit()
+
+    def rollback(self):
+        self.db.rollback()
+
+    def consume_results(self):
+        pass
+
+@pytest.fixture
+def sqlite_conn():
+    conn = SQLiteConnection()
+    yield conn
+    conn.db.close()
@@ -0,0 +1,112 @@
+import college_analytics as analytics
+
+SCHEMA = """
+CREATE TABLE Student (Stu_ID INTEGER PRIMARY KEY);
+CREATE TABLE Course (Course_ID INTEGER PRIMARY KEY, Dept_ID INT, Credits INT);
+CREATE TABLE Enrollment (Stu_ID INT REFERENCES Student(Stu_ID) ON DELETE CASCADE,
+                         Course_ID INT, Grade TEXT, Term TEXT, PRIMARY KEY (Stu_ID, Course_ID, Term));
+CREATE TABLE Enrollment_History (Stu_ID INT, Course_ID INT, Grade TEXT, Term TEXT,
+                                 PRIMARY KEY (Term, Stu_ID, Course_ID));
+CREATE TABLE stat_student_gpa (Stu_ID INTEGER PRIMARY KEY REFERENCES Student(Stu_ID) ON DELETE CASCADE,
+                               Courses INT, Credits_Attempted REAL, Credits_Earned REAL, GPA REAL,
+                               refreshed_at TEXT);
+CREATE TABLE stat_course_grades (Course_ID INTEGER PRIMARY KEY, Enrolled INT, Pass_Rate REAL,
+                                 Avg_Points REAL, refreshed_at TEXT);
+CREATE TABLE stat_refresh (name TEXT PRIMARY KEY, change_id INT NOT NULL, refreshed_at TEXT);
+CREATE TABLE change_log (id INTEGER PRIMARY KEY AUTOINCREMENT, table_name TEXT, row_key INT,
+                         ref_key INT, op TEXT, client TEXT);
+INSERT INTO change_log (table_name, row_key, op) VALUES ('Student', 2, 'I');
+INSERT INTO Student VALUES (1), (2);
+INSERT INTO Course VALUES (10, 1, 3), (11, 1, 4);
+INSERT INTO Enrollment VALUES (1, 10, 'A', '2026-2'), (2, 11, 'F', '2026-2');
+"""
+
+def _setup(conn):
+    conn.db.create_function("fn_CurrentTerm", 0, lambda: "2026-2")
+    conn.db.executescript(SCHEMA)
+
+def _log(conn, table, key, op, ref=None):
+    # What the change_log triggers write on MySQL
+    conn.db.execute("INSERT INTO change_log (table_name, row_key, ref_key, op) VALUES (?, ?, ?, ?)",
+                    (table, key, ref, op))
+
+def test_refresh_summaries_writes_only_changed_rows(sqlite_conn):
+    _setup(sqlite_conn)
+    assert analytics.refresh_summaries(sqlite_conn) == {"stat_student_gpa": 2, "stat_course_grades": 2}
+    assert analytics.refresh_summaries(sqlite_conn) == {"stat_student_gpa": 0, "stat_course_grades": 0}
+    sqlite_conn.db.execute("UPDATE Enrollment SET Grade = 'B' WHERE Stu_ID = 1")
+    _log(sqlite_conn, "Enrollment", 1, "U", ref=10)
+    assert analytics.refresh_summaries(sqlite_conn) == {"stat_student_gpa": 1, "stat_course_grades": 1}
+    gpa = dict(sqlite_conn.db.execute("SELECT Stu_ID, GPA FROM stat_student_gpa"))
+    assert gpa == {1: 3.0, 2: 0.0}
+
+def test_refresh_summaries_skips_deleted_students_with_history(sqlite_conn):
+    _setup(sqlite_conn)
+    sqlite_conn.db.execute("INSERT INTO Student VALUES (3)")
+    sqlite_conn.db.execute("INSERT INTO Enrollment_History VALUES (3, 10, 'B', '2026-1'), (2, 10, 'A', '2026-1')")
+    analytics.refresh_summaries(sqlite_conn)
+    sqlite_conn.db.execute("DELETE FROM Student WHERE Stu_ID = 3")   # its history stays
+    _log(sqlite_conn, "Student", 3, "D")
+    changed = analytics.refresh_summaries(sqlite_conn)
+    assert changed["stat_student_gpa"] == 0   # the cascade already removed its row
+    gpa = dict(sqlite_conn.db.execute("SELECT Stu_ID, GPA FROM stat_student_gpa"))
+    assert gpa == {1: 4.0, 2: 1.71}
+    enrolled = dict(sqlite_conn.db.execute("SELECT Course_ID, Enrolled FROM stat_course_grades"))
+    assert enrolled == {10: 3, 11: 1}   # a deleted student's grades still count for the course
+
+def test_refresh_summaries_recomputes_only_logged_keys(sqlite_conn):
+    _setup(sqlite_conn)
+    analytics.refresh_summaries(sqlite_conn)
+    db = sqlite_conn.db
+    # Unlogged edits stay invisible to an incremental refresh...
+    db.execute("UPDATE Enrollment SET Grade = 'C' WHERE Stu_ID = 2")
+    db.execute("UPDATE Enrollment SET Grade = 'B' WHERE Stu_ID = 1")
+    _log(sqlite_conn, "Enrollment", 1, "U", ref=10)
+    assert analytics.changed_keys(sqlite_conn.cursor(), analytics._watermark(sqlite_conn.cursor())) == ({1}, {10})
+    assert analytics.refresh_summaries(sqlite_conn) == {"stat_student_gpa": 1, "stat_course_grades": 1}
+    assert dict(db.execute("SELECT Stu_ID, GPA FROM stat_student_gpa")) == {1: 3.0, 2: 0.0}
+    # ...until a full rebuild
+    assert analytics.refresh_summaries(sqlite_conn, full=True) == {"stat_student_gpa": 1, "stat_course_grades": 1}
+    # A Course change reaches every student who took it
+    db.execute("UPDATE Course SET Credits = 5 WHERE Course_ID = 10")
+    _log(sqlite_conn, "Course", 10, "U")
+    assert analytics.changed_keys(sqlite_conn.cursor(), analytics._watermark(sqlite_conn.cursor())) == ({1}, {10})
+
+def test_changed_keys_falls_back_to_full_recompute(sqlite_conn):
+    _setup(sqlite_conn)
+    cur = sqlite_conn.cursor()
+    assert analytics.changed_keys(cur, 0) is None               # first run
+    assert analytics.changed_keys(cur, 99) is None              # watermark pruned from change_log
+    _log(sqlite_conn, "Course", 11, "D")                        # cascaded Enrollment deletes are not logged
+    assert analytics.changed_keys(cur, 1) is None
+
+def _data(stu, course, dept, credits, grades):
+    return analytics.Enrollments(stu, course, dept, credits,
+                                 [analytics._CODE.get(g, analytics._OTHER) for g in grades])
+
+def test_group_bys_per_student_and_course():
+    data = _data([1, 1, 2, 2], [10, 11, 10, 11], [1, 2, 1, 2], [3, 4, 3, 4], ["A", "F", "B", None])
+    _, gpa = analytics.student_gpa(data)
+    # Student 1: (4*3 + 0*4) / 7; student 2's ungraded course is left out of the GPA
+    assert gpa == [(1, 2, 7.0, 3.0, 1.71), (2, 2, 3.0, 3.0, 3.0)]
+    cols, rows = analytics.course_grades(data)
+    course = dict(zip(cols, rows[1]))
+    assert course["Course_ID"] == 11 and course["Enrolled"] == 2 and course["Other"] == 1
+    assert course["F"] == 1 and course["Pass_Rate"] == 0.0
+    cols, rows = analytics.department_grades(data)
+    assert [dict(zip(cols, r))["Avg_Points"] for r in rows] == [3.5, 0.0]
+
+def test_department_load_counts_departments_without_enrollments(sqlite_conn):
+    sqlite_conn.db.executescript("""
+        CREATE TABLE Course (Course_ID INTEGER PRIMARY KEY, Dept_ID INT, Credits INT);
+        CREATE TABLE Professor (Prof_ID INTEGER PRIMARY KEY, Dept_ID INT);
+        INSERT INTO Course VALUES (10, 1, 3), (11, 2, 4), (12, NULL, 2);
+        INSERT INTO Professor VALUES (1, 1), (2, 1), (3, 2);
+    """)
+    data = _data([1, 2], [10, 10], [1, 1], [3, 3], ["A", "B"])
+    cols, rows = analytics.department_load(data, sqlite_conn.cursor())
+    load = {r[0]: dict(zip(cols, r)) for r in rows}
+    assert sorted(load) == [0, 1, 2]
+    assert load[1]["Enrollments"] == 2 and load[1]["Credit_Hours"] == 6 and load[1]["Courses_per_Prof"] == 0.5
+    assert load[2]["Enrollments"] == 0 and load[2]["Professors"] == 1
+    assert load[0]["Courses"] == 1 and load[0]["Credit_Hours_per_Prof"] is None
@@ -0,0 +1,79 @@
+import csv, gzip
+import pytest
+import college_backup as backup
+
+def test_text_and_value_round_trip_null_and_backslashes():
+    values = [None, "", r"\N", "\\\\N", "\\", "a\\b", "N", 5]
+    fields = [backup._text(v) for v in values]
+    assert fields[0] == backup.NULL
+    assert len(set(fields[:5])) == 5            # NULL, '' and literal '\N' stay distinct
+    assert [backup._value(f) for f in fields[:-1]] == values[:-1]
+    assert backup._text(b"\\N") == "\\\\N"
+    # Dumps written before format 2 read back as before
+    assert backup._value(r"\N", escaped=False) is None
+    assert backup._value("\\x", escaped=False) == "\\x"
+
+def test_load_chunk_restores_values(sqlite_conn, tmp_path):
+    rows = [(1, r"\N", None), (2, "", "x"), (3, "\\path", "y")]
+    path = tmp_path / "T.00000.csv.gz"
+    with gzip.open(path, "wt", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerows([[backup._text(v) for v in r] for r in rows])
+    sqlite_conn.db.execute("CREATE TABLE T (id INTEGER PRIMARY KEY, a TEXT, b TEXT)")
+    cur = sqlite_conn.cursor()
+    n = backup._load_chunk(cur, "INSERT INTO T (id, a, b) VALUES (%s, %s, %s)", str(path))
+    assert n == 3
+    assert sqlite_conn.db.execute("SELECT id, a, b FROM T ORDER BY id").fetchall() == rows
+
+def test_create_order_puts_parents_first():
+    manifest = {"tables": {
+        "Enrollment": {"create": "CREATE TABLE `Enrollment` (... REFERENCES `Student` (`Stu_ID`), "
+                                 "REFERENCES `Course` (`Course_ID`))"},
+        "Student": {"create": "CREATE TABLE `Student` (... REFERENCES `College` (`Clg_ID`))"},
+        "Course": {"create": "CREATE TABLE `Course` (...)"},
+        "College": {"create": "CREATE TABLE `College` (...)"},
+    }}
+    order = backup.create_order(manifest, ["Enrollment", "Student", "Course", "College"])
+    assert order.index("College") < order.index("Student") < order.index("Enrollment")
+    assert order.index("Course") < order.index("Enrollment")
+    assert backup.create_order(manifest, ["Enrollment", "Course"]) == ["Course", "Enrollment"]
+
+def test_secondary_indexes_skip_primary_unique_and_foreign_key_indexes():
+    create = ("CREATE TABLE `Student` (\n"
+              "  `Stu_ID` int NOT NULL,\n"
+              "  PRIMARY KEY (`Stu_ID`),\n"
+              "  UNIQUE KEY `Email` (`Email`),\n"
+              "  KEY `idx_student_dept` (`Dept_ID`),\n"
+              "  FULLTEXT KEY `ft_student_name` (`Name`),\n"
+              "  CONSTRAINT `fk_student_dept` FOREIGN KEY (`Dept_ID`) REFERENCES `Department` (`Dept_ID`)\n"
+              ")")
+    assert [n for n, _ in backup.secondary_indexes(create)] == ["ft_student_name"]
+
+def test_dump_refuses_an_empty_table_list(monkeypatch, tmp_path):
+    class Cursor:
+        def execute(self, sql, params=()):
+            assert not sql.startswith("LOCK TABLES")
+        def fetchall(self):
+            return []
+        def close(self):
+            pass
+
+    class Pool:
+        def __init__(self, **kwargs):
+            pass
+        def connection(self):
+            class Conn:
+                def __enter__(self):
+                    return self
+                def __exit__(self, *exc):
+                    return False
+                def cursor(self, **kwargs):
+                    return Cursor()
+            return Conn()
+        def close_all(self):
+            pass
+
+    monkeypatch.setattr(backup, "ConnectionPool", Pool)
+    out = str(tmp_path / "dump")
+    with pytest.raises(ValueError, match="No tables to dump"):
+        backup.dump(out, config={"database": "empty"}, log=lambda msg: None)
+    assert not (tmp_path / "dump.tmp").exists()
@@ -0,0 +1,51 @@
+import os, threading, time
+import miniproject as app
+
+def test_flush_waits_for_running_dump_then_dumps_pending(monkeypatch, tmp_path):
+    monkeypatch.setattr(app, "BACKUP_PATH", str(tmp_path / "full"))
+    os.makedirs(app.BACKUP_PATH)
+    started, release, dumped = threading.Event(), threading.Event(), []
+
+    def fake_backup(tables=None):
+        dumped.append(sorted(tables) if tables else None)
+        if len(dumped) == 1:
+            started.set()
+            release.wait(5)
+        return "path"
+
+    monkeypatch.setattr(app, "backup_database", fake_backup)
+    monkeypatch.setattr(app, "post_ui", lambda *a: None)
+    sched = app.BackupScheduler(delay=0.01)
+    sched.request("Student")
+    assert started.wait(5)
+    sched.request("Course")          # arrives while the first dump runs
+    threading.Timer(0.1, release.set).start()
+    sched.flush()
+    assert dumped == [["Student"], ["Course"]]
+    assert not sched._dirty and not sched._running
+
+def test_prune_incrementals_keeps_newer_ones(monkeypatch, tmp_path):
+    monkeypatch.setattr(app, "BACKUP_PATH", str(tmp_path / "student_database_backup"))
+    old = tmp_path / f"{app.INCREMENTAL_PREFIX}20260101_000000"
+    old.mkdir()
+    os.utime(old, (time.time() - 100, time.time() - 100))
+    (tmp_path / "student_database_backup").mkdir()
+    newer = tmp_path / f"{app.INCREMENTAL_PREFIX}20990101_000000"
+    newer.mkdir()
+    os.utime(newer, (time.time() + 100, time.time() + 100))
+    assert app.prune_incrementals(str(tmp_path)) == [old.name]
+    assert not old.exists() and newer.exists()
+
+def test_failed_dump_keeps_pending_tables(monkeypatch, tmp_path):
+    monkeypatch.setattr(app, "BACKUP_PATH", str(tmp_path / "full"))
+    os.makedirs(app.BACKUP_PATH)
+
+    def broken_backup(tables=None):
+        raise ValueError("Student: loaded 1 rows, the manifest lists 2")
+
+    monkeypatch.setattr(app, "backup_database", broken_backup)
+    monkeypatch.setattr(app, "post_ui", lambda *a: None)
+    sched = app.BackupScheduler(delay=60)
+    sched.request("Student")
+    sched.flush()
+    assert sched._dirty == {"Student"} and not sched._running
@@ -0,0 +1,88 @@
+"""TableFrame's batch mode: staging and the single-transaction Apply."""
+import pytest
+import miniproject as app
+from college_cache import RefCache
+from college_store import RowStore
+from test_table_window import FakeTree, SyncDB
+
+SCHEMA = """
+CREATE TABLE College (Clg_ID INTEGER PRIMARY KEY, Clg_Name TEXT);
+CREATE TABLE Department (Dept_ID INTEGER PRIMARY KEY, Dept_Name TEXT, HOD TEXT);
+CREATE TABLE Course (Course_ID INTEGER PRIMARY KEY, Course_Name TEXT, Credits INT, Dept_ID INT);
+CREATE TABLE change_log (id INTEGER PRIMARY KEY AUTOINCREMENT, table_name TEXT, row_key INT,
+                         op TEXT, client TEXT);
+INSERT INTO Department VALUES (1, 'Physics', NULL);
+INSERT INTO Course VALUES (1, 'Optics', 4, 1), (2, 'Mechanics', 3, 1), (3, 'Waves', 2, 1);
+"""
+
+class _Widget:
+    def configure(self, **kwargs):
+        pass
+
+class _PendingTree:
+    def __init__(self):
+        self.rows = []
+    def get_children(self):
+        return tuple(range(len(self.rows)))
+    def delete(self, *items):
+        self.rows = []
+    def insert(self, parent, index, values):
+        self.rows.append(values)
+
+@pytest.fixture
+def frame(sqlite_conn, monkeypatch):
+    sqlite_conn.db.executescript(SCHEMA)
+    committed = []
+    monkeypatch.setattr(app, "db", SyncDB(sqlite_conn))
+    monkeypatch.setattr(app, "ref_cache", RefCache())
+    monkeypatch.setattr(app, "table_committed", committed.append)
+    errors = []
+    monkeypatch.setattr(app.messagebox, "askyesno", lambda *args: True)
+    monkeypatch.setattr(app.messagebox, "showinfo", lambda *args: None)
+    monkeypatch.setattr(app.messagebox, "showerror", lambda title, msg: errors.append(msg))
+    f = app.TableFrame.__new__(app.TableFrame)
+    f.table, f.key, f.sp_add = "Course", "Course_ID", False
+    f.columns = ["Course_ID", "Course_Name", "Credits", "Dept_ID"]
+    f.insert_q = "INSERT INTO Course VALUES (%s, %s, %s, %s)"
+    f.update_q = "UPDATE Course SET Course_Name = %s, Credits = %s, Dept_ID = %s WHERE Course_ID = %s"
+    f.delete_q = "DELETE FROM Course WHERE Course_ID = %s"
+    f.store, f.tree, f.pending_tree = RowStore(f.columns), FakeTree(), _PendingTree()
+    f.apply_btn = f.discard_btn = f.pending_box = _Widget()
+    f.pending, f._pending_base, f._edit_base, f._seen = {}, {}, {}, 0
+    f.fetch_data = lambda: None
+    f.committed, f.errors = committed, errors
+    return f
+
+def _courses(conn):
+    return conn.db.execute("SELECT Course_ID, Credits FROM Course ORDER BY Course_ID").fetchall()
+
+def test_staged_changes_fold_per_key(frame):
+    frame._stage("insert", 4, (4, "Heat", 3, 1))
+    frame._stage("update", 4, (4, "Heat", 5, 1))
+    assert frame.pending["4"] == ("insert", 4, (4, "Heat", 5, 1))
+    frame._stage("delete", 4)
+    assert "4" not in frame.pending and "4" not in frame._pending_base   # never reached the database
+    frame._stage("delete", 2)
+    frame._stage("insert", 2, (2, "Statics", 3, 1))
+    assert frame.pending["2"] == ("update", 2, (2, "Statics", 3, 1))
+    assert frame.pending_tree.rows == [["update", 2, "Statics", 3, 1]]
+
+def test_apply_commits_every_change_in_one_transaction(frame, sqlite_conn):
+    frame._stage("delete", 1)
+    frame._stage("update", 2, [2, "Mechanics", 6, 1])
+    frame._stage("insert", 4, (4, "Heat", 3, 1))
+    frame.apply_batch()
+    assert _courses(sqlite_conn) == [(2, 6), (3, 2), (4, 3)]
+    assert frame.pending == {} and frame.committed == ["Course"] and frame.errors == []
+
+def test_apply_rolls_back_the_whole_batch_on_a_conflict(frame, sqlite_conn):
+    frame._stage("insert", 4, (4, "Heat", 3, 1))
+    frame._stage("update", 3, [3, "Waves", 9, 1])
+    # Another user edits course 3 after it was staged
+    sqlite_conn.db.execute("INSERT INTO change_log (table_name, row_key, op, client) "
+                           "VALUES ('Course', 3, 'U', 'other')")
+    sqlite_conn.db.commit()
+    frame.apply_batch()
+    assert _courses(sqlite_conn) == [(1, 4), (2, 3), (3, 2)]
+    assert len(frame.pending) == 2 and frame.committed == []
+    assert "Course 3 was changed by another user" in frame.errors[0]
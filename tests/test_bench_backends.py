@@ -0,0 +1,35 @@
+from college_bench.backends import TABLES, MySQLBackend, SQLiteBackend
+
+class _Cursor:
+    def __init__(self, tables):
+        self.tables = tables
+        self.executed = []
+    def execute(self, sql, params=()):
+        self.executed.append(sql)
+    def fetchall(self):
+        return [(t,) for t in self.tables]
+
+def test_reset_drops_every_table_in_the_database():
+    tables = ["College", "Enrollment", "change_log", "stat_student_gpa", "academic_term",
+              "Enrollment_History", "schema_migrations"]
+    cur = _Cursor(tables)
+    assert MySQLBackend._drop_tables(cur) == tables
+    drops = [s for s in cur.executed if s.startswith("DROP TABLE")]
+    assert drops == [f"DROP TABLE IF EXISTS `{t}`" for t in tables]
+    assert cur.executed[-1] == "SET foreign_key_checks = 1"
+
+def test_schema_comes_from_the_sql_script(tmp_path):
+    assert TABLES == ("College", "Department", "Professor", "Student", "Course", "Enrollment")
+    backend = SQLiteBackend(str(tmp_path / "bench.db"))
+    backend.create_schema()
+    backend.create_schema(reset=True)
+    conn = backend.connect()
+    try:
+        cur = conn.cursor()
+        cur.execute("SELECT name FROM sqlite_master WHERE type = 'table' ORDER BY rowid")
+        assert tuple(r[0] for r in cur.fetchall()) == TABLES
+        cur.execute("SELECT * FROM Student")
+        assert [d[0] for d in cur.description] == ["Stu_ID", "Name", "Phone_No", "Email", "DOB",
+                                                   "Gender", "Clg_ID", "Dept_ID"]
+    finally:
+        conn.close()
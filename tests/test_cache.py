@@ -0,0 +1,96 @@
+import pytest
+import college_cache
+
+SCHEMA = """
+CREATE TABLE College (Clg_ID INTEGER PRIMARY KEY, Clg_Name TEXT);
+CREATE TABLE Department (Dept_ID INTEGER PRIMARY KEY, Dept_Name TEXT, HOD TEXT);
+CREATE TABLE Professor (Prof_ID INTEGER PRIMARY KEY, Dept_ID INT);
+CREATE TABLE Student (Stu_ID INTEGER PRIMARY KEY, Clg_ID INT, Dept_ID INT);
+CREATE TABLE Course (Course_ID INTEGER PRIMARY KEY, Course_Name TEXT, Credits INT, Dept_ID INT);
+INSERT INTO College VALUES (1, 'North'), (2, 'South');
+INSERT INTO Department VALUES (10, 'Physics', 'Dr. Rao');
+INSERT INTO Professor VALUES (100, 10);
+INSERT INTO Student VALUES (1000, 1, 10), (1001, 1, NULL);
+"""
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def db(sqlite_conn, monkeypatch):
+    sqlite_conn.db.executescript(SCHEMA)
+    clock = _Clock()
+    monkeypatch.setattr(college_cache.time, "monotonic", clock)
+    cur = sqlite_conn.cursor()
+    statements = []
+    execute = cur.execute
+    def counting(sql, params=()):
+        statements.append(sql)
+        execute(sql, params)
+    cur.execute = counting
+    return sqlite_conn, cur, clock, statements
+
+def test_stats_are_served_from_the_snapshot_until_ttl_or_invalidation(db):
+    conn, cur, clock, statements = db
+    cache = college_cache.StatsCache(ttl=60)
+    assert cache.get(cur) == {"College": 2, "Department": 1, "Professor": 1, "Student": 2}
+    assert len(statements) == 1   # every total in one round trip
+    conn.db.execute("INSERT INTO Student VALUES (1002, 2, 10)")
+    clock.now = 59
+    assert cache.get(cur)["Student"] == 2
+    clock.now = 60
+    assert cache.get(cur)["Student"] == 3
+    assert len(statements) == 2
+    conn.db.execute("INSERT INTO Course VALUES (1, 'Optics', 4, 10)")
+    cache.invalidate("Course")   # not a counted table: the snapshot stays
+    cache.get(cur)
+    assert len(statements) == 2
+    conn.db.execute("DELETE FROM Student WHERE Stu_ID = 1002")
+    cache.invalidate("Student")
+    assert cache.get(cur)["Student"] == 2
+    assert len(statements) == 3
+
+def test_stats_breakdown_is_loaded_once_per_snapshot(db):
+    conn, cur, clock, statements = db
+    cache = college_cache.StatsCache(ttl=60)
+    cache.get(cur)
+    snap = cache.get(cur, breakdown=True)
+    assert snap["by_college"] == [(1, "North", 2), (2, "South", 0)]
+    assert snap["by_department"] == [(10, "Physics", 1, 1)]
+    assert cache.get(cur, breakdown=True) is snap
+    assert cache.get(cur) is snap
+    assert len(statements) == 3
+
+def test_ref_cache_rereads_only_stale_tables(db):
+    conn, cur, clock, statements = db
+    cache = college_cache.RefCache(ttl=300)
+    assert cache.peek() is None
+    refs = cache.get(cur)
+    assert len(statements) == 3
+    assert refs.name("College", "2") == "South"
+    assert refs.key("Department", " physics ") == 10
+    assert refs.hod("Physics") == ("Physics", "Dr. Rao")
+    assert refs.choices("College", "no") == ["1 - North"]
+    conn.db.execute("INSERT INTO College VALUES (3, 'East')")
+    assert cache.get(cur) is refs
+    cache.invalidate("Student")   # not cached: nothing to re-read
+    cache.invalidate("College")
+    assert not cache.is_fresh()
+    refs = cache.get(cur)
+    assert statements[3:] == [college_cache.REF_SQL["College"]]
+    assert refs.name("College", 3) == "East" and refs.hod(10) == ("Physics", "Dr. Rao")
+    clock.now = 300
+    cache.get(cur)
+    assert len(statements) == 7 and cache.is_fresh()
+
+def test_ref_cache_foreign_key_check_rereads_before_failing(db):
+    conn, cur, clock, statements = db
+    cache = college_cache.RefCache()
+    cache.check_foreign_keys(cur, {"Clg_ID": "1", "Dept_ID": "", "Name": "x"})
+    conn.db.execute("INSERT INTO College VALUES (3, 'East')")   # added by another client
+    cache.check_foreign_keys(cur, {"Clg_ID": 3})
+    with pytest.raises(ValueError, match="Dept_ID 11 does not exist in Department"):
+        cache.check_foreign_keys(cur, {"Clg_ID": 3, "Dept_ID": 11})
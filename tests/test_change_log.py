@@ -0,0 +1,47 @@
+import pytest
+import college_queries as q
+
+SCHEMA = """
+CREATE TABLE Student (Stu_ID INTEGER PRIMARY KEY, Name TEXT);
+CREATE TABLE change_log (id INTEGER PRIMARY KEY AUTOINCREMENT, table_name TEXT, row_key INT,
+                         op TEXT, client TEXT, changed_at TEXT DEFAULT CURRENT_TIMESTAMP);
+INSERT INTO Student VALUES (1, 'Ann'), (2, 'Bob');
+"""
+
+def _log(conn, table, key, op, client):
+    conn.db.execute("INSERT INTO change_log (table_name, row_key, op, client) VALUES (?, ?, ?, ?)",
+                    (table, key, op, client))
+
+@pytest.fixture
+def cur(sqlite_conn):
+    sqlite_conn.db.executescript(SCHEMA)
+    return sqlite_conn.cursor()
+
+def test_changes_since_lists_one_table_in_order(sqlite_conn, cur):
+    _log(sqlite_conn, "Student", 1, "U", "a")
+    _log(sqlite_conn, "College", 1, "U", "a")
+    _log(sqlite_conn, "Student", 2, "D", None)
+    assert q.change_log_head(cur) == 3
+    assert q.changes_since(cur, "Student", 0) == [(1, 1, "U"), (3, 2, "D")]
+    assert q.changes_since(cur, "Student", 1) == [(3, 2, "D")]
+    assert q.changes_since(cur, "Student", 0, limit=1) == [(1, 1, "U")]
+    assert q.fetch_rows(cur, "Student", "Stu_ID", [1, 2, 3], (["Name LIKE %s"], ["A%"])) == [(1, "Ann")]
+
+def test_check_not_stale_ignores_own_and_older_changes(sqlite_conn, cur):
+    _log(sqlite_conn, "Student", 1, "U", "other")
+    _log(sqlite_conn, "Student", 1, "U", "me")
+    _log(sqlite_conn, "Student", 2, "U", "other")
+    _log(sqlite_conn, "Professor", 1, "U", "other")
+    q.check_not_stale(cur, "Student", "Stu_ID", 1, 1, "me")
+
+def test_check_not_stale_detects_other_clients(sqlite_conn, cur):
+    _log(sqlite_conn, "Student", 1, "U", None)   # a change made outside the GUI
+    with pytest.raises(q.StaleEditError, match="changed by another user"):
+        q.check_not_stale(cur, "Student", "Stu_ID", 1, 0, "me")
+    # A restore of the whole table conflicts with every row
+    _log(sqlite_conn, "Student", 0, "R", "other")
+    with pytest.raises(q.StaleEditError):
+        q.check_not_stale(cur, "Student", "Stu_ID", 2, 1, "me")
+    sqlite_conn.db.execute("DELETE FROM Student WHERE Stu_ID = 2")
+    with pytest.raises(q.StaleEditError, match="does not exist"):
+        q.check_not_stale(cur, "Student", "Stu_ID", 2, 2, "me")
@@ -0,0 +1,60 @@
+import argparse, threading
+from contextlib import contextmanager
+import pytest
+import college_cli as cli
+
+class _Pool:
+    """ConnectionPool stand-in that tracks how many connections are out at once."""
+    instances = []
+
+    def __init__(self, size, **config):
+        self.size = size
+        self.out = self.peak = 0
+        self.closed = False
+        self._lock = threading.Lock()
+        _Pool.instances.append(self)
+
+    @contextmanager
+    def connection(self):
+        with self._lock:
+            self.out += 1
+            self.peak = max(self.peak, self.out)
+        try:
+            yield object()
+        finally:
+            with self._lock:
+                self.out -= 1
+
+    def close_all(self):
+        self.closed = True
+
+@pytest.fixture
+def pool(monkeypatch):
+    _Pool.instances = []
+    monkeypatch.setattr(cli, "ConnectionPool", _Pool)
+    return _Pool.instances
+
+def test_run_tasks_fans_out_and_keeps_failures(pool):
+    barrier = threading.Barrier(3, timeout=5)
+
+    def work(rows):
+        def func(conn):
+            barrier.wait()   # all three run at once, each on its own connection
+            return rows
+        return func
+
+    def fail(conn):
+        raise RuntimeError("no such table")
+
+    log = []
+    tasks = [cli.Task(f"t{i}", work(i)) for i in range(3)] + [cli.Task("bad", fail)]
+    assert cli.run_tasks(tasks, workers=3, log=log.append) is tasks
+    assert [t.rows for t in tasks] == [0, 1, 2, 0]
+    assert isinstance(tasks[-1].error, RuntimeError) and "bad: FAILED (no such table)" in log
+    assert pool[0].size == 3 and pool[0].peak == 3 and pool[0].closed
+
+def test_dump_tasks_write_one_file_per_table(tmp_path):
+    args = argparse.Namespace(tables=["Student", "Enrollment"], out=str(tmp_path), format="csv.gz")
+    assert [t.label for t in cli.dump_tasks(args)] == ["Student", "Enrollment"]
+    with pytest.raises(SystemExit, match="Unknown table: Nope"):
+        cli.dump_tasks(argparse.Namespace(tables=["Nope"], out=str(tmp_path), format="csv"))
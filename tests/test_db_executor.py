@@ -0,0 +1,61 @@
+from contextlib import contextmanager
+import mysql.connector
+import pytest
+from mysql.connector import errorcode
+from college_db import DBExecutor
+
+class _Conn:
+    statements = None
+    connection_id = 1
+    def cursor(self):
+        return _Cursor()
+    def commit(self): pass
+    def rollback(self): pass
+    def is_connected(self): return False
+
+class _Cursor:
+    def close(self): pass
+
+class _Pool:
+    def __init__(self, fail_acquire=0):
+        self.fail_acquire = fail_acquire
+    @contextmanager
+    def connection(self):
+        if self.fail_acquire:
+            self.fail_acquire -= 1
+            raise _gone()
+        yield _Conn()
+
+def _gone():
+    return mysql.connector.Error("gone", errno=errorcode.CR_SERVER_GONE_ERROR)
+
+def _flaky(calls):
+    def func(cur):
+        calls.append(1)
+        if len(calls) == 1:
+            raise _gone()
+        return "ok"
+    return func
+
+def test_write_is_not_retried_once_it_started():
+    calls = []
+    with pytest.raises(mysql.connector.Error):
+        DBExecutor(_Pool(), workers=0).run(_flaky(calls))
+    assert len(calls) == 1
+
+def test_read_only_job_is_retried():
+    calls = []
+    assert DBExecutor(_Pool(), workers=0).run(_flaky(calls), readonly=True) == "ok"
+    assert len(calls) == 2
+
+def test_write_is_retried_when_connection_failed_before_it_ran():
+    calls = []
+    assert DBExecutor(_Pool(fail_acquire=1), workers=0).run(lambda cur: calls.append(1) or "ok") == "ok"
+    assert calls == [1]
+
+def test_keyed_jobs_are_read_only_and_named():
+    ex = DBExecutor(_Pool(), workers=0)
+    job = ex.submit(lambda cur: None, key="page")
+    assert job.readonly and job.action == "page"
+    job = ex.submit(lambda cur: None, name="Student: Insert")
+    assert not job.readonly and job.action == "Student: Insert"
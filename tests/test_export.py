@@ -0,0 +1,34 @@
+import csv, gzip, os
+import pytest
+import college_io
+
+def _setup(conn, monkeypatch):
+    conn.db.execute("CREATE TABLE College (Clg_ID INTEGER PRIMARY KEY, Clg_Name TEXT)")
+    conn.db.executemany("INSERT INTO College VALUES (?, ?)", [(i, f"College {i}") for i in range(1, 6)])
+    monkeypatch.setattr(college_io, "EXPORT_FETCH_SIZE", 2)
+
+def test_export_renames_the_part_file_when_complete(sqlite_conn, monkeypatch, tmp_path):
+    _setup(sqlite_conn, monkeypatch)
+    path = str(tmp_path / "college.csv.gz")
+    seen = []
+    assert college_io.export_query(sqlite_conn, "SELECT * FROM College WHERE Clg_ID > %s", (1,),
+                                   path, progress=seen.append) == 4
+    assert seen == [2, 4]
+    assert os.listdir(tmp_path) == ["college.csv.gz"]
+    with gzip.open(path, "rt", newline="") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ["Clg_ID", "Clg_Name"] and rows[1:] == [[str(i), f"College {i}"] for i in range(2, 6)]
+
+def test_export_keeps_the_old_file_when_cancelled_or_failed(sqlite_conn, monkeypatch, tmp_path):
+    _setup(sqlite_conn, monkeypatch)
+    path = str(tmp_path / "college.csv")
+    with open(path, "w") as f:
+        f.write("previous export")
+    assert college_io.export_query(sqlite_conn, "SELECT * FROM College", (), path, cancel=lambda: True) == 2
+    def fail(written):
+        raise OSError("disk full")
+    with pytest.raises(OSError):
+        college_io.export_query(sqlite_conn, "SELECT * FROM College", (), path, progress=fail)
+    assert os.listdir(tmp_path) == ["college.csv"]
+    with open(path) as f:
+        assert f.read() == "previous export"
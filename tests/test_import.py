@@ -0,0 +1,72 @@
+import college_io
+from college_integrity import normalize, prevalidate
+
+SCHEMA = """
+CREATE TABLE College (Clg_ID INTEGER PRIMARY KEY);
+CREATE TABLE Department (Dept_ID INTEGER PRIMARY KEY);
+CREATE TABLE Student (Stu_ID INTEGER PRIMARY KEY, Name TEXT NOT NULL, Phone_No TEXT UNIQUE,
+                      Email TEXT NOT NULL UNIQUE, DOB TEXT, Gender TEXT,
+                      Clg_ID INT REFERENCES College(Clg_ID), Dept_ID INT REFERENCES Department(Dept_ID));
+INSERT INTO College VALUES (1);
+INSERT INTO Department VALUES (1);
+INSERT INTO Student VALUES (1, 'Ann', '9000000001', 'ann@x.edu', '2000-01-01', 'F', 1, 1);
+"""
+COLUMNS = ["Stu_ID", "Name", "Phone_No", "Email", "DOB", "Gender", "Clg_ID", "Dept_ID"]
+
+def _student(stu_id, phone, email, clg="1"):
+    return (stu_id, "Name", phone, email, "2000-01-01", "M", clg, "1")
+
+def test_normalize_compares_keys_as_the_column_type():
+    assert normalize("Stu_ID", " 007 ") == normalize("Stu_ID", 7) == 7
+    assert normalize("Term", "2026-1 ") == "2026-1"
+    assert normalize("Email", "Ann@X.edu") == "ann@x.edu"
+    assert normalize("Stu_ID", "x1") == "x1"
+    assert normalize("Stu_ID", None) is None
+
+def test_prevalidate_catches_keys_written_differently(sqlite_conn):
+    sqlite_conn.db.executescript(SCHEMA)
+    rows = [_student("001", None, "a@x.edu"),        # Stu_ID 1 is already there
+            _student("2", None, "b@x.edu"),
+            _student("02", None, "c@x.edu"),         # same key as the row before
+            _student("3", None, "ANN@x.edu "),       # Email already used
+            _student("4", None, "d@x.edu", clg="9")]  # no such College
+    errors = prevalidate(sqlite_conn.cursor(), "Student", COLUMNS, rows)
+    assert sorted(errors) == [0, 2, 3, 4]
+    assert "already exists" in errors[0]
+    assert "Duplicate" in errors[2]
+    assert "already used" in errors[3]
+    assert "does not exist in College" in errors[4]
+
+def test_prevalidate_reports_malformed_phone_without_rejecting(sqlite_conn):
+    sqlite_conn.db.executescript(SCHEMA)
+    rows = [_student("2", "+91 90000 00002", "b@x.edu"), _student("3", "9000000001", "c@x.edu")]
+    notes = {}
+    errors = prevalidate(sqlite_conn.cursor(), "Student", COLUMNS, rows, notes)
+    assert list(errors) == [1]   # the phone number is taken; the odd format is only a finding
+    assert list(notes) == [0] and "Phone_No" in notes[0]
+
+def test_import_csv_lists_rejects_and_findings(sqlite_conn, tmp_path):
+    sqlite_conn.db.executescript(SCHEMA)
+    path = tmp_path / "students.csv"
+    path.write_text("Stu_ID,Name,Phone_No,Email,DOB,Gender,Clg_ID,Dept_ID\n"
+                    "2,Bo,900-000-0002,bo@x.edu,2001-02-03,M,1,1\n"
+                    "01,Dup,,dup@x.edu,2001-02-03,M,1,1\n"
+                    "3,Kid,,kid@x.edu,2020-01-01,F,1,1\n", encoding="utf-8")
+    result = college_io.import_csv(sqlite_conn, "Student", COLUMNS, str(path))
+    assert (result.inserted, result.rejected, result.flagged) == (1, 2, 1)
+    assert "900-000-0002" in open(result.flag_path, encoding="utf-8").read()
+    rejects = open(result.reject_path, encoding="utf-8").read()
+    assert "already exists" in rejects and "18 years" in rejects
+    assert sqlite_conn.db.execute("SELECT COUNT(*) FROM Student").fetchone()[0] == 2
+
+def test_import_progress_counts_bytes(sqlite_conn, tmp_path):
+    sqlite_conn.db.executescript(SCHEMA)
+    path = tmp_path / "students.csv"
+    rows = [f"{i},Ærøskøbing Ñandú,,s{i}@x.edu,2000-01-01,F,1,1" for i in range(2, 402)]
+    path.write_text("\n".join([",".join(COLUMNS)] + rows) + "\n", encoding="utf-8")
+    seen = []
+    result = college_io.import_csv(sqlite_conn, "Student", COLUMNS, str(path), batch_size=50,
+                                   progress=seen.append)
+    assert result.inserted == 400
+    assert seen == sorted(seen) and seen[-1] == 1.0
+    assert seen[-2] > 0.95   # counted in bytes like the file size (characters stop near 0.89)
@@ -0,0 +1,23 @@
+import pytest
+import college_migrations as m
+
+class _LockedCursor:
+    def __init__(self):
+        self.executed = []
+    def execute(self, sql, params=()):
+        self.executed.append((sql, params))
+    def fetchone(self):
+        return (0,)   # GET_LOCK timed out
+
+def test_migrate_gives_up_after_lock_timeout():
+    cur = _LockedCursor()
+    with pytest.raises(m.MigrationLocked):
+        m.migrate(cur, log=lambda msg: None, lock_timeout=2)
+    assert cur.executed == [("SELECT GET_LOCK(%s, %s)", ("college_migrations", 2))]
+
+def test_checksum_ignores_whitespace():
+    assert m.checksum("SELECT  1\n FROM t") == m.checksum("SELECT 1 FROM t")
+
+def test_migration_names_are_unique_and_ordered():
+    names = [mig.name for mig in m.MIGRATIONS]
+    assert names == sorted(names) and len(set(names)) == len(names)
@@ -0,0 +1,76 @@
+import college_perf as perf
+from college_db import StatementCache
+
+class _RawCursor:
+    """A prepared cursor: a write reports a rowcount, a SELECT returns rows."""
+    def __init__(self):
+        self.description = None
+        self.rowcount = -1
+    def execute(self, sql, params=None):
+        if sql.startswith("SELECT"):
+            self.description, self.rowcount = [("a",)], -1
+        else:
+            self.description, self.rowcount = None, 1
+    def fetchall(self):
+        return [(1,), (2,)]
+    def close(self):
+        pass
+
+class _RawConn:
+    def cursor(self, *args, **kwargs):
+        return _RawCursor()
+
+def _stats():
+    return {s["sql"]: s for s in perf.recorder.snapshot()}
+
+def test_cached_statements_are_recorded_on_every_run(monkeypatch):
+    monkeypatch.setattr(perf, "recorder", perf.Recorder())
+    cache = StatementCache(perf.InstrumentedConnection(_RawConn()))
+    cache.execute("UPDATE t SET a = %s WHERE id = %s", (1, 2))
+    cache.execute("UPDATE t SET a = %s WHERE id = %s", (1, 3))
+    assert cache.execute("SELECT a FROM t WHERE id = %s", (1,)).fetchall() == [(1,), (2,)]
+    stats = _stats()
+    assert stats["UPDATE t SET a = ? WHERE id = ?"]["calls"] == 2   # the last run too, without a next call
+    assert stats["UPDATE t SET a = ? WHERE id = ?"]["rows"] == 2
+    assert stats["SELECT a FROM t WHERE id = ?"]["calls"] == 1
+    assert stats["SELECT a FROM t WHERE id = ?"]["rows"] == 2
+    assert (cache.hits, cache.misses) == (1, 2)
+
+def test_normalize_folds_literals_and_lists():
+    assert perf.normalize("SELECT *  FROM t\n WHERE a = 'x''s' AND b IN (1, 2, %s) LIMIT 50") == \
+        "SELECT * FROM t WHERE a = ? AND b IN (?) LIMIT ?"
+    assert perf.normalize("INSERT INTO t VALUES (%s, %s)") == "INSERT INTO t VALUES (?)"
+
+def test_recorder_percentiles_and_slow_log(monkeypatch, tmp_path):
+    log = tmp_path / "slow.log"
+    monkeypatch.setattr(perf, "SLOW_LOG_PATH", str(log))
+    monkeypatch.setattr(perf, "SLOW_QUERY_MS", 250)
+    rec = perf.Recorder()
+    for ms in range(1, 101):
+        rec.record(f"SELECT * FROM t WHERE id = {ms}", ms / 1000, rows=1, action_name="Load")
+    with perf.action("Save"):
+        rec.record("UPDATE t SET a = 1", 0.3, rows=-1)
+    fast, slow = sorted(rec.snapshot(), key=lambda s: s["calls"], reverse=True)
+    assert fast == {"sql": "SELECT * FROM t WHERE id = ?", "calls": 100, "rows": 100, "action": "Load",
+                    "total_ms": 5050.0, "avg_ms": 50.5, "p50_ms": 51.0, "p95_ms": 95.0, "max_ms": 100.0}
+    assert slow["rows"] == 0 and slow["action"] == "Save"
+    lines = log.read_text().splitlines()
+    assert len(lines) == 1 and lines[0].endswith("300.0 ms\t-1 rows\tSave\tUPDATE t SET a = ?")
+    rec.reset()
+    assert rec.snapshot() == []
+
+def test_startup_timer_splits_launch_and_deferred_work(monkeypatch):
+    now = [10.0]
+    monkeypatch.setattr(perf.time, "perf_counter", lambda: now[0])
+    timer = perf.StartupTimer()
+    now[0] = 10.5
+    timer.mark("imports")
+    now[0] = 30.0      # login window open
+    timer.resume()
+    now[0] = 30.25
+    timer.mark("first paint")
+    timer.record("Analytics tab", 0.125)
+    assert timer.phases == [("imports", 0.5), ("first paint", 0.25)]
+    lines = timer.report().splitlines()
+    assert lines[2].split() == ["time", "to", "first", "window", "750.0", "ms"]
+    assert lines[-2:] == ["Deferred:", f"{'Analytics tab':<24}     125.0 ms"]
@@ -0,0 +1,44 @@
+import college_queries as q
+
+class _Statements:
+    def __init__(self):
+        self.calls = []
+    def execute(self, sql, params):
+        self.calls.append(params)
+
+class _Cursor:
+    def __init__(self):
+        self.statements = _Statements()
+        self.many = []
+    def executemany(self, sql, seq):
+        self.many.append(list(seq))
+
+def test_execute_many_prepares_small_batches_only():
+    cur = _Cursor()
+    q.execute_many(cur, "UPDATE t SET a = %s WHERE id = %s", ((i, i) for i in range(3)))
+    assert len(cur.statements.calls) == 3 and not cur.many
+    big = [(i, i) for i in range(q.PREPARED_MANY_MAX + 1)]
+    q.execute_many(cur, "DELETE FROM t WHERE a = %s AND id = %s", big)
+    q.execute_many(cur, "INSERT INTO t (a, id) VALUES (%s, %s)", [(1, 1)])
+    assert cur.many == [big, [(1, 1)]]
+    assert len(cur.statements.calls) == 3
+
+def test_page_query_before_reads_descending():
+    sql, params = q.page_query("Student", "Stu_ID", 10, (["Name LIKE %s"], ["a%"]), before=50)
+    assert sql == "SELECT * FROM Student WHERE Name LIKE %s AND Stu_ID < %s ORDER BY Stu_ID DESC LIMIT %s"
+    assert params == ["a%", 50, 10]
+
+def test_fetch_page_walks_keyset_boundaries(sqlite_conn):
+    cur = sqlite_conn.cursor()
+    cur.execute("CREATE TABLE Student (Stu_ID INT PRIMARY KEY, Name VARCHAR(255))")
+    cur.executemany("INSERT INTO Student VALUES (%s, %s)", [(i, f"s{i}") for i in range(1, 8)])
+    ids = lambda rows: [r[0] for r in rows]
+    assert ids(q.fetch_page(cur, "Student", "Stu_ID", 3)) == [1, 2, 3]
+    assert ids(q.fetch_page(cur, "Student", "Stu_ID", 3, after=3)) == [4, 5, 6]
+    assert ids(q.fetch_page(cur, "Student", "Stu_ID", 3, after=6)) == [7]
+    assert q.fetch_page(cur, "Student", "Stu_ID", 3, after=7) == []
+    # Paging back returns the rows just before the key, still ascending
+    assert ids(q.fetch_page(cur, "Student", "Stu_ID", 3, before=7)) == [4, 5, 6]
+    assert ids(q.fetch_page(cur, "Student", "Stu_ID", 3, before=3)) == [1, 2]
+    where = (["Stu_ID % 2 = %s"], [1])
+    assert ids(q.fetch_page(cur, "Student", "Stu_ID", 2, where, after=1)) == [3, 5]
@@ -0,0 +1,16 @@
+from miniproject import build_search_where
+
+def test_search_conditions_per_mode():
+    conds, params = build_search_where("Student", {
+        "Stu_ID": ("exact", " 7 "),
+        "Email": ("prefix", "a_b%"),
+        "Name": ("fulltext", "ann  o'neil+"),
+        "Phone_No": ("prefix", "  "),
+    })
+    assert conds == ["Stu_ID = %s", "Email LIKE %s", "MATCH(Name) AGAINST (%s IN BOOLEAN MODE)"]
+    assert params == ["7", "a\\_b\\%%", "+ann* +o'neil*"]
+
+def test_single_word_fulltext_and_operator_only_words():
+    assert build_search_where("Student", {"Name": ("fulltext", "ann")}) == (["Name LIKE %s"], ["ann%"])
+    # Words made only of boolean-mode operators leave nothing to match
+    assert build_search_where("Student", {"Name": ("fulltext", "+ -")}) == ([], [])
@@ -0,0 +1,10 @@
+import subprocess, sys, os
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_tab_modules_are_not_loaded_with_the_gui_module():
+    code = ("import sys, miniproject; "
+            "print(','.join(m for m in ('college_analytics', 'college_backup', 'college_integrity', "
+            "'college_terms', 'PIL') if m in sys.modules))")
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == ""
@@ -0,0 +1,88 @@
+import random
+from datetime import date
+from college_store import RowStore, SortedView
+
+COLUMNS = ["Stu_ID", "Name", "Credits", "DOB"]
+
+def _store(rows):
+    store = RowStore(COLUMNS)
+    store.extend(sorted(rows))
+    return store
+
+ROWS = [(1, "bob", 3, date(2000, 1, 1)), (2, "Alice", None, date(1999, 5, 1)),
+        (3, "carol", 3, None), (4, None, 4, date(2001, 2, 2)), (5, "alice", 1, date(1999, 5, 1))]
+
+def test_view_ascending_sorts_nulls_last_and_ties_by_key():
+    store = _store(ROWS)
+    assert store.view("Credits") == [5, 1, 3, 4, 2]
+    assert store.view("Name") == [2, 5, 1, 3, 4]      # case-insensitive, ties in key order
+    assert store.view("DOB") == [2, 5, 1, 4, 3]
+
+def test_view_descending_keeps_nulls_last_and_ties_by_key():
+    store = _store(ROWS)
+    assert store.view("Credits", descending=True) == [4, 1, 3, 5, 2]
+    assert store.view("Name", descending=True) == [3, 1, 2, 5, 4]
+    assert store.view("DOB", descending=True) == [4, 1, 2, 5, 3]
+
+def test_view_filters_on_any_column_case_insensitively():
+    store = _store(ROWS)
+    assert store.view(text="ALICE") == [2, 5]
+    assert store.view("Credits", text="  ali ") == [5, 2]
+    assert store.view(text="2001") == [4]
+
+def test_sort_key_matches_view_order():
+    store = _store(ROWS)
+    for column in COLUMNS:
+        for desc in (False, True):
+            key = store.sort_key(column, desc)
+            rows = [store.get(k) for k in store.view(column, desc)]
+            assert rows == sorted(rows, key=key), (column, desc)
+
+def test_integer_columns_are_packed_until_a_value_does_not_fit():
+    store = RowStore(["ID", "N"])
+    store.extend([(1, 10), (2, 20)])
+    assert store._cols[1].typecode == "q"
+    store.upsert((3, None))
+    assert isinstance(store._cols[1], list)
+    assert store.get(3) == (3, None)
+
+def test_upsert_remove_and_key_order():
+    store = _store(ROWS)
+    assert store.upsert((2, "Zed", 9, None)) == ROWS[1]
+    assert store.upsert((0, "new", 1, None)) is None
+    assert [store.row(i)[0] for i in range(len(store))] == [0, 1, 2, 3, 4, 5]
+    assert store.remove(3) == ROWS[2] and store.remove(3) is None
+    assert store.view(text="zed") == [2]
+
+def test_prepend_and_keep_bound_the_loaded_range():
+    store = RowStore(["ID", "V"])
+    store.extend([(i, f"v{i}") for i in range(10, 20)])
+    store.view(text="v")                       # builds the text cache
+    store.prepend([(i, f"v{i}") for i in range(5, 10)])
+    assert store.first_key() == 5 and len(store) == 15
+    store.keep(3, 8)
+    assert [store.row(i)[0] for i in range(len(store))] == [8, 9, 10, 11, 12]
+    assert store.view(text="v1") == [10, 11, 12]
+
+def test_sorted_view_updates_match_a_full_rebuild():
+    rng = random.Random(7)
+    rows = [(k, rng.choice(["a", "B", "c", None]), rng.choice([1, 2, 3, None]), None) for k in range(0, 200, 2)]
+    store = _store(rows)
+    for sort, desc, text in [("Credits", False, ""), ("Credits", True, ""), ("Name", True, "b"), (None, False, "")]:
+        view = SortedView(store, sort, desc, text)
+        for _ in range(150):
+            key = rng.randrange(0, 220)
+            if rng.random() < 0.3:
+                old, new = store.remove(key), None
+            else:
+                new = (key, rng.choice(["a", "B", "c", None]), rng.choice([1, 2, 3, None]), None)
+                old = store.upsert(new)
+            view.update(key, old, new)
+            assert view.keys == store.view(sort, desc, text)
+
+def test_sorted_view_rebuilds_when_a_value_changes_the_column_kind():
+    store = _store([(1, "a", 2, None), (2, "b", 1, None)])
+    view = SortedView(store, "Credits")
+    old = store.upsert((3, "c", "x", None))
+    view.update(3, old, (3, "c", "x", None))
+    assert view.keys == store.view("Credits") == [2, 1, 3]
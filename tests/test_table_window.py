@@ -0,0 +1,128 @@
+"""TableFrame's tree window, driven without a display through a fake Treeview."""
+import miniproject as app
+from college_store import RowStore
+
+class FakeTree:
+    def __init__(self):
+        self.children, self.values, self.calls = [], {}, []
+    def get_children(self):
+        return tuple(self.children)
+    def insert(self, parent, index, iid, values):
+        self.calls.append(("insert", iid))
+        self.children.insert(index if index != "end" else len(self.children), iid)
+        self.values[iid] = tuple(values)
+    def delete(self, *iids):
+        for iid in iids:
+            self.calls.append(("delete", iid))
+            self.children.remove(iid)
+            del self.values[iid]
+    def detach(self, iid):
+        self.calls.append(("detach", iid))
+        self.children.remove(iid)
+    def move(self, iid, parent, index):
+        # Like ttk, only used here to re-attach a detached item
+        assert iid not in self.children
+        self.calls.append(("move", iid))
+        self.children.insert(index, iid)
+    def item(self, iid, values=None, tags=None):
+        if values is not None:
+            self.calls.append(("item", iid))
+            self.values[iid] = tuple(values)
+    def exists(self, iid):
+        return iid in self.values
+    def see(self, iid):
+        pass
+    def focus(self):
+        return ""
+
+def _frame(n, sort=None, desc=False, monkeypatch=None):
+    frame = app.TableFrame.__new__(app.TableFrame)
+    frame.table, frame.columns, frame.pending = "Course", ["Course_ID", "Credits"], {}
+    frame.store = RowStore(frame.columns)
+    frame.store.extend([(k, k % 7) for k in range(1, n + 1)])
+    frame.tree, frame._shown, frame._win = FakeTree(), {}, 0
+    frame._sort, frame._desc, frame._quick = sort, desc, ""
+    frame._more_before = frame._more_after = False
+    frame._total = n
+    frame._refresh_view()
+    frame.tree.calls.clear()
+    return frame
+
+def _expected(frame):
+    keys = frame.store.view(frame._sort, frame._desc, frame._quick)
+    return [str(k) for k in keys[frame._win:frame._win + app.MAX_TREE_ROWS]]
+
+def test_updating_one_row_touches_only_its_item():
+    frame = _frame(1000, sort="Credits")
+    frame._apply_row(14, (14, 1))                  # Credits 0 → 1: moves within the window
+    assert frame.tree.children == _expected(frame)
+    assert frame.tree.values["14"] == (14, 1)
+    assert frame.tree.calls == [("detach", "14"), ("move", "14"), ("item", "14")]
+
+def test_same_position_update_is_a_single_item_call():
+    frame = _frame(50)
+    frame._apply_row(10, (10, 99))
+    assert frame.tree.calls == [("item", "10")]
+
+def test_insert_and_delete_patch_the_window():
+    frame = _frame(1000)
+    frame._apply_row(5, None)
+    assert frame.tree.children == _expected(frame) and frame._total == 999
+    assert ("delete", "5") in frame.tree.calls and len(frame.tree.calls) == 2   # plus the row scrolled in
+    frame.tree.calls.clear()
+    frame._apply_row(5, (5, 1), added=True)
+    assert frame.tree.children == _expected(frame) and frame._total == 1000
+
+def test_rows_beyond_the_loaded_range_wait_for_their_page():
+    frame = _frame(100)
+    frame._more_after = True
+    frame._apply_row(500, (500, 1), added=True)
+    assert frame.store.find(500) is None and frame._total == 101
+
+def test_store_is_trimmed_around_the_window_in_key_order():
+    frame = _frame(app.STORE_KEEP_ROWS)
+    frame._win = app.STORE_KEEP_ROWS - app.MAX_TREE_ROWS
+    frame._more_after = True
+    frame._on_next_page([(k, 0) for k in range(app.STORE_KEEP_ROWS + 1, app.STORE_KEEP_ROWS + app.PAGE_SIZE + 1)])
+    assert len(frame.store) == app.STORE_KEEP_ROWS
+    assert frame._more_before and frame.tree.children == _expected(frame)
+    first = frame.store.first_key()
+    frame._win = 0
+    frame._on_prev_page([(k, 0) for k in range(first - app.PAGE_SIZE, first)])
+    assert len(frame.store) == app.STORE_KEEP_ROWS
+    assert frame.store.first_key() == first - app.PAGE_SIZE
+    assert frame.tree.children == _expected(frame)
+
+def test_sorted_views_are_not_trimmed():
+    frame = _frame(app.STORE_KEEP_ROWS + 500, sort="Credits")
+    assert len(frame.store) == app.STORE_KEEP_ROWS + 500
+
+class SyncDB:
+    """DBExecutor stand-in that runs each job at once on one SQLite connection."""
+    def __init__(self, conn):
+        self.conn = conn
+    def submit(self, func, on_done=None, on_error=None, **kwargs):
+        try:
+            result = func(self.conn.cursor())
+            self.conn.commit()
+        except Exception as e:
+            self.conn.rollback()
+            on_error(e)
+        else:
+            on_done(result)
+
+def test_refresh_row_patches_only_the_written_row(sqlite_conn, monkeypatch):
+    frame = _frame(50)
+    frame.key, frame._where = "Course_ID", ([], [])
+    sqlite_conn.db.execute("CREATE TABLE Course (Course_ID INTEGER PRIMARY KEY, Credits INT)")
+    sqlite_conn.db.executemany("INSERT INTO Course VALUES (?, ?)", [(k, k % 7) for k in range(1, 52)])
+    sqlite_conn.db.execute("UPDATE Course SET Credits = 99 WHERE Course_ID = 10")
+    monkeypatch.setattr(app, "db", SyncDB(sqlite_conn))
+    frame.refresh_row("10")                         # keys typed into the form are text
+    assert frame.tree.values["10"] == (10, 99) and frame.tree.calls == [("item", "10")]
+    frame.refresh_row(51, added=True)
+    assert frame.store.find(51) is not None and frame._total == 51
+    frame._where = (["Credits < %s"], [50])        # the search bar no longer matches row 10
+    frame.refresh_row(10)
+    assert not frame.tree.exists("10") and frame._total == 50
+    assert frame.tree.children == _expected(frame)
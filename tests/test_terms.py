@@ -0,0 +1,57 @@
+import pytest
+import college_terms as terms
+
+SCHEMA = """
+CREATE TABLE academic_term (Term TEXT PRIMARY KEY, Starts TEXT, Ends TEXT);
+CREATE TABLE Enrollment (Stu_ID INT, Course_ID INT, Grade TEXT, Term TEXT,
+                         PRIMARY KEY (Stu_ID, Course_ID, Term));
+CREATE TABLE Enrollment_History (Stu_ID INT, Course_ID INT, Grade TEXT, Term TEXT,
+                                 Archived_At TEXT DEFAULT CURRENT_TIMESTAMP,
+                                 PRIMARY KEY (Stu_ID, Course_ID, Term));
+INSERT INTO academic_term VALUES ('2025-2', '2025-07-01', '2025-12-31'),
+                                 ('2026-1', '2026-01-01', '2026-06-30'),
+                                 ('2026-2', '2026-07-01', '2026-12-31');
+"""
+
+@pytest.fixture
+def conn(sqlite_conn):
+    sqlite_conn.db.executescript(SCHEMA)
+    sqlite_conn.db.create_function("fn_CurrentTerm", 0, lambda: "2026-2")
+    rows = [(s, c, "A", term) for term in ("2025-2", "2026-1", "2026-2") for s in range(1, 4) for c in (1, 2)]
+    sqlite_conn.db.executemany("INSERT INTO Enrollment VALUES (?, ?, ?, ?)", rows)
+    # Archived by an earlier run that stopped before deleting it
+    sqlite_conn.db.execute("INSERT INTO Enrollment_History (Stu_ID, Course_ID, Grade, Term) "
+                           "VALUES (1, 1, 'F', '2025-2')")
+    return sqlite_conn
+
+def _count(conn, table, where=""):
+    return conn.db.execute(f"SELECT COUNT(*) FROM {table} {where}").fetchone()[0]
+
+def test_rollover_moves_closed_terms_in_batches(conn):
+    seen = []
+    moved = terms.rollover(conn, batch=4, progress=lambda done, total: seen.append((done, total)),
+                           log=lambda msg: None)
+    assert moved == {"2025-2": 6, "2026-1": 6}
+    assert seen == [(4, 12), (6, 12), (10, 12), (12, 12)]
+    assert _count(conn, "Enrollment") == 6 and _count(conn, "Enrollment", "WHERE Term = '2026-2'") == 6
+    assert _count(conn, "Enrollment_History") == 12
+    assert conn.db.execute("SELECT Grade FROM Enrollment_History WHERE Stu_ID = 1 AND Course_ID = 1 "
+                           "AND Term = '2025-2'").fetchone() == ("A",)
+    assert terms.rollover(conn, log=lambda msg: None) == {}
+
+def test_cancelled_rollover_leaves_each_row_in_one_table(conn):
+    batches = []
+    moved = terms.rollover(conn, batch=4, progress=lambda done, total: batches.append(done),
+                           cancel=lambda: len(batches) == 1, log=lambda msg: None)
+    assert moved == {"2025-2": 4}
+    assert _count(conn, "Enrollment") + _count(conn, "Enrollment_History") == 18
+    assert terms.closed_terms(conn.cursor()) == ["2025-2", "2026-1"]
+
+def test_add_term_checks_code_and_dates(conn):
+    cur = conn.cursor()
+    terms.add_term(cur, "2026-1", "2026-01-05", "2026-06-30")
+    assert conn.db.execute("SELECT Starts FROM academic_term WHERE Term = '2026-1'").fetchone() == ("2026-01-05",)
+    with pytest.raises(ValueError, match="YYYY-S"):
+        terms.add_term(cur, "2026-10", "2026-01-01", "2026-02-01")
+    with pytest.raises(ValueError, match="ends before it starts"):
+        terms.add_term(cur, "2027-1", "2027-06-30", "2027-01-01")